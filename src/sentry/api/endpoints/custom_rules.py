@@ -21,6 +21,7 @@ from sentry.models.dynamicsampling import (
 )
 from sentry.models.organization import Organization
 from sentry.models.project import Project
+from sentry.relay.config.sections import SAMPLING
 from sentry.relay.types import RuleCondition
 from sentry.snuba.metrics.extraction import SearchQueryConverter, parse_search_query
 from sentry.tasks.relay import schedule_invalidate_project_config
@@ -306,6 +307,7 @@ def _schedule_invalidate_project_configs(organization: Organization, project_ids
         schedule_invalidate_project_config(
             trigger="dynamic_sampling:custom_rule_upsert",
             organization_id=organization.id,
+            sections=[SAMPLING],
         )
     else:
         # update the given projects
@@ -313,4 +315,5 @@ def _schedule_invalidate_project_configs(organization: Organization, project_ids
             schedule_invalidate_project_config(
                 trigger="dynamic_sampling:custom_rule_upsert",
                 project_id=project_id,
+                sections=[SAMPLING],
             )
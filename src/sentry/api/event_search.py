@@ -5,7 +5,7 @@ from collections import namedtuple
 from collections.abc import Mapping, Sequence
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from functools import reduce
+from functools import lru_cache, reduce
 from typing import Any, Literal, NamedTuple, Union
 
 from django.utils.functional import cached_property
@@ -586,28 +586,37 @@ class SearchVisitor(NodeVisitor):
             config = SearchConfig()
         self.config = config
         self.params = params if params is not None else {}
-        self.get_field_type = get_field_type
-        if builder is None:
-            # Avoid circular import
-            from sentry.search.events.builder.discover import UnresolvedQuery
-
-            # TODO: read dataset from config
-            self.builder = UnresolvedQuery(
-                dataset=Dataset.Discover,
-                params=self.params,
-                config=QueryBuilderConfig(functions_acl=list(FUNCTIONS)),
-            )
-        else:
+        # The default builder is only created once it's needed, as many queries never look up
+        # field types
+        if builder is not None:
             self.builder = builder
         if get_field_type is None:
-            self.get_field_type = self.builder.get_field_type
+            self.get_field_type = self._get_builder_field_type
         else:
             self.get_field_type = get_field_type
         if get_function_result_type is None:
-            self.get_function_result_type = self.builder.get_function_result_type
+            self.get_function_result_type = self._get_builder_function_result_type
         else:
             self.get_function_result_type = get_function_result_type
 
+    @cached_property
+    def builder(self):
+        # Avoid circular import
+        from sentry.search.events.builder.discover import UnresolvedQuery
+
+        # TODO: read dataset from config
+        return UnresolvedQuery(
+            dataset=Dataset.Discover,
+            params=self.params,
+            config=QueryBuilderConfig(functions_acl=list(FUNCTIONS)),
+        )
+
+    def _get_builder_field_type(self, field):
+        return self.builder.get_field_type(field)
+
+    def _get_builder_function_result_type(self, function):
+        return self.builder.get_function_result_type(function)
+
     @cached_property
     def key_mappings_lookup(self):
         lookup = {}
@@ -1262,6 +1271,16 @@ QueryOp = Literal["AND", "OR"]
 QueryToken = Union[SearchFilter, QueryOp, ParenExpression]
 
 
+@lru_cache(maxsize=1000)
+def _parse_search_tree(query: str) -> Node:
+    """
+    Parse a query with `event_search_grammar`. The resulting tree only depends on the query string,
+    and visiting it doesn't modify it, so trees of repeated queries (saved searches, alert rules,
+    dashboards) are shared regardless of the config they're visited with.
+    """
+    return event_search_grammar.parse(query)
+
+
 def parse_search_query(
     query,
     config=None,
@@ -1276,8 +1295,12 @@ def parse_search_query(
     if config is None:
         config = default_config
 
+    # Nothing to parse, and hence nothing that could depend on the config
+    if not query.strip(" "):
+        return []
+
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_search_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
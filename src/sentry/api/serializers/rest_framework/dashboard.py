@@ -28,6 +28,7 @@ from sentry.models.dashboard_widget import (
 )
 from sentry.models.team import Team
 from sentry.relay.config.metric_extraction import get_current_widget_specs, widget_exceeds_max_specs
+from sentry.relay.config.sections import TRANSACTION_METRICS
 from sentry.search.events.builder.discover import UnresolvedQuery
 from sentry.search.events.fields import is_function
 from sentry.search.events.types import ParamsType, QueryBuilderConfig
@@ -883,5 +884,7 @@ def schedule_update_project_configs(dashboard: Dashboard):
         return
 
     schedule_invalidate_project_config(
-        trigger="dashboards:create-on-demand-metric", organization_id=org.id
+        trigger="dashboards:create-on-demand-metric",
+        organization_id=org.id,
+        sections=[TRANSACTION_METRICS],
     )
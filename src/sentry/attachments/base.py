@@ -1,4 +1,7 @@
+import time
 import zlib
+from collections.abc import Iterator
+from itertools import islice
 
 import sentry_sdk
 import zstandard
@@ -10,6 +13,9 @@ ATTACHMENT_META_KEY = "{key}:a"
 ATTACHMENT_UNCHUNKED_DATA_KEY = "{key}:a:{id}"
 ATTACHMENT_DATA_CHUNK_KEY = "{key}:a:{id}:{chunk_index}"
 
+# Number of chunks fetched from the cache in one round trip
+CHUNK_BATCH_SIZE = 8
+
 UNINITIALIZED_DATA = object()
 
 
@@ -67,6 +73,24 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def has_data(self) -> bool:
+        """
+        Return whether all chunks of the attachment are still in the cache, without reading them.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            return self._cache.has_data(self)
+        return True
+
+    def stream_data(self) -> Iterator[bytes]:
+        """
+        Yield the data of the attachment in chunks, without loading all chunks from the cache
+        at once.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            yield from self._cache.stream_data(self)
+        elif self.data:
+            yield self.data
+
     def delete(self):
         for key in self.chunk_keys:
             self._cache.inner.delete(key)
@@ -161,20 +185,41 @@ class BaseAttachmentCache:
             attachment.setdefault("key", key)
             yield CachedAttachment(cache=self, **attachment)
 
-    def get_data(self, attachment) -> bytes:
-        data = bytearray()
+    def has_data(self, attachment) -> bool:
+        return all(self.inner.exists_many(list(attachment.chunk_keys)))
 
-        for key in attachment.chunk_keys:
-            raw_data = self.inner.get(key, raw=True)
-            if raw_data is None:
-                raise MissingAttachmentChunks()
-            if raw_data.startswith(b"\x28\xb5\x2f\xfd"):
-                decompressed = zstandard.decompress(raw_data)
-            else:
-                decompressed = zlib.decompress(raw_data)
-            data.extend(decompressed)
-
-        return bytes(data)
+    def get_data(self, attachment) -> bytes:
+        return b"".join(self.stream_data(attachment))
+
+    def stream_data(self, attachment) -> Iterator[bytes]:
+        """
+        Yield the decompressed chunks of an attachment, fetching `CHUNK_BATCH_SIZE` chunks per
+        round trip to the cache.
+        """
+        metrics_tags = {"type": attachment.type}
+        keys = attachment.chunk_keys
+        size = 0
+        duration = 0.0
+
+        while True:
+            start = time.monotonic()
+            batch = list(islice(keys, CHUNK_BATCH_SIZE))
+            if not batch:
+                break
+
+            chunks = []
+            for raw_data in self.inner.get_many(batch, raw=True):
+                if raw_data is None:
+                    raise MissingAttachmentChunks()
+                chunks.append(decompress_chunk(raw_data))
+            duration += time.monotonic() - start
+
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+
+        metrics.timing("attachments.get_data.duration", duration, tags=metrics_tags)
+        metrics.distribution("attachments.get_data.size", size, tags=metrics_tags, unit="byte")
 
     @sentry_sdk.tracing.trace
     def delete(self, key):
@@ -186,3 +231,10 @@ class BaseAttachmentCache:
 
 def compress_chunk(chunk_data: bytes) -> bytes:
     return zstandard.compress(chunk_data)
+
+
+def decompress_chunk(raw_data: bytes) -> bytes:
+    if raw_data.startswith(b"\x28\xb5\x2f\xfd"):
+        return zstandard.decompress(raw_data)
+    else:
+        return zlib.decompress(raw_data)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from time import monotonic, sleep
+from typing import Any
+
+from sentry.buffer.base import BufferIncrement
+from sentry.buffer.redis import RedisBuffer
+from sentry.db import models
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AggregatingRedisBuffer(RedisBuffer):
+    """
+    A `RedisBuffer` which pre-aggregates increments in process memory before writing them to Redis.
+
+    Hot rows (e.g. a noisy group receiving thousands of `times_seen` bumps per second) collapse into
+    a single Redis write per flush window instead of one write per event. Counter deltas are summed
+    and `extra` columns are merged with the last write winning, exactly as Redis would have done.
+
+    Pending increments are flushed when either `aggregate_max_keys` distinct rows are pending or
+    the oldest pending increment is `aggregate_max_age` seconds old, whichever happens first. These
+    two options also bound what can be lost if the process dies without running its exit handlers;
+    increments that could not be written during an orderly shutdown are reported through the
+    `buffer.aggregate.lost` metric.
+
+    **Note**: Values read back through `get` include the local pending deltas of this process
+              only, other processes' pending deltas become visible once they flush.
+    """
+
+    def __init__(
+        self,
+        aggregate_max_keys: int = 1000,
+        aggregate_max_age: float = 1.0,
+        aggregate_background_flush: bool = True,
+        **options: Any,
+    ) -> None:
+        super().__init__(**options)
+        assert aggregate_max_keys > 0
+        assert aggregate_max_age > 0
+        self.aggregate_max_keys = aggregate_max_keys
+        self.aggregate_max_age = aggregate_max_age
+        self.aggregate_background_flush = aggregate_background_flush
+
+        self._lock = threading.Lock()
+        self._pending: dict[str, BufferIncrement] = {}
+        self._pending_since: float | None = None
+        self._flusher_pid: int | None = None
+
+        atexit.register(self._flush_at_exit)
+
+    def incr(
+        self,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, models.Model | str | int],
+        extra: dict[str, Any] | None = None,
+        signal_only: bool | None = None,
+    ) -> None:
+        self.incr_many([BufferIncrement(model, columns, filters, extra, signal_only)])
+
+    def incr_many(self, increments: Sequence[BufferIncrement]) -> None:
+        if not increments:
+            return
+
+        self._ensure_flusher()
+
+        with self._lock:
+            for increment in increments:
+                key = self._make_key(increment.model, increment.filters)
+                if key in self._pending:
+                    self._pending[key].merge(increment)
+                else:
+                    self._pending[key] = increment.copy()
+            if self._pending_since is None:
+                self._pending_since = monotonic()
+            should_flush = self._should_flush()
+
+        metrics.incr("buffer.aggregate.incr", amount=len(increments), skip_internal=True)
+
+        if should_flush:
+            self.flush_local()
+
+    def get(
+        self,
+        model: type[models.Model],
+        columns: list[str],
+        filters: dict[str, Any],
+    ) -> dict[str, int]:
+        result = super().get(model, columns, filters)
+
+        with self._lock:
+            pending = self._pending.get(self._make_key(model, filters))
+            if pending is not None:
+                for col in columns:
+                    result[col] += pending.columns.get(col, 0)
+
+        return result
+
+    def flush_local(self) -> None:
+        """
+        Write all increments aggregated in this process to Redis.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+            pending_since = self._pending_since
+            self._pending = {}
+            self._pending_since = None
+
+        if not pending:
+            return
+
+        if pending_since is not None:
+            metrics.timing("buffer.aggregate.flush_age", monotonic() - pending_since)
+        metrics.distribution("buffer.aggregate.flush_size", len(pending))
+
+        try:
+            super().incr_many(pending)
+        except Exception:
+            metrics.incr("buffer.aggregate.lost", amount=len(pending), tags={"reason": "error"})
+            raise
+
+    def _should_flush(self) -> bool:
+        if len(self._pending) >= self.aggregate_max_keys:
+            return True
+        return (
+            self._pending_since is not None
+            and monotonic() - self._pending_since >= self.aggregate_max_age
+        )
+
+    def _ensure_flusher(self) -> None:
+        # Threads do not survive a fork, so (re)start the flusher in every process that
+        # actually receives increments.
+        if not self.aggregate_background_flush or self._flusher_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+
+        threading.Thread(
+            target=self._run_flusher, name="buffer-aggregate-flusher", daemon=True
+        ).start()
+
+    def _run_flusher(self) -> None:
+        pid = os.getpid()
+        while self._flusher_pid == pid:
+            sleep(self.aggregate_max_age)
+            with self._lock:
+                should_flush = self._should_flush()
+            if should_flush:
+                try:
+                    self.flush_local()
+                except Exception:
+                    logger.exception("buffer.aggregate.flush-failed")
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush_local()
+        except Exception:
+            # flush_local has already recorded the lost increments
+            logger.exception("buffer.aggregate.shutdown-flush-failed")
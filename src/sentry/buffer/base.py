@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
@@ -9,6 +11,44 @@ from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
 
 
+@dataclass
+class BufferIncrement:
+    """
+    A single pending call to `Buffer.incr`, used to submit many increments at once via
+    `Buffer.incr_many`. Fields mirror the arguments of `Buffer.incr`.
+    """
+
+    model: type[models.Model]
+    columns: dict[str, int]
+    filters: dict[str, models.Model | str | int]
+    extra: dict[str, Any] | None = None
+    signal_only: bool | None = None
+
+    def copy(self) -> "BufferIncrement":
+        return BufferIncrement(
+            model=self.model,
+            columns=dict(self.columns),
+            filters=self.filters,
+            extra=dict(self.extra) if self.extra else None,
+            signal_only=self.signal_only,
+        )
+
+    def merge(self, other: "BufferIncrement") -> None:
+        """
+        Fold a later increment for the same model and filters into this one: counters are summed,
+        `extra` values are merged with the last write winning and `signal_only` is set if either
+        increment sets it.
+        """
+        for column, amount in other.columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        if other.extra:
+            if self.extra is None:
+                self.extra = {}
+            self.extra.update(other.extra)
+        if other.signal_only is True:
+            self.signal_only = True
+
+
 class Buffer(Service):
     """
     Buffers act as temporary stores for counters. The default implementation is just a passthru and
@@ -26,8 +66,10 @@ class Buffer(Service):
     __all__ = (
         "get",
         "incr",
+        "incr_many",
         "process",
         "process_pending",
+        "get_pending_shards",
         "process_batch",
         "validate",
         "push_to_sorted_set",
@@ -134,7 +176,28 @@ class Buffer(Service):
             headers={"sentry-propagate-traces": False},
         )
 
-    def process_pending(self) -> None:
+    def incr_many(self, increments: Sequence[BufferIncrement]) -> None:
+        """
+        Apply several increments at once. Backends which can batch writes should override this;
+        the default implementation simply calls `incr` for each increment in order.
+        """
+        for increment in increments:
+            self.incr(
+                increment.model,
+                increment.columns,
+                increment.filters,
+                extra=increment.extra,
+                signal_only=increment.signal_only,
+            )
+
+    def get_pending_shards(self) -> int:
+        """
+        Number of shards of pending keys which can be drained independently through
+        `process_pending(shard=...)`.
+        """
+        return 1
+
+    def process_pending(self, shard: int | None = None) -> None:
         return
 
     def process_batch(self) -> None:
@@ -2,18 +2,20 @@ from __future__ import annotations
 
 import logging
 import pickle
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from enum import Enum
 from time import time
 from typing import Any, TypeVar
+from zlib import crc32
 
 import rb
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
-from sentry.buffer.base import Buffer
+from sentry.buffer.base import Buffer, BufferIncrement
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
@@ -224,13 +226,17 @@ class PendingBuffer:
 class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
+    # The shard counts the pending set has been used with
+    pending_shard_counts_key = "b:ps"
 
-    def __init__(self, incr_batch_size: int = 2, **options: object):
+    def __init__(self, incr_batch_size: int = 2, pending_shards: int = 1, **options: object):
         self.is_redis_cluster, self.cluster, options = get_dynamic_cluster_from_options(
             "SENTRY_BUFFER_OPTIONS", options
         )
         self.incr_batch_size = incr_batch_size
         assert self.incr_batch_size > 0
+        self.pending_shards = pending_shards
+        assert self.pending_shards > 0
 
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
@@ -264,6 +270,23 @@ class RedisBuffer(Buffer):
         except Exception:
             return None
 
+    def _get_pending_shard(self, key: str) -> int:
+        """
+        Returns the shard of the pending set a buffer key is tracked in.
+        """
+        if self.pending_shards == 1:
+            return 0
+        return crc32(key.encode("utf-8")) % self.pending_shards
+
+    def _make_pending_key(self, shard: int) -> str:
+        """
+        Returns the Redis key of the pending set for the given shard. The first shard keeps using
+        the unsharded key, so keys pending from before sharding was enabled still get drained.
+        """
+        if shard == 0:
+            return self.pending_key
+        return f"{self.pending_key}:{shard}"
+
     def _make_lock_key(self, key: str) -> str:
         return f"l:{key}"
 
@@ -472,47 +495,150 @@ class RedisBuffer(Buffer):
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
         pipe = self.get_redis_connection(key)
+        self._queue_incr(
+            pipe, key, BufferIncrement(model, columns, filters, extra, signal_only), time()
+        )
+        pipe.execute()
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+    def incr_many(self, increments: Sequence[BufferIncrement]) -> None:
+        """
+        Apply many increments with as few round trips as possible.
+
+        Increments targeting the same key are coalesced locally first (see
+        `BufferIncrement.merge`), then the remaining keys are written with a single pipeline
+        per Redis node.
+        """
+        if not increments:
+            return
+
+        coalesced: dict[str, BufferIncrement] = {}
+        for increment in increments:
+            key = self._make_key(increment.model, increment.filters)
+            if key in coalesced:
+                coalesced[key].merge(increment)
+            else:
+                coalesced[key] = increment.copy()
+
+        now = time()
+        for keys in self._group_keys_by_node(coalesced.keys()):
+            pipe = self.get_redis_connection(keys[0], transaction=False)
+            for key in keys:
+                self._queue_incr(pipe, key, coalesced[key], now)
+            pipe.execute()
+
+        metrics.distribution("buffer.incr_many.size", len(increments))
+        metrics.distribution("buffer.incr_many.coalesced_size", len(coalesced))
+        for increment in increments:
+            metrics.incr(
+                "buffer.incr",
+                skip_internal=True,
+                tags={"module": increment.model.__module__, "model": increment.model.__name__},
+            )
+
+    def _group_keys_by_node(self, keys: Iterable[str]) -> list[list[str]]:
+        """
+        Split keys into groups which can share a single pipeline. Redis Cluster pipelines
+        route commands to the owning nodes themselves, so all keys go into one group there.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            return [list(keys)]
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            router = self.cluster.get_router()
+            by_host: dict[int, list[str]] = defaultdict(list)
+            for key in keys:
+                by_host[router.get_host_for_key(key)].append(key)
+            return list(by_host.values())
+        else:
+            raise AssertionError("unreachable")
+
+    def _queue_incr(
+        self, pipe: Pipeline, key: str, increment: BufferIncrement, timestamp: float
+    ) -> None:
+        model = increment.model
         pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
-        _validate_json_roundtrip(filters, model)
+        _validate_json_roundtrip(increment.filters, model)
 
         if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-            pipe.hsetnx(key, "f", json.dumps(self._dump_values(filters)))
+            pipe.hsetnx(key, "f", json.dumps(self._dump_values(increment.filters)))
         else:
-            pipe.hsetnx(key, "f", pickle.dumps(filters))
+            pipe.hsetnx(key, "f", pickle.dumps(increment.filters))
 
-        for column, amount in columns.items():
+        for column, amount in increment.columns.items():
             pipe.hincrby(key, "i+" + column, amount)
 
-        if extra:
+        if increment.extra:
             # Group tries to serialize 'score', so we'd need some kind of processing
             # hook here
             # e.g. "update score if last_seen or times_seen is changed"
-            _validate_json_roundtrip(extra, model)
-            for column, value in extra.items():
+            _validate_json_roundtrip(increment.extra, model)
+            for column, value in increment.extra.items():
                 if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
                     pipe.hset(key, "e+" + column, json.dumps(self._dump_value(value)))
                 else:
                     pipe.hset(key, "e+" + column, pickle.dumps(value))
 
-        if signal_only is True:
+        if increment.signal_only is True:
             pipe.hset(key, "s", "1")
 
         pipe.expire(key, self.key_expire)
-        pipe.zadd(self.pending_key, {key: time()})
-        pipe.execute()
+        pipe.zadd(self._make_pending_key(self._get_pending_shard(key)), {key: timestamp})
 
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
-        )
+    def get_pending_shards(self) -> int:
+        return self.pending_shards
+
+    def process_pending(self, shard: int | None = None) -> None:
+        """
+        Drains the pending set and schedules `process_incr` tasks for the drained keys.
 
-    def process_pending(self) -> None:
+        If `shard` is given only that shard of the pending set is drained, otherwise all shards are
+        drained one after the other. Every shard is drained under its own lock, so separate
+        schedulers can work on different shards concurrently.
+
+        Together with the first shard, the shards above the current shard count are drained, see
+        `_process_stale_pending_shards`.
+        """
+        if shard is not None:
+            assert 0 <= shard < self.pending_shards
+            self._process_pending_shard(shard)
+            if shard == 0:
+                self._process_stale_pending_shards()
+            return
+
+        for shard in range(self.pending_shards):
+            self._process_pending_shard(shard)
+        self._process_stale_pending_shards()
+
+    def _process_stale_pending_shards(self) -> None:
+        """
+        Drains the shards of the pending set that are only in use with a larger shard count. They
+        hold keys added before the shard count was reduced, or by processes still running with the
+        larger count.
+
+        Every shard count the pending set is used with is recorded in Redis, so the shards of
+        earlier, larger counts keep being drained.
+        """
+        client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
+        client.sadd(self.pending_shard_counts_key, self.pending_shards)
+        max_shards = max(int(count) for count in client.smembers(self.pending_shard_counts_key))
+        for shard in range(self.pending_shards, max_shards):
+            self._process_pending_shard(shard)
+
+    def _process_pending_shard(self, shard: int) -> None:
+        pending_key = self._make_pending_key(shard)
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
-        lock_key = self._lock_key(client, self.pending_key, ex=60)
+        lock_key = self._lock_key(client, pending_key, ex=60)
         if not lock_key:
+            metrics.incr("buffer.pending-shard.locked", tags={"shard": shard})
             return
 
+        start = time()
+
         pending_buffers_router = redis_buffer_router.create_pending_buffers_router(
             incr_batch_size=self.incr_batch_size
         )
@@ -542,7 +668,7 @@ class RedisBuffer(Buffer):
         try:
             keycount = 0
             if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-                keys: list[str] = self.cluster.zrange(self.pending_key, 0, -1)
+                keys: list[str] = self.cluster.zrange(pending_key, 0, -1)
                 keycount += len(keys)
 
                 for key in keys:
@@ -557,10 +683,10 @@ class RedisBuffer(Buffer):
                             **process_incr_kwargs,
                         )
 
-                self.cluster.zrem(self.pending_key, *keys)
+                self.cluster.zrem(pending_key, *keys)
             elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
                 with self.cluster.all() as conn:
-                    results = conn.zrange(self.pending_key, 0, -1)
+                    results = conn.zrange(pending_key, 0, -1)
 
                 with self.cluster.all() as conn:
                     for host_id, keysb in results.value.items():
@@ -583,7 +709,7 @@ class RedisBuffer(Buffer):
                                     headers={"sentry-propagate-traces": False},
                                     **process_incr_kwargs,
                                 )
-                        conn.target([host_id]).zrem(self.pending_key, *keysb)
+                        conn.target([host_id]).zrem(pending_key, *keysb)
             else:
                 raise AssertionError("unreachable")
 
@@ -601,6 +727,10 @@ class RedisBuffer(Buffer):
                     )
 
             metrics.distribution("buffer.pending-size", keycount)
+            metrics.distribution("buffer.pending-shard.size", keycount, tags={"shard": shard})
+            metrics.timing(
+                "buffer.pending-shard.drain-duration", time() - start, tags={"shard": shard}
+            )
         finally:
             client.delete(lock_key)
 
@@ -636,7 +766,7 @@ class RedisBuffer(Buffer):
         try:
             pipe = self.get_redis_connection(key, transaction=False)
             pipe.hgetall(key)
-            pipe.zrem(self.pending_key, key)
+            pipe.zrem(self._make_pending_key(self._get_pending_shard(key)), key)
             pipe.delete(key)
             values = pipe.execute()[0]
 
@@ -38,6 +38,20 @@ class BaseCache(local):
     def get(self, key, version=None, raw=False):
         raise NotImplementedError
 
+    def get_many(self, keys, version=None, raw=False):
+        """
+        Return the values of all keys, in order. Backends which can fetch multiple keys in one
+        round trip override this.
+        """
+        return [self.get(key, version=version, raw=raw) for key in keys]
+
+    def exists_many(self, keys, version=None):
+        """
+        Return whether each of the keys is set, in order. Backends which can check keys without
+        reading their values override this.
+        """
+        return [self.get(key, version=version, raw=True) is not None for key in keys]
+
     def _mark_transaction(self, op):
         """
         Mark transaction with a tag so we can identify system components that rely
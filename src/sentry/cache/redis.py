@@ -69,3 +69,28 @@ class RedisClusterCache(CommonRedisCache):
         client = redis_clusters.get(cluster_id)
         raw_client = redis_clusters.get_binary(cluster_id)
         super().__init__(client=client, raw_client=raw_client, **options)
+
+    def get_many(self, keys, version=None, raw=False):
+        # Keys usually live on different nodes, so they are fetched with a pipeline rather than
+        # a single MGET.
+        with self._client(raw=raw).pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.get(self.make_key(key, version=version))
+            results = pipeline.execute()
+
+        if not raw:
+            results = [json.loads(result) if result is not None else None for result in results]
+
+        self._mark_transaction("get")
+
+        return results
+
+    def exists_many(self, keys, version=None):
+        with self._client(raw=True).pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.exists(self.make_key(key, version=version))
+            results = pipeline.execute()
+
+        self._mark_transaction("get")
+
+        return [bool(result) for result in results]
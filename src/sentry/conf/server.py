@@ -1714,6 +1714,8 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 # Snuba configuration
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
+# Number of threads (and pooled connections) used to run Snuba queries in parallel.
+SENTRY_SNUBA_QUERY_THREADS = 10
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 
 # Node storage backend
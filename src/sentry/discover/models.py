@@ -153,6 +153,7 @@ class TeamKeyTransactionModelManager(BaseManager["TeamKeyTransaction"]):
 
         if features.has("organizations:dynamic-sampling", project.organization):
             from sentry.dynamic_sampling import RuleType, get_enabled_user_biases
+            from sentry.relay.config.sections import SAMPLING
 
             # check if option is enabled
             enabled_biases = get_enabled_user_biases(
@@ -160,7 +161,9 @@ class TeamKeyTransactionModelManager(BaseManager["TeamKeyTransaction"]):
             )
             # invalidate project config only when the rule is enabled
             if RuleType.BOOST_KEY_TRANSACTIONS_RULE.value in enabled_biases:
-                schedule_invalidate_project_config(project_id=project.id, trigger=trigger)
+                schedule_invalidate_project_config(
+                    project_id=project.id, trigger=trigger, sections=[SAMPLING]
+                )
 
     def post_save(self, *, instance: TeamKeyTransaction, created: bool, **kwargs: object) -> None:
         # this hook may be called from model hooks during an
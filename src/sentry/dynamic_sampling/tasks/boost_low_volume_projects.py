@@ -61,6 +61,7 @@ from sentry.dynamic_sampling.utils import has_dynamic_sampling, is_project_mode_
 from sentry.models.options import OrganizationOption
 from sentry.models.organization import Organization
 from sentry.models.project import Project
+from sentry.relay.config.sections import SAMPLING
 from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.silo.base import SiloMode
@@ -464,6 +465,7 @@ def adjust_sample_rates_of_projects(
                 schedule_invalidate_project_config(
                     project_id=rebalanced_project.id,
                     trigger="dynamic_sampling_boost_low_volume_projects",
+                    sections=[SAMPLING],
                 )
 
         pipeline.execute()
@@ -47,6 +47,7 @@ from sentry.dynamic_sampling.tasks.utils import (
 from sentry.dynamic_sampling.utils import has_dynamic_sampling, is_project_mode_sampling
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.organization import Organization
+from sentry.relay.config.sections import SAMPLING
 from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.silo.base import SiloMode
@@ -237,7 +238,9 @@ def boost_low_volume_transactions_of_project(project_transactions: ProjectTransa
     )
 
     schedule_invalidate_project_config(
-        project_id=project_id, trigger="dynamic_sampling_boost_low_volume_transactions"
+        project_id=project_id,
+        trigger="dynamic_sampling_boost_low_volume_transactions",
+        sections=[SAMPLING],
     )
 
 
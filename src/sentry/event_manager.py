@@ -99,6 +99,7 @@ from sentry.models.releases.release_project import ReleaseProject
 from sentry.net.http import connection_from_url
 from sentry.plugins.base import plugins
 from sentry.quotas.base import index_data_category
+from sentry.relay.config.sections import SAMPLING
 from sentry.reprocessing2 import is_reprocessed_event
 from sentry.seer.signed_seer_api import make_signed_seer_api_request
 from sentry.signals import (
@@ -108,7 +109,7 @@ from sentry.signals import (
     first_transaction_received,
     issue_unresolved,
 )
-from sentry.tasks.process_buffer import buffer_incr
+from sentry.tasks.process_buffer import batch_buffer_incr, buffer_incr
 from sentry.tasks.relay import schedule_invalidate_project_config
 from sentry.tsdb.base import TSDBModel
 from sentry.types.activity import ActivityType
@@ -566,25 +567,31 @@ class EventManager:
         else:
             attachments = []
 
-        try:
-            group_info = assign_event_to_group(event=job["event"], job=job, metric_tags=metric_tags)
+        # Group, release and group release counters are all bumped through the buffer while
+        # grouping the event, so collect them and write them out together.
+        with batch_buffer_incr():
+            try:
+                group_info = assign_event_to_group(
+                    event=job["event"], job=job, metric_tags=metric_tags
+                )
 
-        except HashDiscarded:
-            discard_event(job, attachments)
-            raise
+            except HashDiscarded:
+                discard_event(job, attachments)
+                raise
 
-        if not group_info:
-            return job["event"]
+            if not group_info:
+                return job["event"]
 
-        # store a reference to the group id to guarantee validation of isolation
-        # XXX(markus): No clue what this does
-        job["event"].data.bind_ref(job["event"])
+            # store a reference to the group id to guarantee validation of isolation
+            # XXX(markus): No clue what this does
+            job["event"].data.bind_ref(job["event"])
+
+            _get_or_create_environment_many(jobs, projects)
+            _get_or_create_group_environment_many(jobs)
+            _get_or_create_release_associated_models(jobs, projects)
+            _increment_release_associated_counts_many(jobs, projects)
+            _get_or_create_group_release_many(jobs)
 
-        _get_or_create_environment_many(jobs, projects)
-        _get_or_create_group_environment_many(jobs)
-        _get_or_create_release_associated_models(jobs, projects)
-        _increment_release_associated_counts_many(jobs, projects)
-        _get_or_create_group_release_many(jobs)
         _tsdb_record_all_metrics(jobs)
 
         if attachments:
@@ -796,6 +803,7 @@ def _get_or_create_release_many(jobs: Sequence[Job], projects: ProjectsMapping)
                                 schedule_invalidate_project_config(
                                     project_id=project_id,
                                     trigger="dynamic_sampling:boost_release",
+                                    sections=[SAMPLING],
                                 )
 
                             LatestReleaseBias(
@@ -2389,9 +2397,7 @@ def save_attachment(
     else:
         timestamp = datetime.now(timezone.utc)
 
-    try:
-        attachment.data
-    except MissingAttachmentChunks:
+    def track_missing_chunks() -> None:
         track_outcome(
             org_id=project.organization_id,
             project_id=project.id,
@@ -2404,7 +2410,20 @@ def save_attachment(
         )
 
         logger.exception("Missing chunks for cache_key=%s", cache_key)
+
+    # When streaming, chunks are only read from the cache while storing the attachment, so only
+    # check that they all exist before the attachment counts against the rate limits.
+    streaming = options.get("sentry.save-event-attachments.streaming")
+    try:
+        if streaming:
+            if not attachment.has_data():
+                raise MissingAttachmentChunks()
+        else:
+            attachment.data
+    except MissingAttachmentChunks:
+        track_missing_chunks()
         return
+
     from sentry import ratelimits as ratelimiter
 
     is_limited, num_requests, reset_time = ratelimiter.backend.is_limited_with_value(
@@ -2439,7 +2458,21 @@ def save_attachment(
         )
         return
 
-    file = EventAttachment.putfile(project.id, attachment)
+    try:
+        with metrics.timer(
+            "event_manager.attachments.save",
+            tags={"type": attachment.type, "streaming": streaming},
+        ):
+            file = EventAttachment.putfile(project.id, attachment)
+    except MissingAttachmentChunks:
+        track_missing_chunks()
+        return
+    metrics.distribution(
+        "event_manager.attachments.save.size",
+        file.size,
+        tags={"type": attachment.type},
+        unit="byte",
+    )
 
     EventAttachment.objects.create(
         # lookup:
@@ -207,6 +207,31 @@ class GoogleCloudFile(File):
 
         return super().read(num_bytes)
 
+    def read_range(self, start, end):
+        """
+        Read the bytes from start up to end (exclusive) without downloading
+        the whole file.
+        """
+        if "r" not in self._mode:
+            raise AttributeError("File was not opened in read mode.")
+
+        if self._file is not None:
+            self._file.seek(start)
+            return self._file.read(end - start)
+        if end <= start:
+            return b""
+
+        result = b""
+
+        def _try_download():
+            nonlocal result
+            # The end of GCS ranges is inclusive.
+            result = self.blob.download_as_bytes(start=start, end=end - 1)
+
+        with metrics.timer("filestore.read_range", instance="gcs"):
+            self._storage.try_get(_try_download)
+        return result
+
     def write(self, content):
         if "w" not in self._mode:
             raise AttributeError("File was not opened in write mode.")
@@ -178,6 +178,25 @@ class S3Boto3StorageFile(File):
             raise AttributeError("File was not opened in read mode.")
         return super().read(*args, **kwargs)
 
+    def read_range(self, start, end):
+        """
+        Read the bytes from start up to end (exclusive) without downloading
+        the whole file.
+        """
+        if "r" not in self._mode:
+            raise AttributeError("File was not opened in read mode.")
+
+        # Ranges of gzipped objects are ranges of the compressed bytes.
+        if self._file is not None or self._storage.gzip:
+            self.file.seek(start)
+            return self.file.read(end - start)
+        if end <= start:
+            return b""
+
+        with metrics.timer("filestore.read_range", instance="s3"):
+            # The end of HTTP ranges is inclusive.
+            return self.obj.get(Range=f"bytes={start}-{end - 1}")["Body"].read()
+
     def write(self, content):
         if "w" not in self._mode:
             raise AttributeError("File was not opened in write mode.")
@@ -25,6 +25,10 @@ class ParameterizationRegex:
     lookbehind: str | None = None  # positive lookbehind prefix if needed
     lookahead: str | None = None  # positive lookahead postfix if needed
     counter: int = 0
+    # Cheap regex which must match somewhere in a string for `raw_pattern` to possibly match it.
+    # Used to skip running the full pattern on strings without any candidates. `None` disables
+    # the prefilter.
+    prefilter: str | None = None
 
     # These need to be used with `(?x)` tells the regex compiler to ignore comments
     # and unescaped whitespace, so we can use newlines and indentation for better legibility.
@@ -52,8 +56,13 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
     ParameterizationRegex(
         name="email",
         raw_pattern=r"""[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*""",
+        prefilter=r"@",
+    ),
+    ParameterizationRegex(
+        name="url",
+        raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*""",
+        prefilter=r"://",
     ),
-    ParameterizationRegex(name="url", raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*"""),
     ParameterizationRegex(
         name="hostname",
         raw_pattern=r"""
@@ -66,6 +75,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             )
             \b
         """,
+        prefilter=r"\.",
     ),
     ParameterizationRegex(
         name="ip",
@@ -93,13 +103,21 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
                 (25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\b
             )
         """,
+        # IPv4 addresses always contain dots, IPv6 addresses always contain either a hex digit
+        # followed by a colon or a double colon
+        prefilter=r"\.|[0-9a-fA-F]:|::",
     ),
     ParameterizationRegex(
         name="uuid",
         raw_pattern=r"""\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b""",
+        prefilter=r"[0-9a-fA-F]{8}-",
+    ),
+    ParameterizationRegex(
+        name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b""", prefilter=r"[0-9a-fA-F]{40}"
+    ),
+    ParameterizationRegex(
+        name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b""", prefilter=r"[0-9a-fA-F]{32}"
     ),
-    ParameterizationRegex(name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b"""),
-    ParameterizationRegex(name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b"""),
     ParameterizationRegex(
         name="date",
         raw_pattern=r"""
@@ -152,11 +170,17 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             ) |
             (datetime.datetime\(.*?\))
         """,
+        # Every date format contains at least one digit, except for the `datetime` repr
+        prefilter=r"\d|datetime\.datetime\(",
     ),
-    ParameterizationRegex(name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b"""),
-    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b"""),
-    ParameterizationRegex(name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b"""),
-    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b"""),
+    ParameterizationRegex(
+        name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b""", prefilter=r"\d"
+    ),
+    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b""", prefilter=r"0[xX]"),
+    ParameterizationRegex(
+        name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b""", prefilter=r"\d\."
+    ),
+    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b""", prefilter=r"\d"),
     ParameterizationRegex(
         name="quoted_str",
         raw_pattern=r"""# Using `=`lookbehind which guarantees we'll only match the value half of key-value pairs,
@@ -164,6 +188,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             '([^']+)' | "([^"]+)"
         """,
         lookbehind="=",
+        prefilter=r"=",
     ),
     ParameterizationRegex(
         name="bool",
@@ -175,11 +200,96 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             false
         """,
         lookbehind="=",
+        prefilter=r"=",
     ),
 ]
 
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
+DEFAULT_PARAMETERIZATION_PREFILTERS_MAP = {
+    r.name: r.prefilter for r in DEFAULT_PARAMETERIZATION_REGEXES
+}
+
+# Messages up to this length have their regex parameterization result cached, see
+# `_parametrize_w_regex_cached`.
+PARAMETERIZATION_CACHE_MAX_CONTENT_LENGTH = 1024
+PARAMETERIZATION_CACHE_SIZE = 4096
+
+
+def _placeholder_key(match: re.Match[str]) -> str | None:
+    """
+    Returns the name of the pattern which produced the match.
+
+    Every pattern is wrapped in exactly one named group, which is the outermost group of its
+    alternative, so `lastgroup` names it without having to scan `groupdict()`.
+    """
+    if match.lastgroup is not None:
+        return match.lastgroup
+
+    # Only reachable for patterns containing unnamed groups outside of their named group
+    for key, value in match.groupdict().items():
+        if value is not None:
+            return key
+    return None
+
+
+@lru_cache(maxsize=64)
+def _compile_parameterization(
+    pattern_keys: tuple[str, ...]
+) -> tuple[re.Pattern[str], re.Pattern[str] | None]:
+    """
+    Compile the combined regex for the given pattern keys, along with a prefilter regex that
+    matches any string the combined regex could possibly match (or `None` if at least one of the
+    patterns has no prefilter).
+
+    The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
+    so we can use newlines and indentation for better legibility in patterns above.
+    """
+    regex = re.compile(
+        rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
+    )
+
+    prefilters = [DEFAULT_PARAMETERIZATION_PREFILTERS_MAP[k] for k in pattern_keys]
+    if any(p is None for p in prefilters):
+        return regex, None
+    return regex, re.compile("|".join(f"(?:{p})" for p in prefilters if p is not None))
+
+
+def _parametrize_w_regex(
+    pattern_keys: tuple[str, ...], content: str
+) -> tuple[str, tuple[tuple[str, int], ...]]:
+    """
+    Replace all matches of the given patterns with placeholders, returning the result along with
+    the number of replacements made per pattern.
+    """
+    if not pattern_keys:
+        return content, ()
+
+    regex, prefilter = _compile_parameterization(pattern_keys)
+    if prefilter is not None and prefilter.search(content) is None:
+        return content, ()
+
+    counts: defaultdict[str, int] = defaultdict(int)
+
+    def _handle_regex_match(match: re.Match[str]) -> str:
+        # Sub in the placeholder for the pattern that matched. For example, given a match of
+        # '0x40000015' by the `hex` pattern, this returns '<hex>'.
+        key = _placeholder_key(match)
+        if key is None:
+            return ""
+        counts[key] += 1
+        return f"<{key}>"
+
+    return regex.sub(_handle_regex_match, content), tuple(counts.items())
+
+
+@lru_cache(maxsize=PARAMETERIZATION_CACHE_SIZE)
+def _parametrize_w_regex_cached(
+    pattern_keys: tuple[str, ...], content: str
+) -> tuple[str, tuple[tuple[str, int], ...]]:
+    # Log-heavy projects send the same handful of messages over and over again, so most
+    # parameterization calls can be served from here.
+    return _parametrize_w_regex(pattern_keys, content)
 
 
 @dataclasses.dataclass
@@ -237,6 +347,7 @@ class _UniqueId:
     TOKEN_LENGTH_RATIO_LONG = 0.4
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def is_probably_uniq_id(token_str: str) -> bool:
         token_str = token_str.strip("\"'[]{}():;")
         if len(token_str) < _UniqueId.TOKEN_LENGTH_MINIMUM:
@@ -281,7 +392,8 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
-        self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._pattern_keys = tuple(regex_pattern_keys)
+        self._parameterization_regex = self._make_regex_from_patterns(self._pattern_keys)
         self._experiments = experiments
 
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
@@ -294,37 +406,29 @@ class Parameterizer:
         @param pattern_keys: A list of keys to match in the _parameterization_regex_components dict.
         @returns: A compiled regex pattern that matches any of the given keys.
         @raises: KeyError on pattern key not in the _parameterization_regex_components dict
-
-        The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
-        so we can use newlines and indentation for better legibility in patterns above.
         """
-
-        return re.compile(
-            rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
-        )
+        return _compile_parameterization(tuple(pattern_keys))[0]
 
     def parametrize_w_regex(self, content: str) -> str:
         """
         Replace all matches of the given regex in the content with a placeholder string.
 
+        Strings which cannot contain any match are skipped with a cheap prefilter, and results for
+        short strings are cached, since the same messages tend to come in over and over again.
+
         @param content: The string to replace matches in.
-        @param parameterization_regex: The compiled regex pattern to match.
-        @param match_callback: An optional callback function to call with the key of the matched pattern.
 
         @returns: The content with all matches replaced with placeholders.
         """
+        if len(content) <= PARAMETERIZATION_CACHE_MAX_CONTENT_LENGTH:
+            result, counts = _parametrize_w_regex_cached(self._pattern_keys, content)
+        else:
+            result, counts = _parametrize_w_regex(self._pattern_keys, content)
 
-        def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
+        for key, count in counts:
+            self.matches_counter[key] += count
 
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        return result
 
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
@@ -340,14 +444,13 @@ class Parameterizer:
             self.matches_counter[key] += count
 
         def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
+            # Sub in the placeholder for the pattern that matched. For example, given a match of
+            # '0x40000015' by the `hex` pattern, this returns '<hex>'.
+            key = _placeholder_key(match)
+            if key is None:
+                return ""
+            self.matches_counter[key] += 1
+            return f"<{key}>"
 
         for experiment in self._experiments:
             if not should_run(experiment.name):
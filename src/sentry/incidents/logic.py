@@ -60,6 +60,7 @@ from sentry.models.notificationaction import ActionService, ActionTarget
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.relay.config.metric_extraction import on_demand_metrics_feature_flags
+from sentry.relay.config.sections import TRANSACTION_METRICS
 from sentry.search.events.builder.base import BaseQueryBuilder
 from sentry.search.events.constants import (
     METRICS_LAYER_UNSUPPORTED_TRANSACTION_METRICS_FUNCTIONS,
@@ -1952,5 +1953,7 @@ def schedule_update_project_config(
     if should_use_on_demand:
         for project in projects:
             schedule_invalidate_project_config(
-                trigger="alerts:create-on-demand-metric", project_id=project.id
+                trigger="alerts:create-on-demand-metric",
+                project_id=project.id,
+                sections=[TRANSACTION_METRICS],
             )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import mimetypes
+from collections.abc import Iterable
 from dataclasses import dataclass
 from hashlib import sha1
 from io import BytesIO
@@ -12,6 +13,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.utils import timezone
 
+from sentry import options
 from sentry.attachments.base import CachedAttachment
 from sentry.backup.scopes import RelocationScope
 from sentry.db.models import BoundedBigIntegerField, Model, region_silo_model, sane_repr
@@ -52,6 +54,9 @@ class PutfileResult:
     blob_path: str | None = None
 
 
+INLINE_SIZE_LIMIT = 192
+
+
 def can_store_inline(data: bytes) -> bool:
     """
     Determines whether `data` can be stored inline
@@ -59,7 +64,7 @@ def can_store_inline(data: bytes) -> bool:
     That is the case when it is shorter than 192 bytes,
     and all the bytes are non-NULL ASCII.
     """
-    return len(data) < 192 and all(byte > 0x00 and byte < 0x7F for byte in data)
+    return len(data) < INLINE_SIZE_LIMIT and all(byte > 0x00 and byte < 0x7F for byte in data)
 
 
 @region_silo_model
@@ -171,6 +176,9 @@ class EventAttachment(Model):
         from sentry.models.files import FileBlob
 
         content_type = normalize_content_type(attachment.content_type, attachment.name)
+        if options.get("sentry.save-event-attachments.streaming"):
+            return cls._putfile_stream(content_type, attachment.stream_data())
+
         data = attachment.data
 
         if len(data) == 0:
@@ -193,6 +201,44 @@ class EventAttachment(Model):
             content_type=content_type, size=size, sha1=checksum, blob_path=blob_path
         )
 
+    @classmethod
+    def _putfile_stream(cls, content_type: str, chunks: Iterable[bytes]) -> PutfileResult:
+        """
+        Like `putfile`, but compresses the attachment while reading its chunks, so that only the
+        compressed attachment is held in memory.
+        """
+        from sentry.models.files import FileBlob
+
+        size = 0
+        checksum = sha1()
+        # Enough of the data to decide whether the attachment can be stored inline
+        head = b""
+        compressed_blob = BytesIO()
+
+        with zstandard.ZstdCompressor().stream_writer(compressed_blob, closefd=False) as writer:
+            for chunk in chunks:
+                size += len(chunk)
+                checksum.update(chunk)
+                writer.write(chunk)
+                if len(head) < INLINE_SIZE_LIMIT:
+                    head += chunk[:INLINE_SIZE_LIMIT]
+
+        if size == 0:
+            return PutfileResult(content_type=content_type, size=0, sha1=checksum.hexdigest())
+
+        if size < INLINE_SIZE_LIMIT and can_store_inline(head):
+            blob_path = ":" + head.decode()
+        else:
+            blob_path = "eventattachments/v1/" + FileBlob.generate_unique_path()
+
+            storage = get_storage()
+            compressed_blob.seek(0)
+            storage.save(blob_path, compressed_blob)
+
+        return PutfileResult(
+            content_type=content_type, size=size, sha1=checksum.hexdigest(), blob_path=blob_path
+        )
+
 
 def normalize_content_type(content_type: str | None, name: str) -> str:
     if content_type:
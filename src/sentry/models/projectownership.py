@@ -18,6 +18,7 @@ from sentry.eventstore.models import Event, GroupEvent
 from sentry.models.activity import Activity
 from sentry.models.group import Group
 from sentry.models.groupowner import OwnerRuleType
+from sentry.ownership.compiled import get_compiled_rules
 from sentry.ownership.grammar import Matcher, Rule, load_schema, resolve_actors
 from sentry.types.activity import ActivityType
 from sentry.types.actor import Actor
@@ -382,6 +383,15 @@ class ProjectOwnership(Model):
             tags={"ownership_type": ownership_type},
         )
 
+        if options.get("ownership.compiled-matcher"):
+            compiled = get_compiled_rules(ownership.schema)
+            metrics.distribution(
+                key="projectownership.matching_ownership_rules.rules",
+                value=len(compiled.rules),
+                tags={"ownership_type": ownership_type},
+            )
+            return compiled.matching_rules(data, munged_data)
+
         rules = load_schema(ownership.schema)
         metrics.distribution(
             key="projectownership.matching_ownership_rules.rules",
@@ -29,6 +29,7 @@ class ReleaseProjectModelManager(BaseManager["ReleaseProject"]):
     @staticmethod
     def _on_post(project, trigger):
         from sentry.dynamic_sampling import ProjectBoostedReleases
+        from sentry.relay.config.sections import SAMPLING
 
         project_boosted_releases = ProjectBoostedReleases(project.id)
         # We want to invalidate the project config only if dynamic sampling is enabled and there exists boosted releases
@@ -37,7 +38,9 @@ class ReleaseProjectModelManager(BaseManager["ReleaseProject"]):
             features.has("organizations:dynamic-sampling", project.organization)
             and project_boosted_releases.has_boosted_releases
         ):
-            schedule_invalidate_project_config(project_id=project.id, trigger=trigger)
+            schedule_invalidate_project_config(
+                project_id=project.id, trigger=trigger, sections=[SAMPLING]
+            )
 
     @staticmethod
     def subscribe_project_to_alert_rule(
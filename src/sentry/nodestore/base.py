@@ -10,6 +10,8 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore.cache import node_bytes_cache
+from sentry.nodestore.encoding import decode_segment, encode_segments, is_binary_encoded
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -100,6 +102,12 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if is_binary_encoded(value):
+            segment = decode_segment(value, subkey)
+            if segment is None:
+                return None
+            return json_loads(segment)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -147,7 +155,7 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
+            bytes_data = self._get_bytes_cached(id)
             rv = self._decode(bytes_data, subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
@@ -171,6 +179,40 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
+    def _get_bytes_cached(self, id: str) -> bytes | None:
+        """
+        `_get_bytes` behind the process-local `node_bytes_cache`.
+        """
+        found, value = node_bytes_cache.get(id)
+        if found:
+            return value
+
+        value = self._get_bytes(id)
+        node_bytes_cache.set(id, value)
+        return value
+
+    def _get_bytes_multi_cached(self, id_list: list[str]) -> dict[str, bytes | None]:
+        """
+        `_get_bytes_multi` behind the process-local `node_bytes_cache`.
+        """
+        rv: dict[str, bytes | None] = {}
+        missing_ids = []
+        for id in id_list:
+            found, value = node_bytes_cache.get(id)
+            if found:
+                rv[id] = value
+            else:
+                missing_ids.append(id)
+
+        if missing_ids:
+            fetched = self._get_bytes_multi(missing_ids)
+            for id in missing_ids:
+                value = fetched.get(id)
+                node_bytes_cache.set(id, value)
+                rv[id] = value
+
+        return rv
+
     def get_multi(self, id_list: list[str], subkey: str | None = None) -> dict[str, Any | None]:
         """
         >>> nodestore.get_multi(['key1', 'key2')
@@ -196,7 +238,7 @@ class NodeStorage(local, Service):
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
                 items = {
                     id: self._decode(value, subkey=subkey)
-                    for id, value in self._get_bytes_multi(uncached_ids).items()
+                    for id, value in self._get_bytes_multi_cached(uncached_ids).items()
                 }
             if subkey is None:
                 self._set_cache_items(items)
@@ -215,7 +257,22 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        If `nodestore.binary-encoding.enabled` is set, the indexed binary container from
+        `sentry.nodestore.encoding` is written instead, which lets readers decode a single subkey
+        without scanning the others. Both formats are always readable.
         """
+        if options.get("nodestore.binary-encoding.enabled"):
+            segments = [(None, json_dumps(data.pop(None)).encode("utf8"))]
+            for key, value in data.items():
+                if key is not None:
+                    segments.append((key, json_dumps(value).encode("utf8")))
+            return encode_segments(
+                segments,
+                compression_threshold=options.get("nodestore.binary-encoding.compression-threshold")
+                or None,
+            )
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -229,7 +286,10 @@ class NodeStorage(local, Service):
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
         metrics.distribution("nodestore.set_bytes", len(data))
-        return self._set_bytes(item_id, data, ttl)
+        try:
+            return self._set_bytes(item_id, data, ttl)
+        finally:
+            node_bytes_cache.delete(item_id)
 
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
@@ -294,10 +354,13 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        node_bytes_cache.delete(item_id)
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        for item_id in id_list:
+            node_bytes_cache.delete(item_id)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
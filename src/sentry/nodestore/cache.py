@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+from sentry import options
+from sentry.utils import metrics
+
+
+class NodeBytesCache:
+    """
+    Process-local read-through cache of raw nodestore values, keyed by node id.
+
+    Entries hold the encoded bytes of a node rather than its decoded payload, so a single entry
+    serves reads of the default payload as well as of every subkey, and callers always get a
+    freshly decoded object they are free to mutate. The cache is bounded by the total size of
+    the cached values and evicts least recently used entries first.
+
+    Writes and deletes through this process update the cache, but those of other processes are
+    not seen, so values expire after `nodestore.local-cache.ttl` seconds. Lookups of nodes that
+    do not exist are remembered for a shorter time, so repeated reads of deleted events do not
+    all go to the backend.
+
+    Sizing is controlled through the `nodestore.local-cache.max-bytes` (0 disables the cache),
+    `nodestore.local-cache.ttl` and `nodestore.local-cache.negative-ttl` options.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # id -> (value or None for missing nodes, size, expires at)
+        self._entries: OrderedDict[str, tuple[bytes | None, int, float]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return options.get("nodestore.local-cache.max-bytes")
+
+    @property
+    def ttl(self) -> float:
+        return options.get("nodestore.local-cache.ttl")
+
+    @property
+    def negative_ttl(self) -> float:
+        return options.get("nodestore.local-cache.negative-ttl")
+
+    def get(self, id: str) -> tuple[bool, bytes | None]:
+        """
+        Returns `(found, value)`. `found` is true for cached values as well as for nodes cached as
+        missing, in which case `value` is `None`.
+        """
+        if self.max_bytes <= 0:
+            return False, None
+
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at <= monotonic():
+                    self._remove(id)
+                    entry = None
+                else:
+                    self._entries.move_to_end(id)
+
+        if entry is None:
+            metrics.incr("nodestore.local_cache.get", tags={"result": "miss"})
+            return False, None
+
+        if value is None:
+            metrics.incr("nodestore.local_cache.get", tags={"result": "negative_hit"})
+            return True, None
+
+        metrics.incr("nodestore.local_cache.get", tags={"result": "hit"})
+        metrics.distribution("nodestore.local_cache.hit_bytes", size, unit="byte")
+        return True, value
+
+    def set(self, id: str, value: bytes | None) -> None:
+        """
+        Cache a value read from or written to the backend. `None` caches the node as missing.
+        """
+        max_bytes = self.max_bytes
+        if max_bytes <= 0:
+            return
+
+        if value is None:
+            # Negative entries are accounted by the size of their id so that they are bounded too.
+            ttl = self.negative_ttl
+            size = len(id)
+        else:
+            ttl = self.ttl
+            size = len(value)
+
+        if ttl <= 0 or size > max_bytes:
+            self.delete(id)
+            return
+        entry = (value, size, monotonic() + ttl)
+
+        with self._lock:
+            self._remove(id)
+            self._entries[id] = entry
+            self._size += size
+            while self._size > max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                metrics.incr("nodestore.local_cache.evict")
+            total_size = self._size
+
+        metrics.gauge("nodestore.local_cache.bytes", total_size)
+
+    def delete(self, id: str) -> None:
+        with self._lock:
+            self._remove(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, id: str) -> None:
+        entry = self._entries.pop(id, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+node_bytes_cache = NodeBytesCache()
@@ -10,6 +10,7 @@ from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
 from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.encoding import is_binary_encoded
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -27,7 +28,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or is_binary_encoded(value):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
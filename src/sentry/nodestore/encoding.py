@@ -0,0 +1,119 @@
+"""
+Versioned binary container for nodestore payloads.
+
+The legacy encoding (see `NodeStorage._encode`) joins the default payload and all subkeys with
+newlines, which forces readers to scan every line to find a subkey. This container instead starts
+with an index of all segments so any one of them can be sliced out without touching the others:
+
+    magic        4 bytes   b"\\x00NSB"
+    version      1 byte
+    count        u16       number of segments
+    index        count x   (flags: u8, name_length: u16, name: bytes, offset: u32, length: u32)
+    payloads     ...       concatenated segment payloads
+
+`offset` is relative to the start of the payload area. The default payload (the `None` subkey) is
+stored with an empty name. A segment with the `FLAG_ZSTD` flag set is zstd-compressed.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import zstandard
+
+MAGIC = b"\x00NSB"
+VERSION = 1
+
+FLAG_ZSTD = 0x01
+
+_HEADER = struct.Struct("<4sBH")
+_ENTRY_PREFIX = struct.Struct("<BH")
+_ENTRY_SUFFIX = struct.Struct("<II")
+
+
+class InvalidNodeEncoding(ValueError):
+    pass
+
+
+def is_binary_encoded(value: bytes) -> bool:
+    return value[: len(MAGIC)] == MAGIC
+
+
+def encode_segments(
+    segments: list[tuple[str | None, bytes]], compression_threshold: int | None = None
+) -> bytes:
+    """
+    Pack `(subkey, payload)` pairs into a binary container. Payloads of at least
+    `compression_threshold` bytes are zstd-compressed individually, pass `None` to disable
+    per-segment compression (e.g. because the backend already compresses the whole value).
+    """
+    index = []
+    payloads = []
+    offset = 0
+
+    for subkey, payload in segments:
+        flags = 0
+        if compression_threshold is not None and len(payload) >= compression_threshold:
+            compressed = zstandard.compress(payload)
+            if len(compressed) < len(payload):
+                flags |= FLAG_ZSTD
+                payload = compressed
+
+        # Those keys should be statically known identifiers in the app, such as
+        # "unprocessed_event". There is really no reason to allow anything but
+        # ASCII here.
+        name = subkey.encode("ascii") if subkey is not None else b""
+        index.append(_ENTRY_PREFIX.pack(flags, len(name)))
+        index.append(name)
+        index.append(_ENTRY_SUFFIX.pack(offset, len(payload)))
+        payloads.append(payload)
+        offset += len(payload)
+
+    return b"".join([_HEADER.pack(MAGIC, VERSION, len(segments)), *index, *payloads])
+
+
+def decode_segment(value: bytes, subkey: str | None) -> bytes | None:
+    """
+    Return the payload stored for `subkey`, or `None` if the container has no such segment. Only
+    the index and the requested segment are read.
+    """
+    view = memoryview(value)
+    try:
+        magic, version, count = _HEADER.unpack_from(view, 0)
+    except struct.error as e:
+        raise InvalidNodeEncoding("truncated header") from e
+
+    if magic != MAGIC:
+        raise InvalidNodeEncoding("not a binary encoded node")
+    if version != VERSION:
+        raise InvalidNodeEncoding(f"unsupported version: {version}")
+
+    wanted = subkey.encode("ascii") if subkey is not None else b""
+    found: tuple[int, int, int] | None = None
+
+    pos = _HEADER.size
+    try:
+        for _ in range(count):
+            flags, name_length = _ENTRY_PREFIX.unpack_from(view, pos)
+            pos += _ENTRY_PREFIX.size
+            name = view[pos : pos + name_length]
+            pos += name_length
+            offset, length = _ENTRY_SUFFIX.unpack_from(view, pos)
+            pos += _ENTRY_SUFFIX.size
+            if found is None and name == wanted:
+                found = (flags, offset, length)
+    except struct.error as e:
+        raise InvalidNodeEncoding("truncated index") from e
+
+    if found is None:
+        return None
+
+    flags, offset, length = found
+    start = pos + offset
+    if start + length > len(view):
+        raise InvalidNodeEncoding("truncated payload")
+
+    segment = view[start : start + length]
+    if flags & FLAG_ZSTD:
+        return zstandard.decompress(segment)
+    return segment.tobytes()
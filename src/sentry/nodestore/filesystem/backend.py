@@ -1,15 +1,22 @@
+import contextlib
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from django.conf import settings
 
 from sentry.nodestore.base import NodeStorage
+from sentry.utils.hashlib import md5_text
 
 
 class FileSystemNodeStorage(NodeStorage):
     """
     A simple backend that saves each node as a file. Only appropriate for
-    debugging and development!
+    debugging and development! See `BucketedFileSystemNodeStorage` for a
+    backend suited to production use.
     """
 
     def __init__(self, path: str | None = None):
@@ -51,3 +58,154 @@ class FileSystemNodeStorage(NodeStorage):
 
     def node_path(self, id: str) -> str:
         return os.path.join(self.path, f"{id}.json")
+
+
+class BucketedFileSystemNodeStorage(NodeStorage):
+    """
+    A backend that stores each node as a file on a local filesystem, suitable for single-node
+    installs.
+
+    The location of a node is derived from its id: nodes are fanned out into `fanout_levels`
+    levels of two-character sub-directories of a hash of the id, so no directory grows
+    unboundedly and a read is a single `open`:
+
+        <path>/nodes/ab/cd/<id>
+
+    Writes go to a temporary file which is atomically renamed into place, so readers never see
+    partial nodes. Every write also appends the id to the journal of its time bucket (one file
+    per `bucket_seconds`):
+
+        <path>/buckets/<bucket>
+
+    `cleanup` only visits the nodes listed in the journals of buckets that ended before the
+    cutoff, instead of stat-ing every file, and then removes those journals. A node that was
+    overwritten in a later bucket is kept until that bucket is cleaned up.
+
+    Nodes do not expire on their own, the `ttl` of writes is ignored. They are kept until
+    `cleanup` or `delete` removes them.
+
+    :param path: Root directory for node files.
+    :param bucket_seconds: Time span covered by one journal, in seconds.
+    :param fanout_levels: Number of hashed sub-directory levels.
+    :param max_workers: Size of the thread pool used to read nodes in `get_multi`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bucket_seconds: int = 60 * 60 * 24,
+        fanout_levels: int = 2,
+        max_workers: int = 8,
+    ):
+        assert bucket_seconds > 0
+        assert 0 <= fanout_levels <= 16
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.bucket_seconds = bucket_seconds
+        self.fanout_levels = fanout_levels
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def _nodes_path(self) -> str:
+        return os.path.join(self.path, "nodes")
+
+    @property
+    def _buckets_path(self) -> str:
+        return os.path.join(self.path, "buckets")
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Created lazily, so that backends built before a fork don't share the pool's threads.
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="nodestore-filesystem"
+                )
+            return self._pool
+
+    def _buckets(self) -> list[int]:
+        """
+        Returns all buckets with a journal, newest first.
+        """
+        try:
+            names = os.listdir(self._buckets_path)
+        except FileNotFoundError:
+            return []
+        return sorted((int(name) for name in names if name.isdigit()), reverse=True)
+
+    def _node_path(self, id: str) -> str:
+        digest = md5_text(id).hexdigest()
+        parts = [digest[i * 2 : i * 2 + 2] for i in range(self.fanout_levels)]
+        return os.path.join(self._nodes_path, *parts, id)
+
+    def _get_bytes(self, id: str) -> bytes | None:
+        try:
+            with open(self._node_path(id), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
+        if len(id_list) <= 1 or self.max_workers <= 1:
+            return {id: self._get_bytes(id) for id in id_list}
+
+        return dict(zip(id_list, self._get_pool().map(self._get_bytes, id_list)))
+
+    def _set_bytes(self, id: str, data: bytes, ttl: timedelta | None = None) -> None:
+        now = time.time()
+        path = self._node_path(id)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            # cleanup tells overwritten nodes apart by their modification time
+            os.utime(tmp_path, (now, now))
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
+        os.makedirs(self._buckets_path, exist_ok=True)
+        journal = os.path.join(self._buckets_path, str(int(now) // self.bucket_seconds))
+        # Appends of a single short line are atomic, so concurrent writers don't interleave.
+        with open(journal, "a") as file:
+            file.write(f"{id}\n")
+
+    def delete(self, id: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._node_path(id))
+        self._delete_cache_item(id)
+
+    def delete_multi(self, id_list: list[str]) -> None:
+        for id in id_list:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._node_path(id))
+        self._delete_cache_items(id_list)
+
+    def cleanup(self, cutoff: datetime) -> None:
+        cutoff_bucket = int(cutoff.timestamp()) // self.bucket_seconds
+        cutoff_timestamp = cutoff_bucket * self.bucket_seconds
+        # A bucket only contains nodes older than the cutoff if it ended before it.
+        for bucket in self._buckets():
+            if bucket >= cutoff_bucket:
+                continue
+            journal = os.path.join(self._buckets_path, str(bucket))
+            with open(journal) as file:
+                ids = set(file.read().split())
+            for id in ids:
+                path = self._node_path(id)
+                with contextlib.suppress(FileNotFoundError):
+                    # Nodes written again since are listed in a newer journal.
+                    if os.stat(path).st_mtime < cutoff_timestamp:
+                        os.remove(path)
+            os.remove(journal)
+        if self.cache:
+            self.cache.clear()
+
+    def bootstrap(self) -> None:
+        os.makedirs(self._nodes_path, exist_ok=True)
+        os.makedirs(self._buckets_path, exist_ok=True)
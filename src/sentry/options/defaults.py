@@ -452,6 +452,23 @@ register(
     default=None,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Store recording segments in the indexed encoding, which supports reading the video or a time
+# window of a segment without downloading all of it.
+register(
+    "replay.storage.indexed-segments",
+    type=Bool,
+    default=False,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# UNIX timestamp from which on recording segments are stored in the indexed encoding, i.e. when
+# `replay.storage.indexed-segments` was enabled. Only segments added since then are read with range
+# requests, older ones are downloaded whole. 0 disables range reads.
+register(
+    "replay.storage.indexed-segments.since",
+    type=Float,
+    default=0.0,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 # Globally disables replay-video.
 register(
     "replay.replay-video.disabled",
@@ -684,6 +701,27 @@ register(
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Maximum number of queries of a single bulk Snuba request which run in parallel, 0 means as many
+# as there are query threads (`SENTRY_SNUBA_QUERY_THREADS`).
+register("snuba.bulk-query.max-concurrency", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Maximum number of concurrent Snuba queries per process for individual referrers, e.g.
+# {"api.dashboards.widget.line-chart": 4}. Referrers which aren't listed are not limited.
+register(
+    "snuba.referrer-concurrency-limits", type=Dict, default={}, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+# Rollout rate for decoding Snuba responses with orjson.
+register("snuba.response.decode-orjson", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Size in bytes of the process-local tier of the Snuba query result cache, 0 disables it.
+register("snuba.query-cache.local-max-bytes", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Maximum time in seconds a result is served from the process-local tier.
+register("snuba.query-cache.local-ttl", default=10, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Round the timestamps of cached Snuba queries down to buckets of this many seconds (at most an
+# hour) when computing cache keys, so that queries over sliding windows like "the last 24 hours"
+# can share results. Results can be stale by up to this long on top of the cache TTL. 0 disables
+# bucketing.
+register("snuba.query-cache.time-bucket-seconds", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Kafka Publisher
 register("kafka-publisher.raw-event-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1036,6 +1074,18 @@ register(
 register(
     "post_process.get-autoassign-owners", type=Sequence, default=[], flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Rate of post process jobs whose pipeline steps run concurrently on a thread pool, each step as
+# soon as the steps it depends on are done (see sentry.tasks.post_process).
+register("post_process.parallel-pipeline.rollout", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Size of the per-process thread pool for concurrent pipelines, read when the pool is created.
+register("post_process.parallel-pipeline.workers", default=4, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Seconds after which a concurrently run pipeline step is abandoned, skipping its dependents.
+register(
+    "post_process.parallel-pipeline.step-timeout", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+# Evaluate ownership rules and CODEOWNERS with compiled, per-schema pattern indexes (see
+# sentry.ownership.compiled) instead of testing every rule against every frame.
+register("ownership.compiled-matcher", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register(
     "api.organization.disable-last-deploys",
     type=Sequence,
@@ -1129,6 +1179,12 @@ register(
 # Controls whether generic inbound filters are sent to Relay.
 register("relay.emit-generic-inbound-filters", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Cache the sections of project configs, so that invalidations only recompute the sections they
+# affect. See `sentry.relay.config.sections`.
+register("relay.config.section-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Seconds after which cached sections are recomputed, even if they were not invalidated.
+register("relay.config.section-cache.ttl", default=300, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1306,6 +1362,21 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Maximum number of strings held by the process-local cache of the caching indexer, which sits in
+# front of the shared indexer cache. 0 disables the local cache.
+register(
+    "sentry-metrics.indexer.local-cache.max-size",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Seconds after which strings expire from the local indexer cache, before jitter is added
+register(
+    "sentry-metrics.indexer.local-cache.ttl",
+    default=300,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -1505,6 +1576,8 @@ register(
 
 # Performance issue option for *all* performance issues detection
 register("performance.issues.all.problem-detection", default=1.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Rate of events whose spans are walked once for all detectors, instead of once per detector.
+register("performance.issues.fused-detection", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # Individual system-wide options in case we need to turn off specific detectors for load concerns, ignoring the set project options.
 register(
@@ -1958,6 +2031,30 @@ register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
 
+# Size in bytes of the process-local cache of raw nodestore values, 0 disables it.
+register("nodestore.local-cache.max-bytes", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# How long (in seconds) the process-local nodestore cache keeps values. Writes and deletes made by
+# other processes are not seen by this cache until its entries expire.
+register("nodestore.local-cache.ttl", default=60.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# How long (in seconds) the process-local nodestore cache remembers nodes that were not found.
+register("nodestore.local-cache.negative-ttl", default=5.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Write nodestore values in the indexed binary format (see sentry.nodestore.encoding).
+# Readers understand both formats, so this can be toggled at any time.
+register("nodestore.binary-encoding.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Individually zstd-compress subkey payloads of at least this many bytes in the binary format.
+# 0 disables per-subkey compression, which is preferable for backends that already compress
+# whole values.
+register(
+    "nodestore.binary-encoding.compression-threshold",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Read counter ranges from the Redis TSDB with one HMGET per hash instead of one HGET per key and
+# timestamp.
+register("tsdb.redis.bulk-range-reads", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # === Backpressure related runtime options ===
 
 # Enables monitoring of services for backpressure management.
@@ -2513,6 +2610,20 @@ register(
     default=300,  # 5 minutes
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Track buffered segments in a sorted set per partition, scored by the time they were first seen,
+# instead of a list which has to be read in full to find the segments ready to be flushed.
+register(
+    "standalone-spans.buffer-ready-index.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Max number of ready segments taken from the sorted set of a partition per flush.
+register(
+    "standalone-spans.buffer-ready-index.max-segments",
+    type=Int,
+    default=10000,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "standalone-spans.detect-performance-issues-consumer.enable",
     default=True,
@@ -2637,6 +2748,15 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Stream cached attachment chunks into the attachment store instead of assembling the whole
+# attachment in memory first.
+register(
+    "sentry.save-event-attachments.streaming",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # max number of profile chunks to use for computing
 # the merged profile.
 register(
@@ -2724,6 +2844,16 @@ register(
     default=10000,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Max number of projects whose delayed rule conditions are evaluated by one task, merging
+# identical condition queries of projects in the same organization. 0 processes every project
+# in its own task. A batch shares the 50s soft time limit of a single task, so this should stay
+# well below 50 / the slowest time to process a project; projects left over when the limit is
+# hit are retried on the next flush.
+register(
+    "delayed_processing.cross_project_batch_size",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "celery_split_queue_task_rollout",
     default={},
@@ -0,0 +1,230 @@
+"""
+Compiled evaluation of ownership rules.
+
+`Rule.test` evaluates one rule at a time, and path based matchers walk every frame of the event
+for each rule. For projects with large CODEOWNERS files this means millions of pattern matches per
+event. `CompiledRules` instead:
+
+* extracts the candidate values (paths, modules, url) of an event once,
+* matches every distinct pattern once, no matter how many rules use it,
+* indexes patterns by the literal substrings a matching value has to contain, so that patterns
+  which can't match any candidate value of the event are skipped without running the matcher.
+
+Compiled rules are cached per process, keyed by a fingerprint of the schema.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any
+
+from sentry.ownership.grammar import CODEOWNERS, MODULE, PATH, URL, Matcher, Rule, load_schema
+from sentry.utils import json, metrics
+from sentry.utils.codeowners import codeowners_match
+from sentry.utils.event_frames import find_stack_frames
+from sentry.utils.glob import glob_match
+from sentry.utils.hashlib import md5_text
+from sentry.utils.safe import get_path
+
+# Number of compiled schemas kept per process
+CACHE_SIZE = 500
+
+# Patterns using any of these can match values which don't contain their literal parts verbatim
+# (alternations, character classes, escapes, negations), so they are never skipped.
+_UNINDEXABLE_PATTERN = re.compile(r"[\[\]{}\\!\r\n]")
+_WILDCARDS = re.compile(r"[*?/]+")
+
+
+def _required_substrings(pattern: str) -> tuple[str, ...]:
+    """
+    Return the casefolded literal parts of a pattern, all of which have to be contained in a
+    value matching it, longest first. Empty if the pattern can't be indexed.
+    """
+    if _UNINDEXABLE_PATTERN.search(pattern):
+        return ()
+    # Parts made of dots only are skipped, since globs with path normalization ignore `./`
+    parts = {part.casefold() for part in _WILDCARDS.split(pattern) if part.strip(".")}
+    return tuple(sorted(parts, key=len, reverse=True))
+
+
+def _glob_path_match(value: str, pattern: str) -> bool:
+    return bool(glob_match(value, pattern, ignorecase=True, path_normalize=True))
+
+
+def _glob_url_match(value: str, pattern: str) -> bool:
+    return bool(glob_match(value, pattern, ignorecase=True))
+
+
+def _codeowners_match(value: str, pattern: str) -> bool:
+    return bool(codeowners_match(value, pattern))
+
+
+class _Pattern:
+    __slots__ = ("pattern", "substrings", "rule_indexes")
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.substrings = _required_substrings(pattern)
+        self.rule_indexes: list[int] = []
+
+
+class _PatternIndex:
+    """
+    All distinct patterns of one matcher type, grouped by their longest literal part.
+    """
+
+    def __init__(self, match_value: Callable[[str, str], bool]) -> None:
+        self._match_value = match_value
+        self._patterns: dict[str, _Pattern] = {}
+        self._by_substring: defaultdict[str, list[_Pattern]] = defaultdict(list)
+        self._unindexed: list[_Pattern] = []
+
+    def add(self, pattern: str, rule_index: int) -> None:
+        entry = self._patterns.get(pattern)
+        if entry is None:
+            entry = self._patterns[pattern] = _Pattern(pattern)
+            if entry.substrings:
+                self._by_substring[entry.substrings[0]].append(entry)
+            else:
+                self._unindexed.append(entry)
+        entry.rule_indexes.append(rule_index)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def matching(self, values: Sequence[str]) -> Iterator[_Pattern]:
+        # Literal parts never contain newlines, so they can only be found within a single value
+        haystack = "\n".join(value.casefold() for value in values)
+        tested = 0
+
+        for substring, entries in self._by_substring.items():
+            if substring not in haystack:
+                continue
+            for entry in entries:
+                if all(part in haystack for part in entry.substrings[1:]):
+                    tested += 1
+                    if self._test(entry, values):
+                        yield entry
+
+        for entry in self._unindexed:
+            tested += 1
+            if self._test(entry, values):
+                yield entry
+
+        metrics.distribution("ownership.compiled.patterns_tested", tested)
+
+    def _test(self, entry: _Pattern, values: Sequence[str]) -> bool:
+        return any(self._match_value(value, entry.pattern) for value in values)
+
+
+class CompiledRules:
+    """
+    Evaluates all rules of an ownership schema against an event in one pass. Matches exactly the
+    rules for which `Rule.test` is true, in schema order.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = list(rules)
+        self._indexes = {
+            URL: _PatternIndex(_glob_url_match),
+            PATH: _PatternIndex(_glob_path_match),
+            MODULE: _PatternIndex(_glob_path_match),
+            CODEOWNERS: _PatternIndex(_codeowners_match),
+        }
+        self._tag_rules: list[int] = []
+
+        for i, rule in enumerate(self.rules):
+            matcher_type = rule.matcher.type
+            if matcher_type in self._indexes:
+                self._indexes[matcher_type].add(rule.matcher.pattern, i)
+            elif matcher_type.startswith("tags."):
+                self._tag_rules.append(i)
+            # Rules of any other type never match
+
+    def matching_rules(
+        self,
+        data: Mapping[str, Any],
+        munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]] | None = None,
+    ) -> list[Rule]:
+        if munged_data is None:
+            munged_data = Matcher.munge_if_needed(data)
+
+        matched = set()
+        for matcher_type, index in self._indexes.items():
+            if not index:
+                continue
+            values = self._candidate_values(matcher_type, data, munged_data)
+            if not values:
+                continue
+            for entry in index.matching(values):
+                matched.update(entry.rule_indexes)
+
+        for i in self._tag_rules:
+            if self.rules[i].matcher.test_tag(data):
+                matched.add(i)
+
+        return [self.rules[i] for i in sorted(matched)]
+
+    @staticmethod
+    def _candidate_values(
+        matcher_type: str,
+        data: Mapping[str, Any],
+        munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]],
+    ) -> list[str]:
+        if matcher_type == URL:
+            url = get_path(data, "request", "url")
+            return [url] if url and isinstance(url, str) else []
+
+        if matcher_type == MODULE:
+            frames, keys = find_stack_frames(data), ["module"]
+        else:
+            frames, keys = munged_data
+
+        # Codeowners only apply to in-app frames, see `Matcher.test`
+        in_app_only = matcher_type == CODEOWNERS
+        values: dict[str, None] = {}
+        for frame in frames:
+            if in_app_only and frame.get("in_app") is False:
+                continue
+            for key in keys:
+                value = frame.get(key)
+                if value and isinstance(value, str):
+                    values[value] = None
+        return list(values)
+
+
+_cache: OrderedDict[str, CompiledRules] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_compiled_rules(schema: Mapping[str, Any]) -> CompiledRules:
+    """
+    Return the compiled rules of an ownership schema, compiling them if this process hasn't seen
+    the schema yet.
+    """
+    fingerprint = md5_text(json.dumps(schema)).hexdigest()
+
+    with _cache_lock:
+        compiled = _cache.get(fingerprint)
+        if compiled is not None:
+            _cache.move_to_end(fingerprint)
+            metrics.incr("ownership.compiled.cache", tags={"result": "hit"})
+            return compiled
+
+    metrics.incr("ownership.compiled.cache", tags={"result": "miss"})
+    with metrics.timer("ownership.compiled.compile"):
+        compiled = CompiledRules(load_schema(schema))
+
+    with _cache_lock:
+        _cache[fingerprint] = compiled
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
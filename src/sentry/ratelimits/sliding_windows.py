@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import threading
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from time import monotonic, time
 from typing import Any
 
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
@@ -11,7 +15,7 @@ from sentry_redis_tools.sliding_windows_rate_limiter import (
 from sentry_redis_tools.sliding_windows_rate_limiter import RequestedQuota, Timestamp
 
 from sentry.exceptions import InvalidConfiguration
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.services import Service
 
 __all__ = ["Quota", "GrantedQuota", "RequestedQuota", "Timestamp"]
@@ -158,3 +162,225 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         timestamp: Timestamp,
     ) -> None:
         return self.impl.use_quotas(requests, grants, timestamp)
+
+
+@dataclass
+class _Lease:
+    # The request the quota was leased with, and the timestamp it was charged at.
+    request: RequestedQuota
+    timestamp: Timestamp
+    granted: int
+    acquired_at: float
+    used: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.granted - self.used
+
+
+class LeasingSlidingWindowRateLimiter(RedisSlidingWindowRateLimiter):
+    """
+    A `RedisSlidingWindowRateLimiter` which serves `check_and_use_quotas` from
+    quota leased in bulk, so that most checks do not need a Redis round trip.
+
+    When a request cannot be served from the process' lease for its prefix and
+    quotas, a new lease of `lease_ratio` times the smallest limit involved (but
+    at least the requested amount) is checked and used in Redis in one go, just
+    like a regular request. Subsequent requests draw from that lease in memory.
+
+    A lease is only valid within the granule it was acquired in, and for at
+    most `reconcile_interval` seconds. Afterwards the unused part of it is
+    returned to Redis, which makes it available to other processes again.
+
+    Since quota is reserved in Redis before it is handed out, global limits are
+    enforced just as strictly as without leasing. The price is accuracy in the
+    other direction: quota sitting unused in leases is unavailable to other
+    processes until it is returned, so with `n` processes up to `n` leases
+    worth of quota can be withheld, and requests throttled early. Keep
+    `lease_ratio` small for quotas that are shared by many processes.
+
+    Only `check_and_use_quotas` uses leases; `check_within_quotas` and
+    `use_quotas` still go to Redis directly.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self.lease_ratio = options.get("lease_ratio", 0.05)
+        self.reconcile_interval = options.get("reconcile_interval", 1.0)
+        assert 0 < self.lease_ratio <= 1
+        assert self.reconcile_interval > 0
+
+        self._lock = threading.Lock()
+        self._leases: dict[tuple[str, tuple[Quota, ...]], _Lease] = {}
+        self._last_reconcile = monotonic()
+        super().__init__(**options)
+
+    def check_and_use_quotas(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
+    ) -> Sequence[GrantedQuota]:
+        timestamp = int(time()) if timestamp is None else int(timestamp)
+        now = monotonic()
+        grants: list[GrantedQuota | None] = [None] * len(requests)
+        # requests which could not be served from a lease, by lease
+        pending: dict[tuple[str, tuple[Quota, ...]], list[int]] = defaultdict(list)
+
+        # Redis is only called outside of the lock, so that threads served from leases never wait
+        # for another thread's round trip.
+        with self._lock:
+            for i, request in enumerate(requests):
+                key = (request.prefix, tuple(request.quotas))
+                lease = self._leases.get(key)
+                if (
+                    key not in pending
+                    and lease is not None
+                    and self._is_current(lease, timestamp, now)
+                    and lease.remaining >= request.requested
+                ):
+                    lease.used += request.requested
+                    grants[i] = GrantedQuota(
+                        prefix=request.prefix, granted=request.requested, reached_quotas=[]
+                    )
+                else:
+                    pending[key].append(i)
+
+            to_release: list[_Lease] = []
+            if pending:
+                to_release = [self._leases.pop(key) for key in pending if key in self._leases]
+                if now - self._last_reconcile >= self.reconcile_interval:
+                    to_release.extend(self._pop_stale(timestamp, now))
+                    self._last_reconcile = now
+
+        metrics.incr(
+            "ratelimits.sliding_window.lease.check",
+            amount=len(requests) - sum(len(indices) for indices in pending.values()),
+            tags={"source": "local"},
+        )
+        if not pending:
+            return grants  # type: ignore[return-value]
+
+        metrics.incr(
+            "ratelimits.sliding_window.lease.check",
+            amount=sum(len(indices) for indices in pending.values()),
+            tags={"source": "redis"},
+        )
+        self._release(to_release, timestamp)
+        leases = self._acquire(requests, pending, grants, timestamp, now)
+
+        with self._lock:
+            # Another thread may have acquired a lease for the same key in the meantime, only
+            # one of them is kept
+            superseded = [lease for key, lease in leases.items() if key in self._leases]
+            self._leases.update(
+                (key, lease) for key, lease in leases.items() if key not in self._leases
+            )
+        self._release(superseded, timestamp)
+
+        return grants  # type: ignore[return-value]
+
+    def reconcile(self, timestamp: Timestamp | None = None) -> None:
+        """
+        Return the unused part of all leases held by this process to Redis.
+        Should be called before the process shuts down.
+        """
+        timestamp = int(time()) if timestamp is None else int(timestamp)
+        with self._lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+        self._release(leases, timestamp)
+
+    def _lease_size(self, request: RequestedQuota) -> int:
+        return max(1, int(min(quota.limit for quota in request.quotas) * self.lease_ratio))
+
+    def _is_current(self, lease: _Lease, timestamp: Timestamp, now: float) -> bool:
+        return now - lease.acquired_at < self.reconcile_interval and all(
+            timestamp // quota.granularity_seconds == lease.timestamp // quota.granularity_seconds
+            for quota in lease.request.quotas
+        )
+
+    def _acquire(
+        self,
+        requests: Sequence[RequestedQuota],
+        pending: dict[tuple[str, tuple[Quota, ...]], list[int]],
+        grants: list[GrantedQuota | None],
+        timestamp: Timestamp,
+        now: float,
+    ) -> dict[tuple[str, tuple[Quota, ...]], _Lease]:
+        """
+        Check and use leases for the pending requests in Redis, and serve the requests from
+        them. Returns the leases with quota left.
+        """
+        lease_requests = []
+        for indices in pending.values():
+            request = requests[indices[0]]
+            requested = sum(requests[i].requested for i in indices)
+            lease_requests.append(
+                RequestedQuota(
+                    prefix=request.prefix,
+                    requested=max(requested, self._lease_size(request)),
+                    quotas=request.quotas,
+                )
+            )
+
+        timestamp, lease_grants = self.impl.check_within_quotas(lease_requests, timestamp)
+        self.impl.use_quotas(lease_requests, lease_grants, timestamp)
+
+        leases: dict[tuple[str, tuple[Quota, ...]], _Lease] = {}
+        for (key, indices), lease_request, lease_grant in zip(
+            pending.items(), lease_requests, lease_grants
+        ):
+            lease = _Lease(lease_request, timestamp, lease_grant.granted, now)
+            for i in indices:
+                request = requests[i]
+                granted = min(request.requested, lease.remaining)
+                lease.used += granted
+                grants[i] = GrantedQuota(
+                    prefix=request.prefix,
+                    granted=granted,
+                    reached_quotas=(
+                        [] if granted == request.requested else lease_grant.reached_quotas
+                    ),
+                )
+            if lease.remaining > 0:
+                leases[key] = lease
+        return leases
+
+    def _pop_stale(self, timestamp: Timestamp, now: float) -> list[_Lease]:
+        stale = [
+            key
+            for key, lease in self._leases.items()
+            if not self._is_current(lease, timestamp, now)
+        ]
+        return [self._leases.pop(key) for key in stale]
+
+    def _release(self, leases: Iterable[_Lease], timestamp: Timestamp) -> None:
+        # Unused quota is returned by decrementing the granules it was charged
+        # to, grouped by the timestamp it was charged at.
+        released: dict[Timestamp, list[_Lease]] = defaultdict(list)
+        for lease in leases:
+            metrics.distribution(
+                "ratelimits.sliding_window.lease.utilization", lease.used / lease.granted
+            )
+            if lease.remaining <= 0:
+                continue
+            # Once the granule has left the window its key may have expired,
+            # and decrementing it would create a negative count.
+            window = min(quota.window_seconds for quota in lease.request.quotas)
+            if timestamp - lease.timestamp >= window:
+                metrics.incr("ratelimits.sliding_window.lease.expired", amount=lease.remaining)
+                continue
+            released[lease.timestamp].append(lease)
+
+        for charged_at, charged_leases in released.items():
+            self.impl.use_quotas(
+                [lease.request for lease in charged_leases],
+                [
+                    GrantedQuota(
+                        prefix=lease.request.prefix, granted=-lease.remaining, reached_quotas=[]
+                    )
+                    for lease in charged_leases
+                ],
+                charged_at,
+            )
+            metrics.incr(
+                "ratelimits.sliding_window.lease.returned",
+                amount=sum(lease.remaining for lease in charged_leases),
+            )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 import uuid
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timezone
 from typing import Any, Literal, NotRequired, TypedDict
 
@@ -32,7 +32,12 @@ from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey
-from sentry.relay.config.experimental import TimeChecker, add_experimental_config
+from sentry.relay.config import sections
+from sentry.relay.config.experimental import (
+    TimeChecker,
+    add_experimental_config,
+    record_build_failures,
+)
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
@@ -283,7 +288,9 @@ def get_metrics_config(timeout: TimeChecker, project: Project) -> Mapping[str, A
 
 
 def get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    use_section_cache: bool = False,
 ) -> ProjectConfig:
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -293,6 +300,8 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param use_section_cache: Reuse sections of the config that were cached by an earlier
+        computation and have not been invalidated since, see `sentry.relay.config.sections`.
     :return: a ProjectConfig object for the given project
     """
     with sentry_sdk.isolation_scope() as scope:
@@ -301,7 +310,9 @@ def get_project_config(
             sentry_sdk.start_transaction(name="get_project_config"),
             metrics.timer("relay.config.get_project_config.duration"),
         ):
-            return _get_project_config(project, project_keys=project_keys)
+            return _get_project_config(
+                project, project_keys=project_keys, use_section_cache=use_section_cache
+            )
 
 
 def get_dynamic_sampling_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
@@ -1019,12 +1030,177 @@ def _get_mobile_performance_profiles(
     ]
 
 
+def _get_features_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    section: MutableMapping[str, Any] = {}
+    if exposed_features := get_exposed_features(project):
+        section["features"] = exposed_features
+    return section
+
+
+def _get_sampling_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    section: MutableMapping[str, Any] = {}
+    # NOTE: Omitting dynamicSampling because of a failure increases the number
+    # of events forwarded by Relay, because dynamic sampling will stop filtering
+    # anything.
+    add_experimental_config(section, "sampling", get_dynamic_sampling_config, project)
+    return section
+
+
+def _get_tx_name_rules_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    section: MutableMapping[str, Any] = {}
+    # Rules to replace high cardinality transaction names
+    add_experimental_config(section, "txNameRules", get_transaction_names_config, project)
+
+    # Mark the project as ready if it has seen >= 10 clusterer runs.
+    # This prevents projects from prematurely marking all URL transactions as sanitized.
+    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
+        section["txNameReady"] = True
+    return section
+
+
+def _get_breakdowns_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    return {"breakdownsV2": project.get_option("sentry:breakdowns")}
+
+
+def _get_metrics_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    section: MutableMapping[str, Any] = {}
+    add_experimental_config(section, "metrics", get_metrics_config, project)
+    return section
+
+
+def _get_transaction_metrics_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    section: MutableMapping[str, Any] = {}
+    if not _should_extract_transaction_metrics(project):
+        return section
+
+    add_experimental_config(
+        section,
+        "transactionMetrics",
+        get_transaction_metrics_settings,
+        project,
+        project.get_option("sentry:breakdowns"),
+    )
+
+    # This config key is technically not specific to _transaction_ metrics,
+    # is however currently both only applied to transaction metrics in
+    # Relay, and only used to tag transaction metrics in Sentry.
+    add_experimental_config(
+        section,
+        "metricConditionalTagging",
+        get_metric_conditional_tagging_rules,
+        project,
+    )
+
+    if metric_extraction := get_metric_extraction_config(project):
+        section["metricExtraction"] = metric_extraction
+    return section
+
+
+def _get_session_metrics_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    return {
+        "sessionMetrics": {
+            "version": (
+                EXTRACT_ABNORMAL_MECHANISM_VERSION
+                if _should_extract_abnormal_mechanism(project)
+                else EXTRACT_METRICS_VERSION
+            ),
+        }
+    }
+
+
+def _get_performance_score_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    performance_score_profiles = [
+        *_get_desktop_browser_performance_profiles(project.organization),
+        *_get_mobile_browser_performance_profiles(project.organization),
+        *_get_mobile_performance_profiles(project.organization),
+        *_get_default_browser_performance_profiles(project.organization),
+    ]
+    if performance_score_profiles:
+        return {"performanceScore": {"profiles": performance_score_profiles}}
+    return {}
+
+
+def _get_filter_settings_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    if filter_settings := get_filter_settings(project):
+        return {"filterSettings": filter_settings}
+    return {}
+
+
+def _get_grouping_config_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    grouping_config = get_grouping_config_dict_for_project(project)
+    if grouping_config is not None:
+        return {"groupingConfig": grouping_config}
+    return {}
+
+
+def _get_event_retention_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    event_retention = quotas.backend.get_event_retention(project.organization)
+    if event_retention is not None:
+        return {"eventRetention": event_retention}
+    return {}
+
+
+def _get_quotas_section(
+    project: Project, project_keys: Sequence[ProjectKey] | None
+) -> MutableMapping[str, Any]:
+    if quotas_config := get_quotas(project, keys=project_keys):
+        return {"quotas": quotas_config}
+    return {}
+
+
+#: Builders for the sections of the project config, in the order their keys are added to it. See
+#: `sentry.relay.config.sections` for how sections are cached.
+_SECTION_BUILDERS: Sequence[
+    tuple[str, Callable[[Project, Sequence[ProjectKey] | None], MutableMapping[str, Any]]]
+] = [
+    (sections.FEATURES, _get_features_section),
+    (sections.SAMPLING, _get_sampling_section),
+    (sections.TX_NAME_RULES, _get_tx_name_rules_section),
+    (sections.BREAKDOWNS, _get_breakdowns_section),
+    (sections.METRICS, _get_metrics_section),
+    (sections.TRANSACTION_METRICS, _get_transaction_metrics_section),
+    (sections.SESSION_METRICS, _get_session_metrics_section),
+    (sections.PERFORMANCE_SCORE, _get_performance_score_section),
+    (sections.FILTER_SETTINGS, _get_filter_settings_section),
+    (sections.GROUPING_CONFIG, _get_grouping_config_section),
+    (sections.EVENT_RETENTION, _get_event_retention_section),
+    (sections.QUOTAS, _get_quotas_section),
+]
+
+
 def _get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    use_section_cache: bool = False,
 ) -> ProjectConfig:
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
 
+    if project_keys is not None:
+        project_keys = list(project_keys)
+
     public_keys = get_public_key_configs(project_keys=project_keys)
 
     with sentry_sdk.start_span(op="get_public_config"):
@@ -1052,80 +1228,43 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    with sentry_sdk.start_span(op="get_exposed_features"):
-        if exposed_features := get_exposed_features(project):
-            config["features"] = exposed_features
-
-    # NOTE: Omitting dynamicSampling because of a failure increases the number
-    # of events forwarded by Relay, because dynamic sampling will stop filtering
-    # anything.
-    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
-
-    # Rules to replace high cardinality transaction names
-    add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
-
-    # Mark the project as ready if it has seen >= 10 clusterer runs.
-    # This prevents projects from prematurely marking all URL transactions as sanitized.
-    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
-        config["txNameReady"] = True
-
-    config["breakdownsV2"] = project.get_option("sentry:breakdowns")
-
-    add_experimental_config(config, "metrics", get_metrics_config, project)
-
-    if _should_extract_transaction_metrics(project):
-        add_experimental_config(
-            config,
-            "transactionMetrics",
-            get_transaction_metrics_settings,
-            project,
-            config.get("breakdownsV2"),
+    section_cache = None
+    cached_sections: Mapping[str, Mapping[str, Any]] = {}
+    if options.get("relay.config.section-cache.enabled"):
+        section_cache = sections.ProjectConfigSectionCache(
+            project.organization_id,
+            project.id,
+            [name for name, _ in _SECTION_BUILDERS],
+            # Quotas are the only section that depends on the project keys in the config
+            variants={sections.QUOTAS: ",".join(sorted(str(key.id) for key in project_keys or ()))},
         )
+        if use_section_cache:
+            cached_sections = section_cache.get_many()
+
+    computed_sections = {}
+    for name, build_section in _SECTION_BUILDERS:
+        section = cached_sections.get(name)
+        if section is not None:
+            metrics.incr("relay.config.section_cache", tags={"section": name, "result": "hit"})
+            config.update(section)
+            continue
 
-        # This config key is technically not specific to _transaction_ metrics,
-        # is however currently both only applied to transaction metrics in
-        # Relay, and only used to tag transaction metrics in Sentry.
-        add_experimental_config(
-            config,
-            "metricConditionalTagging",
-            get_metric_conditional_tagging_rules,
-            project,
-        )
+        with (
+            sentry_sdk.start_span(op=f"project_config.section.{name}"),
+            metrics.timer("relay.config.section.duration", tags={"section": name}),
+            record_build_failures() as failures,
+        ):
+            section = build_section(project, project_keys)
+        config.update(section)
 
-        if metric_extraction := get_metric_extraction_config(project):
-            config["metricExtraction"] = metric_extraction
+        # Sections that failed to build are retried by the next computation
+        if not failures:
+            computed_sections[name] = section
+        if use_section_cache:
+            metrics.incr("relay.config.section_cache", tags={"section": name, "result": "miss"})
 
-    config["sessionMetrics"] = {
-        "version": (
-            EXTRACT_ABNORMAL_MECHANISM_VERSION
-            if _should_extract_abnormal_mechanism(project)
-            else EXTRACT_METRICS_VERSION
-        ),
-    }
-
-    performance_score_profiles = [
-        *_get_desktop_browser_performance_profiles(project.organization),
-        *_get_mobile_browser_performance_profiles(project.organization),
-        *_get_mobile_performance_profiles(project.organization),
-        *_get_default_browser_performance_profiles(project.organization),
-    ]
-    if performance_score_profiles:
-        config["performanceScore"] = {"profiles": performance_score_profiles}
-
-    with sentry_sdk.start_span(op="get_filter_settings"):
-        if filter_settings := get_filter_settings(project):
-            config["filterSettings"] = filter_settings
-    with sentry_sdk.start_span(op="get_grouping_config_dict_for_project"):
-        grouping_config = get_grouping_config_dict_for_project(project)
-        if grouping_config is not None:
-            config["groupingConfig"] = grouping_config
-    with sentry_sdk.start_span(op="get_event_retention"):
-        event_retention = quotas.backend.get_event_retention(project.organization)
-        if event_retention is not None:
-            config["eventRetention"] = event_retention
-    with sentry_sdk.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
-            config["quotas"] = quotas_config
+    if section_cache is not None and computed_sections:
+        section_cache.set_many(computed_sections)
 
     return ProjectConfig(project, **cfg)
 
@@ -1,5 +1,7 @@
 import logging
-from collections.abc import Callable, MutableMapping
+from collections.abc import Callable, Generator, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
 from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
 
@@ -46,6 +48,23 @@ class ExperimentalConfigBuilder(Protocol):
 #: Timeout for an experimental feature build.
 _FEATURE_BUILD_TIMEOUT = timedelta(seconds=20)
 
+#: Keys of failed builds, see `record_build_failures`.
+_build_failures: ContextVar[list[str] | None] = ContextVar("build_failures", default=None)
+
+
+@contextmanager
+def record_build_failures() -> Generator[list[str], None, None]:
+    """Collect the keys of all builds within the block that raised an exception.
+    Since failed builds are omitted from the config, callers can use this to tell them apart from
+    builds that returned nothing.
+    """
+    failures: list[str] = []
+    token = _build_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _build_failures.reset(token)
+
 
 def add_experimental_config(
     config: MutableMapping[str, Any],
@@ -93,4 +112,6 @@ def build_safe_config(
         except Exception:
             logger.exception("Exception while building Relay project config field")
 
+    if (failures := _build_failures.get()) is not None:
+        failures.append(key)
     return None
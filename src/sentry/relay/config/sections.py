@@ -0,0 +1,183 @@
+"""
+Cache for the individual sections of relay project configs.
+
+A project config is assembled from independent sections (inbound filters, quotas, dynamic
+sampling, metrics extraction, ...). When the ``relay.config.section-cache.enabled`` option is set,
+every computed section is cached under a key derived from invalidation generations of its
+organization and project: one generation covering the whole config, and one per section.
+
+Invalidations assign new generations before they are scheduled, to either a few sections or the
+whole config. Recomputing a config then rebuilds only the sections whose generations changed and
+reuses all others, e.g. a change to inbound filters of a project only rebuilds its filter
+section. Since sections also depend on state that doesn't trigger invalidations (global options,
+features, time), cached sections expire after ``relay.config.section-cache.ttl`` seconds.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.utils.hashlib import md5_text
+
+FEATURES = "features"
+SAMPLING = "sampling"
+TX_NAME_RULES = "txNameRules"
+BREAKDOWNS = "breakdowns"
+METRICS = "metrics"
+TRANSACTION_METRICS = "transactionMetrics"
+SESSION_METRICS = "sessionMetrics"
+PERFORMANCE_SCORE = "performanceScore"
+FILTER_SETTINGS = "filterSettings"
+GROUPING_CONFIG = "groupingConfig"
+EVENT_RETENTION = "eventRetention"
+QUOTAS = "quotas"
+
+SECTIONS = frozenset(
+    (
+        FEATURES,
+        SAMPLING,
+        TX_NAME_RULES,
+        BREAKDOWNS,
+        METRICS,
+        TRANSACTION_METRICS,
+        SESSION_METRICS,
+        PERFORMANCE_SCORE,
+        FILTER_SETTINGS,
+        GROUPING_CONFIG,
+        EVENT_RETENTION,
+        QUOTAS,
+    )
+)
+
+# Generation invalidating every section
+ALL_SECTIONS = "all"
+
+# Generations outlive the sections cached for them, see `_get_generations` for what happens when
+# one is evicted anyway.
+GENERATION_TTL = 24 * 60 * 60
+
+# Project options that are only read when building a single section
+_PROJECT_OPTION_SECTIONS = {
+    "sentry:blacklisted_ips": FILTER_SETTINGS,
+    "sentry:csp_ignored_sources": FILTER_SETTINGS,
+    "sentry:csp_ignored_sources_defaults": FILTER_SETTINGS,
+    "sentry:error_messages": FILTER_SETTINGS,
+    "sentry:releases": FILTER_SETTINGS,
+}
+
+
+def get_sections_for_project_option(key: str | None) -> list[str] | None:
+    """
+    Return the sections to invalidate when the given project option changes, or `None` if the
+    whole config has to be invalidated.
+    """
+    if key is None:
+        return None
+    if key.startswith("filters:"):
+        return [FILTER_SETTINGS]
+    if key in _PROJECT_OPTION_SECTIONS:
+        return [_PROJECT_OPTION_SECTIONS[key]]
+    return None
+
+
+def _generation_key(scope: str, scope_id: int, section: str) -> str:
+    return f"relayconfig:generation:{scope}:{scope_id}:{section}"
+
+
+def invalidate_sections(
+    *,
+    organization_id: int | None = None,
+    project_id: int | None = None,
+    sections: Iterable[str] | None = None,
+) -> None:
+    """
+    Invalidate cached sections of all configs of an organization or project. Pass `None` as
+    `sections` to invalidate all sections.
+    """
+    unknown = set(sections or ()) - SECTIONS
+    if unknown:
+        raise ValueError(f"Unknown project config sections: {sorted(unknown)}")
+
+    keys = []
+    for section in sections or [ALL_SECTIONS]:
+        if organization_id:
+            keys.append(_generation_key("organization", organization_id, section))
+        if project_id:
+            keys.append(_generation_key("project", project_id, section))
+
+    # Fresh random generations rather than counters, so that a generation which got evicted from
+    # the cache can never come back with an earlier value
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, GENERATION_TTL)
+
+
+def _get_generations(organization_id: int, project_id: int, sections: Sequence[str]) -> list[str]:
+    keys = [
+        _generation_key(scope, scope_id, section)
+        for scope, scope_id in (("organization", organization_id), ("project", project_id))
+        for section in (ALL_SECTIONS, *sections)
+    ]
+    generations = cache.get_many(keys)
+
+    # A missing generation is replaced by a new one rather than treated as a default value.
+    # Otherwise sections cached before an invalidation could be served again once the
+    # generation written by the invalidation is evicted.
+    missing = {key: uuid.uuid4().hex for key in keys if key not in generations}
+    if missing:
+        cache.set_many(missing, GENERATION_TTL)
+        generations.update(missing)
+
+    return [generations[key] for key in keys]
+
+
+class ProjectConfigSectionCache:
+    """
+    Cached sections of the config of one project. `variants` distinguish sections that are
+    computed differently for the same project, e.g. quotas, which depend on the project keys.
+    """
+
+    def __init__(
+        self,
+        organization_id: int,
+        project_id: int,
+        sections: Sequence[str],
+        variants: Mapping[str, str] | None = None,
+    ) -> None:
+        variants = variants or {}
+        generations = _get_generations(organization_id, project_id, sections)
+        org_all, *org_sections = generations[: len(sections) + 1]
+        project_all, *project_sections = generations[len(sections) + 1 :]
+        self._keys = {
+            section: "relayconfig:section:{}:{}:{}".format(
+                section,
+                project_id,
+                md5_text(
+                    org_all,
+                    org_generation,
+                    project_all,
+                    project_generation,
+                    variants.get(section, ""),
+                ).hexdigest(),
+            )
+            for section, org_generation, project_generation in zip(
+                sections, org_sections, project_sections
+            )
+        }
+
+    def get_many(self) -> dict[str, Mapping[str, Any]]:
+        cached = cache.get_many(list(self._keys.values()))
+        return {
+            section: cached[key]
+            for section, key in self._keys.items()
+            if cached.get(key) is not None
+        }
+
+    def set_many(self, sections: Mapping[str, Mapping[str, Any]]) -> None:
+        cache.set_many(
+            {self._keys[section]: value for section, value in sections.items()},
+            options.get("relay.config.section-cache.ttl"),
+        )
@@ -55,6 +55,7 @@ from arroyo.types import BaseValue, Commit, Message, Partition
 from sentry_kafka_schemas.codecs import Codec, ValidationError
 from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import ReplayRecording
 
+from sentry import options
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
 from sentry.models.project import Project
 from sentry.replays.lib.storage import (
@@ -68,7 +69,7 @@ from sentry.replays.usecases.ingest.dom_index import (
     emit_replay_actions,
     parse_replay_actions,
 )
-from sentry.replays.usecases.pack import pack
+from sentry.replays.usecases.pack import pack, pack_indexed
 from sentry.utils import json, metrics
 
 logger = logging.getLogger(__name__)
@@ -263,7 +264,14 @@ def process_message(buffer: RecordingBuffer, message: bytes) -> None:
         segment_id=headers["segment_id"],
     )
 
-    if replay_video := decoded_message.get("replay_video"):
+    replay_video = decoded_message.get("replay_video")
+    indexed_segment = (
+        pack_indexed(rrweb=recording_data, video=cast(bytes | None, replay_video or None))
+        if options.get("replay.storage.indexed-segments")
+        else None
+    )
+
+    if replay_video:
         # Logging org info for bigquery
         logger.info(
             "sentry.replays.slow_click",
@@ -283,7 +291,10 @@ def process_message(buffer: RecordingBuffer, message: bytes) -> None:
             unit="byte",
         )
 
-        dat = zlib.compress(pack(rrweb=recording_data, video=cast(bytes, replay_video)))
+        if indexed_segment is not None:
+            dat = indexed_segment
+        else:
+            dat = zlib.compress(pack(rrweb=recording_data, video=cast(bytes, replay_video)))
         buffer.upload_events.append(
             {"key": make_recording_filename(recording_segment), "value": dat}
         )
@@ -294,7 +305,10 @@ def process_message(buffer: RecordingBuffer, message: bytes) -> None:
         )
     else:
         buffer.upload_events.append(
-            {"key": make_recording_filename(recording_segment), "value": compressed_segment}
+            {
+                "key": make_recording_filename(recording_segment),
+                "value": indexed_segment if indexed_segment is not None else compressed_segment,
+            }
         )
 
     # Initial segment events are recorded in the state machine.
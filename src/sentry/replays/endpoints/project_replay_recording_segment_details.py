@@ -20,7 +20,11 @@ from sentry.apidocs.parameters import GlobalParams, ReplayParams
 from sentry.apidocs.utils import inline_sentry_response_serializer
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, make_recording_filename
 from sentry.replays.types import ReplayRecordingSegment
-from sentry.replays.usecases.reader import download_segment, fetch_segment_metadata
+from sentry.replays.usecases.reader import (
+    download_segment,
+    download_segment_slice,
+    fetch_segment_metadata,
+)
 
 
 @region_silo_endpoint
@@ -61,7 +65,15 @@ class ProjectReplayRecordingSegmentDetailsEndpoint(ProjectEndpoint):
             return self.respond({"detail": "Replay recording segment not found."}, status=404)
 
         if request.GET.get("download") is not None:
-            return self.download(segment)
+            # Optional time window in milliseconds. Only events within it are returned.
+            try:
+                start = _parse_timestamp(request.GET.get("start"))
+                end = _parse_timestamp(request.GET.get("end"))
+            except ValueError:
+                return self.respond(
+                    {"detail": "start and end must be timestamps in milliseconds."}, status=400
+                )
+            return self.download(segment, start, end)
         else:
             return self.respond(
                 {
@@ -78,12 +90,20 @@ class ProjectReplayRecordingSegmentDetailsEndpoint(ProjectEndpoint):
                 }
             )
 
-    def download(self, segment: RecordingSegmentStorageMeta) -> StreamingHttpResponse:
+    def download(
+        self,
+        segment: RecordingSegmentStorageMeta,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> StreamingHttpResponse:
         with sentry_sdk.start_span(
             op="download_segment",
             name="ProjectReplayRecordingSegmentDetailsEndpoint.download_segment",
         ) as child_span:
-            segment_bytes = download_segment(segment, span=child_span)
+            if start is None and end is None:
+                segment_bytes = download_segment(segment, span=child_span)
+            else:
+                segment_bytes = download_segment_slice(segment, start, end)
             segment_reader = BytesIO(segment_bytes)
 
             response = StreamingHttpResponse(
@@ -95,3 +115,9 @@ class ProjectReplayRecordingSegmentDetailsEndpoint(ProjectEndpoint):
                 f'attachment; filename="{make_recording_filename(segment)}"'
             )
             return response
+
+
+def _parse_timestamp(value: str | None) -> float | None:
+    if value is None:
+        return None
+    return float(value)
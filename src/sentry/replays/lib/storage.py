@@ -172,6 +172,11 @@ class StorageBlob(Blob):
     def get(self, segment: RecordingSegmentStorageMeta) -> bytes | None:
         return storage_kv.get(self.make_key(segment))
 
+    @metrics.wraps("replays.lib.storage.StorageBlob.get_range")
+    def get_range(self, segment: RecordingSegmentStorageMeta, start: int, end: int) -> bytes | None:
+        """Return the bytes of a blob from start up to end (exclusive) from remote storage."""
+        return storage_kv.get_range(self.make_key(segment), start, end)
+
     @metrics.wraps("replays.lib.storage.StorageBlob.set")
     def set(self, segment: RecordingSegmentStorageMeta, value: bytes) -> None:
         return storage_kv.set(self.make_key(segment), value)
@@ -202,6 +207,28 @@ class SimpleStorageBlob:
         else:
             return result
 
+    @metrics.wraps("replays.lib.storage.SimpleStorageBlob.get_range")
+    def get_range(self, key: str, start: int, end: int) -> bytes | None:
+        """Return the bytes of a blob from start up to end (exclusive).
+
+        Only the requested range is downloaded from backends supporting range requests. Other
+        backends download the whole blob.
+        """
+        try:
+            storage = get_storage(self._make_storage_options())
+            blob = storage.open(key)
+            if hasattr(blob, "read_range"):
+                result = blob.read_range(start, end)
+            else:
+                blob.seek(start)
+                result = blob.read(end - start)
+            blob.close()
+        except Exception as e:
+            logger.warning("Storage GET error: %s", repr(e))
+            return None
+        else:
+            return result
+
     @metrics.wraps("replays.lib.storage.SimpleStorageBlob.set")
     def set(self, key: str, value: bytes) -> None:
         storage = get_storage(self._make_storage_options())
@@ -11,6 +11,7 @@ from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import Replay
 from sentry_sdk import Scope, set_tag
 from sentry_sdk.tracing import Span
 
+from sentry import options
 from sentry.constants import DataCategory
 from sentry.models.project import Project
 from sentry.replays.lib.storage import (
@@ -19,7 +20,7 @@ from sentry.replays.lib.storage import (
     storage_kv,
 )
 from sentry.replays.usecases.ingest.dom_index import log_canvas_size, parse_and_emit_replay_actions
-from sentry.replays.usecases.pack import pack
+from sentry.replays.usecases.pack import pack, pack_indexed
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
 from sentry.utils.outcomes import Outcome, track_outcome
@@ -123,6 +124,12 @@ def _ingest_recording(message: RecordingIngestMessage, transaction: Span) -> Non
             logger.exception("Invalid recording body.")
             return None
 
+    indexed_segment = (
+        pack_indexed(rrweb=recording_segment, video=message.replay_video or None)
+        if options.get("replay.storage.indexed-segments")
+        else None
+    )
+
     if message.replay_video:
         # Logging org info for bigquery
         logger.info(
@@ -143,7 +150,10 @@ def _ingest_recording(message: RecordingIngestMessage, transaction: Span) -> Non
             unit="byte",
         )
 
-        dat = zlib.compress(pack(rrweb=recording_segment, video=message.replay_video))
+        if indexed_segment is not None:
+            dat = indexed_segment
+        else:
+            dat = zlib.compress(pack(rrweb=recording_segment, video=message.replay_video))
         storage_kv.set(make_recording_filename(segment_data), dat)
 
         # Track combined payload size.
@@ -151,7 +161,10 @@ def _ingest_recording(message: RecordingIngestMessage, transaction: Span) -> Non
             "replays.recording_consumer.replay_video_event_size", len(dat), unit="byte"
         )
     else:
-        storage_kv.set(make_recording_filename(segment_data), compressed_segment)
+        storage_kv.set(
+            make_recording_filename(segment_data),
+            indexed_segment if indexed_segment is not None else compressed_segment,
+        )
 
     recording_post_processor(message, headers, recording_segment, message.replay_event, transaction)
 
@@ -2,41 +2,233 @@
 
 Bytes are packed in varying formats dependent on their type. The type is
 determined by the first byte and is an 8-bit integer. 0 for rrweb, 1 for
-video. For backwards compatibility reasons the maximum type byte allowed
-is 90 (91 being the ascii encoding for `[` which is the leading character
-of a JSON array).
+video, 2 for indexed. For backwards compatibility reasons the maximum type
+byte allowed is 90 (91 being the ascii encoding for `[` which is the leading
+character of a JSON array).
 
 The RRWeb type exclusively contains rrweb json after the type byte. The
 video type contains an 4-byte length header followed by video bytes
 followed by rrweb bytes. The length bytes encode offset information
 detailing how to split the rrweb payload from the video payload.
 
+The indexed type contains a 4-byte length header followed by a JSON index
+followed by the data region. The data region holds the video bytes and the
+rrweb events, split into separately compressed chunks of comma-separated
+events. The index records the offset and length of the video and of every
+chunk within the data region, as well as the min and max timestamp of the
+events in each chunk. Indexed payloads are not compressed as a whole, so
+the video or the chunks of a time window can be read with byte-range
+requests.
+
 A type byte is not always specified. Past encodings will lead with the
 binary encoding for the `[` character. These are considered rrweb type
 payloads and can be returned as is.
 """
 
+import dataclasses
+import json as builtin_json  # noqa: S003
+import re
+import zlib
+from collections.abc import Sequence
 from enum import Enum
+from typing import Any, NamedTuple
+
+from sentry.utils import json, metrics
 
 USIZE = 4  # Unsigned integer word size.
 HEADER_OFFSET = USIZE + 1  # word size + type byte.
 
+# Target uncompressed size of the rrweb chunks of indexed payloads.
+CHUNK_SIZE = 64 * 1024
+
+# Events are split using the decoder of the standard library, as it reports where each event
+# ends in the source.
+_decoder = builtin_json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
 
 class Encoding(Enum):
     RRWEB = 0
     VIDEO = 1
+    INDEXED = 2
 
 
-def pack(rrweb: bytes, video: bytes | None) -> bytes:
-    def _to_uint_bytes(length):
-        return bytes([(length >> (i * 8)) & 0xFF for i in range(USIZE - 1, -1, -1)])
+class Chunk(NamedTuple):
+    offset: int
+    length: int
+    # Timestamp bounds of the events in the chunk. None if any of its events has no timestamp.
+    min_timestamp: float | None
+    max_timestamp: float | None
+
+
+@dataclasses.dataclass(frozen=True)
+class SegmentIndex:
+    """Index of an indexed payload. Offsets are relative to the start of the payload."""
+
+    video: tuple[int, int] | None
+    chunks: list[Chunk]
+
+    def chunks_between(self, start: float | None, end: float | None) -> list[Chunk]:
+        """Return the chunks which may contain events with timestamps within [start, end]."""
+        return [
+            chunk
+            for chunk in self.chunks
+            if chunk.min_timestamp is None
+            or chunk.max_timestamp is None
+            or (
+                (start is None or chunk.max_timestamp >= start)
+                and (end is None or chunk.min_timestamp <= end)
+            )
+        ]
+
+
+def _to_uint_bytes(length: int) -> bytes:
+    return bytes([(length >> (i * 8)) & 0xFF for i in range(USIZE - 1, -1, -1)])
 
+
+def pack(rrweb: bytes, video: bytes | None) -> bytes:
     if video is None:
         return b"\x00" + rrweb
     else:
         return b"\x01" + _to_uint_bytes(len(video)) + video + rrweb
 
 
+def pack_indexed(rrweb: bytes, video: bytes | None, chunk_size: int = CHUNK_SIZE) -> bytes | None:
+    """
+    Return the indexed payload or None if the rrweb bytes are not a JSON array.
+
+    Chunks are compressed separately so they can be read on their own, which costs some
+    compression ratio compared to compressing the whole segment. The packed size is reported as
+    `replays.usecases.pack.indexed.size` to compare it with the compressed segment.
+    """
+    with metrics.timer("replays.usecases.pack.indexed.duration"):
+        try:
+            chunks = _split_events(rrweb, chunk_size)
+        except ValueError:
+            return None
+
+        parts = []
+        offset = 0
+
+        video_entry = None
+        if video is not None:
+            parts.append(video)
+            video_entry = [offset, len(video)]
+            offset += len(video)
+
+        chunk_entries = []
+        for data, min_timestamp, max_timestamp in chunks:
+            compressed = zlib.compress(data)
+            parts.append(compressed)
+            chunk_entries.append([offset, len(compressed), min_timestamp, max_timestamp])
+            offset += len(compressed)
+
+        index = json.dumps({"video": video_entry, "chunks": chunk_entries}).encode()
+        packed = b"\x02" + _to_uint_bytes(len(index)) + index + b"".join(parts)
+
+    metrics.distribution("replays.usecases.pack.indexed.size", len(packed), unit="byte")
+    metrics.distribution("replays.usecases.pack.indexed.chunks", len(chunk_entries))
+    return packed
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+
+
+def _split_events(rrweb: bytes, chunk_size: int) -> list[tuple[bytes, float | None, float | None]]:
+    """
+    Split a JSON array of events into chunks of comma-separated events of about `chunk_size`
+    bytes, with the timestamp bounds of their events. The chunks are slices of the original
+    bytes, events are only decoded for their timestamps. Raises `ValueError` if the bytes are
+    not a JSON array.
+    """
+    text = rrweb.decode()
+    # Offsets into the text are offsets into the bytes unless there are multi-byte characters.
+    is_ascii = rrweb.isascii()
+
+    pos = _skip_whitespace(text, 0)
+    if text[pos : pos + 1] != "[":
+        raise ValueError("Not a JSON array")
+    pos = _skip_whitespace(text, pos + 1)
+
+    chunks = []
+    chunk_start = pos
+    timestamps: list[float | None] = []
+    while text[pos : pos + 1] != "]":
+        event, end = _decoder.raw_decode(text, pos)
+        timestamps.append(event_timestamp(event))
+
+        if end - chunk_start >= chunk_size:
+            chunks.append(_make_chunk(rrweb, text, is_ascii, chunk_start, end, timestamps))
+            timestamps = []
+
+        pos = _skip_whitespace(text, end)
+        if text[pos : pos + 1] == ",":
+            pos = _skip_whitespace(text, pos + 1)
+            if text[pos : pos + 1] == "]":
+                raise ValueError("Trailing comma in JSON array")
+            if not timestamps:
+                chunk_start = pos
+        elif text[pos : pos + 1] != "]":
+            raise ValueError("Invalid JSON array")
+        elif timestamps:
+            chunks.append(_make_chunk(rrweb, text, is_ascii, chunk_start, end, timestamps))
+
+    if _skip_whitespace(text, pos + 1) != len(text):
+        raise ValueError("Extra data after JSON array")
+    return chunks
+
+
+def _make_chunk(
+    rrweb: bytes, text: str, is_ascii: bool, start: int, end: int, timestamps: list[float | None]
+) -> tuple[bytes, float | None, float | None]:
+    data = rrweb[start:end] if is_ascii else text[start:end].encode()
+    known = [timestamp for timestamp in timestamps if timestamp is not None]
+    if len(known) < len(timestamps):
+        return (data, None, None)
+    return (data, min(known), max(known))
+
+
+def event_timestamp(event: Any) -> float | None:
+    """Return the timestamp of an rrweb event or None if it has none."""
+    timestamp = event.get("timestamp") if isinstance(event, dict) else None
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return timestamp
+    return None
+
+
+def index_size(header: bytes | memoryview) -> int:
+    """Return the size of the header and index of an indexed payload given its first bytes."""
+    return HEADER_OFFSET + int.from_bytes(header[1:HEADER_OFFSET])
+
+
+def unpack_index(obj: bytes | memoryview) -> SegmentIndex:
+    """Return the index of an indexed payload given at least its header and index bytes."""
+    data_offset = index_size(obj)
+    index = json.loads(bytes(obj[HEADER_OFFSET:data_offset]))
+
+    video = index["video"]
+    return SegmentIndex(
+        video=(data_offset + video[0], data_offset + video[0] + video[1]) if video else None,
+        chunks=[
+            Chunk(data_offset + offset, length, min_timestamp, max_timestamp)
+            for offset, length, min_timestamp, max_timestamp in index["chunks"]
+        ],
+    )
+
+
+def read_chunks(data: bytes | memoryview, chunks: Sequence[Chunk], base: int = 0) -> bytes:
+    """Return the events of the chunks as a JSON array. `data` holds the payload from `base`."""
+    return (
+        b"["
+        + b",".join(
+            zlib.decompress(data[chunk.offset - base : chunk.offset - base + chunk.length])
+            for chunk in chunks
+        )
+        + b"]"
+    )
+
+
 def unpack(obj: bytes):
     mv = memoryview(obj)
     if mv[0] == 91:  # Not packed.
@@ -45,6 +237,8 @@ def unpack(obj: bytes):
         return _unpack_rrweb(mv)
     elif mv[0] == Encoding.VIDEO.value:
         return _unpack_video(mv)
+    elif mv[0] == Encoding.INDEXED.value:
+        return _unpack_indexed(mv)
     else:
         return (None, mv)
 
@@ -56,3 +250,9 @@ def _unpack_rrweb(mv: memoryview) -> tuple[None, memoryview]:
 def _unpack_video(mv: memoryview) -> tuple[memoryview, memoryview]:
     end = int.from_bytes(mv[1:HEADER_OFFSET]) + HEADER_OFFSET
     return (mv[HEADER_OFFSET:end], mv[end:])
+
+
+def _unpack_indexed(mv: memoryview) -> tuple[memoryview | None, bytes]:
+    index = unpack_index(mv)
+    video = mv[index.video[0] : index.video[1]] if index.video else None
+    return (video, read_chunks(mv, index.chunks))
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import uuid
 import zlib
-from collections.abc import Iterator
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -23,6 +24,7 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.models.files.file import File
 from sentry.models.files.fileblobindex import FileBlobIndex
 from sentry.replays.lib.storage import (
@@ -33,7 +35,16 @@ from sentry.replays.lib.storage import (
     storage_kv,
 )
 from sentry.replays.models import ReplayRecordingSegment
-from sentry.replays.usecases.pack import unpack
+from sentry.replays.usecases.pack import (
+    Encoding,
+    SegmentIndex,
+    event_timestamp,
+    index_size,
+    read_chunks,
+    unpack,
+    unpack_index,
+)
+from sentry.utils import json
 from sentry.utils.snuba import raw_snql_query
 
 # METADATA QUERY BEHAVIOR.
@@ -250,29 +261,109 @@ def segment_row_to_storage_meta(
 # BLOB DOWNLOAD BEHAVIOR.
 
 
+# Number of segments downloaded concurrently, and max number of segments downloaded ahead of the
+# segment which is yielded next. Bounds the memory used by a download to that many segments.
+DOWNLOAD_WORKERS = 10
+DOWNLOAD_PREFETCH = 20
+
+# Number of bytes read from the start of a segment to find its index. Larger indexes are completed
+# with a second read.
+INDEX_PREFETCH = 16 * 1024
+
+
 def download_segments(segments: list[RecordingSegmentStorageMeta]) -> Iterator[bytes]:
     """Download segment data from remote storage."""
     yield b"["
 
-    with ThreadPoolExecutor(max_workers=10) as pool:
-        segment_data = pool.map(_download_segment, segments)
+    for i, result in enumerate(iter_downloaded_segments(segments)):
+        if i > 0:
+            yield b","
 
-    for i, result in enumerate(segment_data):
         if result is None:
             yield b"[]"
         else:
             yield result[1]
-            if i < len(segments) - 1:
-                yield b","
     yield b"]"
 
 
+def iter_downloaded_segments(
+    segments: Sequence[RecordingSegmentStorageMeta],
+    max_workers: int = DOWNLOAD_WORKERS,
+    prefetch: int = DOWNLOAD_PREFETCH,
+) -> Iterator[tuple[bytes | None, bytes] | None]:
+    """
+    Download segments concurrently, and yield them in order as soon as they and all segments
+    before them are downloaded. At most `prefetch` segments are downloaded ahead of the consumer.
+    """
+    pending: deque[Future[tuple[bytes | None, bytes] | None]] = deque()
+    to_download = iter(segments)
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for segment in to_download:
+            pending.append(pool.submit(_download_segment, segment))
+            if len(pending) >= prefetch:
+                break
+
+        while pending:
+            result = pending.popleft().result()
+            for segment in to_download:
+                pending.append(pool.submit(_download_segment, segment))
+                break
+            yield result
+    finally:
+        # The consumer may stop early, e.g. when the client disconnects. Don't wait for downloads
+        # nobody is going to read.
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
 def download_segment(segment: RecordingSegmentStorageMeta, span: Any) -> bytes:
     results = _download_segment(segment)
     return results[1] if results is not None else b"[]"
 
 
+def download_segment_slice(
+    segment: RecordingSegmentStorageMeta, start: float | None, end: float | None
+) -> bytes:
+    """
+    Return the rrweb events of a segment with timestamps within [start, end] as a JSON array.
+    Events without a timestamp are always returned. Only the chunks overlapping the time window
+    are downloaded from indexed segments.
+    """
+    index = _download_segment_index(segment)
+    if index is not None:
+        chunks = index.chunks_between(start, end)
+        if not chunks:
+            return b"[]"
+
+        base = chunks[0].offset
+        data = storage.get_range(segment, base, chunks[-1].offset + chunks[-1].length)
+        if data is None:
+            return b"[]"
+        rrweb: bytes | memoryview = read_chunks(data, chunks, base)
+    else:
+        result = _download_segment(segment)
+        if result is None:
+            return b"[]"
+        rrweb = result[1]
+
+    events = [
+        event
+        for event in json.loads(bytes(rrweb))
+        if (timestamp := event_timestamp(event)) is None
+        or ((start is None or timestamp >= start) and (end is None or timestamp <= end))
+    ]
+    return json.dumps(events).encode()
+
+
 def download_video(segment: RecordingSegmentStorageMeta) -> bytes | None:
+    index = _download_segment_index(segment)
+    if index is not None:
+        if index.video is None:
+            return storage_kv.get(make_video_filename(segment))
+        return storage.get_range(segment, *index.video)
+
     result = _download_segment(segment)
     if result is None:
         return storage_kv.get(make_video_filename(segment))
@@ -298,6 +389,36 @@ def _download_segment(segment: RecordingSegmentStorageMeta) -> tuple[bytes | Non
     return unpack(decompressed)
 
 
+def _download_segment_index(segment: RecordingSegmentStorageMeta) -> SegmentIndex | None:
+    """
+    Return the index of a segment stored in the indexed encoding, reading only its first bytes.
+    Returns None for segments stored in any other encoding, which have to be downloaded whole.
+
+    Only segments added since `replay.storage.indexed-segments.since` are expected to be indexed.
+    Older segments are not probed, so that they are downloaded in a single request.
+    """
+    indexed_since = options.get("replay.storage.indexed-segments.since")
+    if (
+        segment.file_id
+        or not indexed_since
+        or segment.date_added is None
+        or segment.date_added.timestamp() < indexed_since
+    ):
+        return None
+
+    head = storage.get_range(segment, 0, INDEX_PREFETCH)
+    if not head or head[0] != Encoding.INDEXED.value:
+        return None
+
+    size = index_size(head)
+    if size > len(head):
+        rest = storage.get_range(segment, len(head), size)
+        if rest is None:
+            return None
+        head += rest
+    return unpack_index(head)
+
+
 def decompress(buffer: bytes) -> bytes:
     """Return decompressed output."""
     # If the file starts with a valid JSON character we assume its uncompressed.
@@ -307,4 +428,8 @@ def decompress(buffer: bytes) -> bytes:
     if buffer.startswith(b"["):
         return buffer
 
+    # Indexed segments are not compressed as a whole, only their chunks are.
+    if buffer[:1] == bytes([Encoding.INDEXED.value]):
+        return buffer
+
     return zlib.decompress(buffer, zlib.MAX_WBITS | 32)
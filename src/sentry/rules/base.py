@@ -75,6 +75,9 @@ class RuleBase(abc.ABC):
     id: ClassVar[str]
     label: ClassVar[str]
     rule_type: ClassVar[str]
+    #: Whether `passes` only depends on the rule through its environment, so that rules with
+    #: identical condition data can share the result for an event.
+    shares_results_across_rules: ClassVar[bool] = False
 
     def is_enabled(self) -> bool:
         return True
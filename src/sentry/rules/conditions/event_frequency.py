@@ -132,6 +132,7 @@ class _QSTypedDict(TypedDict):
 class BaseEventFrequencyCondition(EventCondition, abc.ABC):
     intervals = STANDARD_INTERVALS
     form_cls = EventFrequencyForm
+    shares_results_across_rules = True
 
     def __init__(
         self,
@@ -539,6 +540,8 @@ class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
 class EventUniqueUserFrequencyConditionWithConditions(EventUniqueUserFrequencyCondition):
     id = "sentry.rules.conditions.event_frequency.EventUniqueUserFrequencyConditionWithConditions"
     label = "The issue is seen by more than {value} users in {interval} with conditions"
+    # The query is built from the other conditions of the rule
+    shares_results_across_rules = False
 
     def query_hook(
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: int
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from itertools import islice
 from typing import Any, DefaultDict, NamedTuple
 
+from celery.exceptions import SoftTimeLimitExceeded
 from django.db.models import OuterRef, Subquery
 
 from sentry import buffer, nodestore, options
@@ -26,6 +27,7 @@ from sentry.rules.conditions.event_frequency import (
     BaseEventFrequencyCondition,
     ComparisonType,
     EventFrequencyConditionData,
+    EventFrequencyPercentCondition,
     percent_increase,
 )
 from sentry.rules.processing.processor import (
@@ -46,6 +48,9 @@ from sentry.utils.safe import safe_execute
 logger = logging.getLogger("sentry.rules.delayed_processing")
 EVENT_LIMIT = 100
 COMPARISON_INTERVALS_VALUES = {k: v[1] for k, v in COMPARISON_INTERVALS.items()}
+# Conditions whose queries depend on the project of their groups (e.g. its session counts), and
+# therefore can't be shared by multiple projects
+PROJECT_SCOPED_CONDITIONS = frozenset([EventFrequencyPercentCondition.id])
 
 
 class UniqueConditionQuery(NamedTuple):
@@ -78,6 +83,20 @@ class DataAndGroups(NamedTuple):
         )
 
 
+class ProjectConditionGroups(NamedTuple):
+    """
+    The buffered rule/group pairs of a project (or of one batch of them), and the condition
+    queries needed to evaluate them.
+    """
+
+    project: Project
+    batch_key: str | None
+    rulegroup_to_event_data: dict[str, str]
+    rules_to_groups: DefaultDict[int, set[int]]
+    alert_rules: list[Rule]
+    condition_groups: dict[UniqueConditionQuery, DataAndGroups]
+
+
 def fetch_project(project_id: int) -> Project | None:
     try:
         return Project.objects.get_from_cache(id=project_id)
@@ -353,6 +372,71 @@ def get_condition_group_results(
     return condition_group_results
 
 
+def get_condition_group_results_for_projects(
+    projects_condition_groups: Sequence[ProjectConditionGroups],
+) -> dict[int, dict[UniqueConditionQuery, dict[int, int]]]:
+    """
+    Like `get_condition_group_results`, for many projects at once. Identical condition queries of
+    projects in the same organization are merged into one query for the groups of all of them.
+    Returns the results by project id.
+    """
+    results: dict[int, dict[UniqueConditionQuery, dict[int, int]]] = {
+        project_condition_groups.project.id: {}
+        for project_condition_groups in projects_condition_groups
+    }
+
+    projects_by_organization: DefaultDict[int, list[ProjectConditionGroups]] = defaultdict(list)
+    for project_condition_groups in projects_condition_groups:
+        projects_by_organization[project_condition_groups.project.organization_id].append(
+            project_condition_groups
+        )
+
+    for organization_projects in projects_by_organization.values():
+        merged_condition_groups: dict[UniqueConditionQuery, DataAndGroups] = {}
+        merged_project_ids: DefaultDict[UniqueConditionQuery, list[int]] = defaultdict(list)
+
+        for project, _, _, _, _, condition_groups in organization_projects:
+            project_scoped_condition_groups = {}
+            for unique_condition, (condition_data, group_ids, rule_id) in condition_groups.items():
+                if unique_condition.cls_id in PROJECT_SCOPED_CONDITIONS:
+                    project_scoped_condition_groups[unique_condition] = DataAndGroups(
+                        condition_data, group_ids, rule_id
+                    )
+                    continue
+
+                merged = merged_condition_groups.get(unique_condition)
+                if merged is None:
+                    merged_condition_groups[unique_condition] = DataAndGroups(
+                        condition_data, set(group_ids), rule_id
+                    )
+                else:
+                    merged.group_ids.update(group_ids)
+                merged_project_ids[unique_condition].append(project.id)
+
+            if project_scoped_condition_groups:
+                results[project.id].update(
+                    get_condition_group_results(project_scoped_condition_groups, project) or {}
+                )
+
+        if not merged_condition_groups:
+            continue
+
+        metrics.distribution(
+            "delayed_processing.cross_project.merged_queries",
+            sum(len(project_ids) for project_ids in merged_project_ids.values())
+            - len(merged_condition_groups),
+        )
+        # Group ids are unique across projects, so every project can use the merged result
+        merged_results = get_condition_group_results(
+            merged_condition_groups, organization_projects[0].project
+        )
+        for unique_condition, result in (merged_results or {}).items():
+            for project_id in merged_project_ids[unique_condition]:
+                results[project_id][unique_condition] = result
+
+    return results
+
+
 def passes_comparison(
     condition_group_results: dict[UniqueConditionQuery, dict[int, int]],
     condition_data: EventFrequencyConditionData,
@@ -482,7 +566,15 @@ def bucket_num_groups(num_groups: int) -> str:
     return "1"
 
 
-def process_rulegroups_in_batches(project_id: int):
+def get_num_rulegroups(project_id: int) -> int:
+    event_count = buffer.backend.get_hash_length(Project, {"project_id": project_id})
+    metrics.incr(
+        "delayed_processing.num_groups", tags={"num_groups": bucket_num_groups(event_count)}
+    )
+    return event_count
+
+
+def process_rulegroups_in_batches(project_id: int, event_count: int | None = None):
     """
     This will check the number of rulegroup_to_event_data items in the Redis buffer for a project.
 
@@ -498,10 +590,8 @@ def process_rulegroups_in_batches(project_id: int):
     `apply_delayed` will fetch the batch from redis and process the rules.
     """
     batch_size = options.get("delayed_processing.batch_size")
-    event_count = buffer.backend.get_hash_length(Project, {"project_id": project_id})
-    metrics.incr(
-        "delayed_processing.num_groups", tags={"num_groups": bucket_num_groups(event_count)}
-    )
+    if event_count is None:
+        event_count = get_num_rulegroups(project_id)
 
     if event_count < batch_size:
         return apply_delayed.delay(project_id)
@@ -534,6 +624,35 @@ def process_rulegroups_in_batches(project_id: int):
             apply_delayed.delay(project_id, batch_key)
 
 
+def process_rulegroups_across_projects(project_ids: list[int]) -> None:
+    """
+    Schedule `apply_delayed_for_projects` for batches of up to
+    `delayed_processing.cross_project_batch_size` projects, ordered by organization so that
+    projects of the same organization end up in the same batches and share their condition
+    queries.
+
+    Projects with more buffered rule/group pairs than `delayed_processing.batch_size` are
+    processed on their own, see `process_rulegroups_in_batches`.
+    """
+    batch_size = options.get("delayed_processing.batch_size")
+    small_project_ids = []
+    for project_id in project_ids:
+        event_count = get_num_rulegroups(project_id)
+        if event_count < batch_size:
+            small_project_ids.append(project_id)
+        else:
+            process_rulegroups_in_batches(project_id, event_count)
+
+    projects = sorted(
+        Project.objects.filter(id__in=small_project_ids).values_list("organization_id", "id")
+    )
+    for chunk in chunked(
+        (project_id for _, project_id in projects),
+        options.get("delayed_processing.cross_project_batch_size"),
+    ):
+        apply_delayed_for_projects.delay(chunk)
+
+
 def process_delayed_alert_conditions() -> None:
     with metrics.timer("delayed_processing.process_all_conditions.duration"):
         fetch_time = datetime.now(tz=timezone.utc)
@@ -543,40 +662,43 @@ def process_delayed_alert_conditions() -> None:
         log_str = ", ".join(f"{project_id}: {timestamp}" for project_id, timestamp in project_ids)
         logger.info("delayed_processing.project_id_list", extra={"project_ids": log_str})
 
-        for project_id, _ in project_ids:
-            process_rulegroups_in_batches(project_id)
+        if options.get("delayed_processing.cross_project_batch_size") > 0:
+            process_rulegroups_across_projects([project_id for project_id, _ in project_ids])
+        else:
+            for project_id, _ in project_ids:
+                process_rulegroups_in_batches(project_id)
 
         buffer.backend.delete_key(PROJECT_ID_BUFFER_LIST_KEY, min=0, max=fetch_time.timestamp())
 
 
-@instrumented_task(
-    name="sentry.rules.processing.delayed_processing",
-    queue="delayed_rules",
-    default_retry_delay=5,
-    max_retries=5,
-    soft_time_limit=50,
-    time_limit=60,
-    silo_mode=SiloMode.REGION,
-)
-def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **kwargs: Any) -> None:
-    """
-    Grab rules, groups, and events from the Redis buffer, evaluate the "slow" conditions in a bulk snuba query, and fire them if they pass
-    """
-    project = fetch_project(project_id)
-    if not project:
-        return
-
-    rulegroup_to_event_data = fetch_rulegroup_to_event_data(project_id, batch_key)
+def fetch_project_condition_groups(
+    project: Project, batch_key: str | None = None
+) -> ProjectConditionGroups:
+    rulegroup_to_event_data = fetch_rulegroup_to_event_data(project.id, batch_key)
     rules_to_groups = get_rules_to_groups(rulegroup_to_event_data)
     alert_rules = fetch_alert_rules(list(rules_to_groups.keys()))
     condition_groups = get_condition_query_groups(alert_rules, rules_to_groups)
     logger.info(
         "delayed_processing.condition_groups",
-        extra={"condition_groups": condition_groups, "project_id": project_id},
+        extra={"condition_groups": condition_groups, "project_id": project.id},
+    )
+    return ProjectConditionGroups(
+        project=project,
+        batch_key=batch_key,
+        rulegroup_to_event_data=rulegroup_to_event_data,
+        rules_to_groups=rules_to_groups,
+        alert_rules=alert_rules,
+        condition_groups=condition_groups,
     )
 
-    with metrics.timer("delayed_processing.get_condition_group_results.duration"):
-        condition_group_results = get_condition_group_results(condition_groups, project)
+
+def fire_project_rules(
+    project_condition_groups: ProjectConditionGroups,
+    condition_group_results: dict[UniqueConditionQuery, dict[int, int]] | None,
+) -> None:
+    project, batch_key, rulegroup_to_event_data, rules_to_groups, alert_rules, _ = (
+        project_condition_groups
+    )
 
     rules_to_slow_conditions = defaultdict(list)
     for rule in alert_rules:
@@ -589,14 +711,132 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
         )
         logger.info(
             "delayed_processing.rule_to_fire",
-            extra={"rules_to_fire": list(rules_to_fire.keys()), "project_id": project_id},
+            extra={"rules_to_fire": list(rules_to_fire.keys()), "project_id": project.id},
         )
 
     parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(rulegroup_to_event_data)
     with metrics.timer("delayed_processing.fire_rules.duration"):
         fire_rules(rules_to_fire, parsed_rulegroup_to_event_data, alert_rules, project)
 
-    cleanup_redis_buffer(project_id, rules_to_groups, batch_key)
+    cleanup_redis_buffer(project.id, rules_to_groups, batch_key)
+
+
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing",
+    queue="delayed_rules",
+    default_retry_delay=5,
+    max_retries=5,
+    soft_time_limit=50,
+    time_limit=60,
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **kwargs: Any) -> None:
+    """
+    Grab rules, groups, and events from the Redis buffer, evaluate the "slow" conditions in a bulk snuba query, and fire them if they pass
+    """
+    project = fetch_project(project_id)
+    if not project:
+        return
+
+    project_condition_groups = fetch_project_condition_groups(project, batch_key)
+
+    with metrics.timer("delayed_processing.get_condition_group_results.duration"):
+        condition_group_results = get_condition_group_results(
+            project_condition_groups.condition_groups, project
+        )
+
+    fire_project_rules(project_condition_groups, condition_group_results)
+
+
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing.apply_delayed_for_projects",
+    queue="delayed_rules",
+    default_retry_delay=5,
+    max_retries=5,
+    soft_time_limit=50,
+    time_limit=60,
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed_for_projects(project_ids: list[int], *args: Any, **kwargs: Any) -> None:
+    """
+    Like `apply_delayed`, for a batch of projects. The condition queries of all projects are made
+    together, so that projects of the same organization share identical queries.
+
+    A failing project does not affect the others of the batch. All projects share the time limits
+    of one task, so `delayed_processing.cross_project_batch_size` must be small enough for a batch
+    to finish within them. Projects which are not done when the soft time limit is hit are added
+    back to the project list, and processed by the next flush.
+    """
+    done: set[int] = set()
+    try:
+        projects_condition_groups = []
+        for project_id in project_ids:
+            try:
+                project = fetch_project(project_id)
+                if project:
+                    projects_condition_groups.append(fetch_project_condition_groups(project))
+                else:
+                    done.add(project_id)
+            except SoftTimeLimitExceeded:
+                raise
+            except Exception:
+                # The buffered data is kept, and evaluated with the next events of the project
+                logger.exception(
+                    "delayed_processing.cross_project.fetch_failed",
+                    extra={"project_id": project_id},
+                )
+                done.add(project_id)
+
+        metrics.distribution(
+            "delayed_processing.cross_project.batch_size", len(projects_condition_groups)
+        )
+        try:
+            with metrics.timer(
+                "delayed_processing.cross_project.get_condition_group_results.duration"
+            ):
+                results = get_condition_group_results_for_projects(projects_condition_groups)
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception:
+            logger.exception(
+                "delayed_processing.cross_project.query_failed",
+                extra={"project_ids": [pcg.project.id for pcg in projects_condition_groups]},
+            )
+            results = {}
+
+        for project_condition_groups in projects_condition_groups:
+            project = project_condition_groups.project
+            try:
+                if project.id in results:
+                    condition_group_results = results[project.id]
+                else:
+                    # The batched query failed, fall back to the queries of this project
+                    condition_group_results = get_condition_group_results(
+                        project_condition_groups.condition_groups, project
+                    )
+                fire_project_rules(project_condition_groups, condition_group_results)
+            except SoftTimeLimitExceeded:
+                raise
+            except Exception:
+                logger.exception(
+                    "delayed_processing.cross_project.project_failed",
+                    extra={"project_id": project.id},
+                )
+                cleanup_redis_buffer(
+                    project.id,
+                    project_condition_groups.rules_to_groups,
+                    project_condition_groups.batch_key,
+                )
+            done.add(project.id)
+    except SoftTimeLimitExceeded:
+        remaining = [project_id for project_id in project_ids if project_id not in done]
+        logger.warning(
+            "delayed_processing.cross_project.time_limit_exceeded",
+            extra={"project_ids": remaining},
+        )
+        metrics.incr("delayed_processing.cross_project.requeued", amount=len(remaining))
+        for project_id in remaining:
+            buffer.backend.push_to_sorted_set(PROJECT_ID_BUFFER_LIST_KEY, project_id)
 
 
 if not redis_buffer_registry.has(BufferHookEvent.FLUSH):
@@ -7,6 +7,7 @@ from datetime import timedelta
 from random import randrange
 from typing import Any
 
+import orjson
 from django.core.cache import cache
 from django.utils import timezone
 
@@ -89,55 +90,86 @@ def build_rule_status_cache_key(rule_id: int, group_id: int) -> str:
 def bulk_get_rule_status(
     rules: Sequence[Rule], group: Group, project: Project
 ) -> Mapping[int, GroupRuleStatus]:
-    keys = [build_rule_status_cache_key(rule.id, group.id) for rule in rules]
-    cache_results: Mapping[str, GroupRuleStatus] = cache.get_many(keys)
-    missing_rule_ids: set[int] = set()
-    rule_statuses: MutableMapping[int, GroupRuleStatus] = {}
-    for key, rule in zip(keys, rules):
+    return bulk_get_rule_statuses(rules, [group], project)[group.id]
+
+
+def bulk_get_rule_statuses(
+    rules: Sequence[Rule], groups: Sequence[Group], project: Project
+) -> Mapping[int, Mapping[int, GroupRuleStatus]]:
+    """
+    Fetch the statuses of all rules for all groups, creating missing ones. All (rule, group)
+    pairs are looked up in the cache in one round trip, and pairs that aren't cached are fetched
+    with a single query regardless of the number of groups.
+
+    Returns the statuses keyed by group id, then by rule id.
+    """
+    keys = {
+        build_rule_status_cache_key(rule.id, group.id): (rule.id, group.id)
+        for group in groups
+        for rule in rules
+    }
+    cache_results: Mapping[str, GroupRuleStatus] = cache.get_many(list(keys))
+    missing: set[tuple[int, int]] = set()
+    rule_statuses: dict[int, MutableMapping[int, GroupRuleStatus]] = {
+        group.id: {} for group in groups
+    }
+    for key, (rule_id, group_id) in keys.items():
         rule_status = cache_results.get(key)
         if not rule_status:
-            missing_rule_ids.add(rule.id)
+            missing.add((rule_id, group_id))
         else:
-            rule_statuses[rule.id] = rule_status
+            rule_statuses[group_id][rule_id] = rule_status
 
-    if missing_rule_ids:
-        # If not cached, attempt to fetch status from the database
-        statuses = GroupRuleStatus.objects.filter(group=group, rule_id__in=missing_rule_ids)
+    if missing:
         to_cache: list[GroupRuleStatus] = list()
-        for status in statuses:
-            rule_statuses[status.rule_id] = status
-            missing_rule_ids.remove(status.rule_id)
-            to_cache.append(status)
+
+        def fetch_missing() -> None:
+            statuses = GroupRuleStatus.objects.filter(
+                group_id__in={group_id for _, group_id in missing},
+                rule_id__in={rule_id for rule_id, _ in missing},
+            )
+            for status in statuses:
+                pair = (status.rule_id, status.group_id)
+                # The query matches the cross product of the rules and groups
+                if pair in missing:
+                    rule_statuses[status.group_id][status.rule_id] = status
+                    missing.remove(pair)
+                    to_cache.append(status)
+
+        # If not cached, attempt to fetch statuses from the database
+        fetch_missing()
 
         # We might need to create some statuses if they don't already exist
-        if missing_rule_ids:
+        if missing:
             # We use `ignore_conflicts=True` here to avoid race conditions where the statuses
             # might be created between when we queried above and attempt to create the rows now.
             GroupRuleStatus.objects.bulk_create(
                 [
-                    GroupRuleStatus(rule_id=rule_id, group=group, project=project)
-                    for rule_id in missing_rule_ids
+                    GroupRuleStatus(rule_id=rule_id, group_id=group_id, project=project)
+                    for rule_id, group_id in missing
                 ],
                 ignore_conflicts=True,
             )
             # Using `ignore_conflicts=True` prevents the pk from being set on the model
             # instances. Re-query the database to fetch the rows, they should all exist at this
             # point.
-            statuses = GroupRuleStatus.objects.filter(group=group, rule_id__in=missing_rule_ids)
-            for status in statuses:
-                rule_statuses[status.rule_id] = status
-                missing_rule_ids.remove(status.rule_id)
-                to_cache.append(status)
+            fetch_missing()
 
-            if missing_rule_ids:
+            if missing:
                 # Shouldn't happen, but log just in case
                 logger.error(
                     "Failed to fetch some GroupRuleStatuses in RuleProcessor",
-                    extra={"missing_rule_ids": missing_rule_ids, "group_id": group.id},
+                    extra={
+                        "missing_rule_ids": {rule_id for rule_id, _ in missing},
+                        "group_ids": {group_id for _, group_id in missing},
+                    },
                 )
         if to_cache:
             cache.set_many(
-                {build_rule_status_cache_key(item.rule_id, group.id): item for item in to_cache}
+                {
+                    build_rule_status_cache_key(item.rule_id, item.group_id): item
+                    for item in to_cache
+                }
             )
 
     return rule_statuses
@@ -204,6 +236,8 @@ class RuleProcessor:
         self.grouped_futures: MutableMapping[
             str, tuple[Callable[[GroupEvent, Sequence[RuleFuture]], None], list[RuleFuture]]
         ] = {}
+        # Results of conditions already evaluated for this event, shared by all rules
+        self._condition_results: dict[tuple[bytes, int | None], bool | None] = {}
 
     def get_rules(self) -> Sequence[Rule]:
         """Get all of the rules for this project from the DB (or cache)."""
@@ -215,6 +249,27 @@ class RuleProcessor:
         condition: MutableMapping[str, Any],
         state: EventState,
         rule: Rule,
+    ) -> bool | None:
+        # Rules with identical data for a condition which only depends on the rule through its
+        # environment share its result
+        condition_cls = rules.get(condition["id"])
+        if condition_cls is None or not condition_cls.shares_results_across_rules:
+            return self._condition_matches(condition, state, rule)
+
+        cache_key = (orjson.dumps(condition, option=orjson.OPT_SORT_KEYS), rule.environment_id)
+        if cache_key in self._condition_results:
+            metrics.incr("rules.processor.condition_cache_hit")
+            return self._condition_results[cache_key]
+
+        result = self._condition_matches(condition, state, rule)
+        self._condition_results[cache_key] = result
+        return result
+
+    def _condition_matches(
+        self,
+        condition: MutableMapping[str, Any],
+        state: EventState,
+        rule: Rule,
     ) -> bool | None:
         condition_cls = rules.get(condition["id"])
         if condition_cls is None:
@@ -392,14 +447,27 @@ class RuleProcessor:
         if not self.event.group.is_unresolved():
             return {}.values()
 
-        self.grouped_futures.clear()
         rules = self.get_rules()
         snoozed_rules = RuleSnooze.objects.filter(rule__in=rules, user_id=None).values_list(
             "rule", flat=True
         )
         rule_statuses = bulk_get_rule_status(rules, self.group, self.project)
+        return self.apply_rules(rules, snoozed_rules, rule_statuses)
+
+    def apply_rules(
+        self,
+        rules: Sequence[Rule],
+        snoozed_rules: Collection[int],
+        rule_statuses: Mapping[int, GroupRuleStatus],
+    ) -> Collection[tuple[Callable[[GroupEvent, Sequence[RuleFuture]], None], list[RuleFuture]]]:
+        """
+        Apply the given rules, skipping snoozed ones, with already fetched rule statuses.
+        """
+        self.grouped_futures.clear()
+        self._condition_results.clear()
         for rule in rules:
             if rule.id not in snoozed_rules:
-                self.apply_rule(rule, rule_statuses[rule.id])
+                with metrics.timer("rules.processor.apply_rule"):
+                    self.apply_rule(rule, rule_statuses[rule.id])
 
         return self.grouped_futures.values()
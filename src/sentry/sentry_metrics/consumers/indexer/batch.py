@@ -3,7 +3,7 @@ import random
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Mapping, MutableMapping, MutableSequence, Sequence
 from dataclasses import dataclass
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
 import orjson
 import rapidjson
@@ -59,6 +59,19 @@ def _should_sample_debug_log() -> bool:
     return (rate > 0) and random.random() <= rate
 
 
+class TranslatedTags(NamedTuple):
+    """
+    The tags of a message with all strings replaced by their indexed ids, along with the metadata
+    of all strings used by the message.
+    """
+
+    tags: Mapping[str, str | int]
+    mapping_meta: Mapping[str, Mapping[str, str]]
+    mapping_sources: bytes
+    exceeded_global_quotas: int
+    exceeded_org_quotas: int
+
+
 @dataclass
 class IndexerBatchMetrics:
     message_count: int = 0
@@ -114,6 +127,9 @@ class IndexerBatch:
         self.filtered_msg_meta: set[BrokerMeta] = set()
         self.parsed_payloads_by_meta: MutableMapping[BrokerMeta, ParsedMessage] = {}
 
+        # Metric names repeat a lot within a batch, so they are only parsed once
+        self._use_case_ids_by_name: MutableMapping[str, UseCaseID] = {}
+
         self._extract_messages()
 
     @metrics.wraps("process_messages.extract_messages")
@@ -176,8 +192,12 @@ class IndexerBatch:
             )
             raise
 
-        assert parsed_payload.get("name", None) is not None
-        parsed_payload["use_case_id"] = use_case_id = extract_use_case_id(parsed_payload["name"])
+        metric_name = parsed_payload.get("name", None)
+        assert metric_name is not None
+        use_case_id = self._use_case_ids_by_name.get(metric_name)
+        if use_case_id is None:
+            use_case_id = self._use_case_ids_by_name[metric_name] = extract_use_case_id(metric_name)
+        parsed_payload["use_case_id"] = use_case_id
 
         try:
             self.schema_validator(use_case_id.value, parsed_payload)
@@ -303,6 +323,67 @@ class IndexerBatch:
 
         return strings
 
+    def _translate_tags(
+        self,
+        metric_name: str,
+        tags: Mapping[str, str],
+        org_mapping: Mapping[str, int | None],
+        org_meta: Mapping[str, Metadata],
+    ) -> TranslatedTags:
+        """
+        Replace the tag keys, and if enabled also tag values, of a message by their indexed ids.
+
+        Raises `KeyError` if any string of the message was not indexed at all.
+        """
+        used_tags: set[str] = {metric_name}
+        new_tags: dict[str, str | int] = {}
+        exceeded_global_quotas = 0
+        exceeded_org_quotas = 0
+
+        for k, v in tags.items():
+            used_tags.update({k, v})
+            new_k = org_mapping[k]
+            if new_k is None:
+                metadata = org_meta.get(k)
+                if metadata and metadata.fetch_type_ext and metadata.fetch_type_ext.is_global:
+                    exceeded_global_quotas += 1
+                else:
+                    exceeded_org_quotas += 1
+                continue
+
+            value_to_write: int | str = v
+            if self.__should_index_tag_values:
+                new_v = org_mapping[v]
+                if new_v is None:
+                    metadata = org_meta.get(v)
+                    if metadata and metadata.fetch_type_ext and metadata.fetch_type_ext.is_global:
+                        exceeded_global_quotas += 1
+                    else:
+                        exceeded_org_quotas += 1
+                    continue
+                else:
+                    value_to_write = new_v
+
+            new_tags[str(new_k)] = value_to_write
+
+        output_message_meta: dict[str, dict[str, str]] = defaultdict(dict)
+        fetch_types_encountered = set()
+        for tag in used_tags:
+            if tag in org_meta:
+                metadata = org_meta[tag]
+                fetch_types_encountered.add(metadata.fetch_type)
+                output_message_meta[metadata.fetch_type.value][str(metadata.id)] = tag
+
+        return TranslatedTags(
+            tags=new_tags,
+            mapping_meta=output_message_meta,
+            mapping_sources=bytes(
+                "".join(sorted(t.value for t in fetch_types_encountered)), "utf-8"
+            ),
+            exceeded_global_quotas=exceeded_global_quotas,
+            exceeded_org_quotas=exceeded_org_quotas,
+        )
+
     @metrics.wraps("process_messages.reconstruct_messages")
     def reconstruct_messages(
         self,
@@ -312,9 +393,13 @@ class IndexerBatch:
         new_messages: MutableSequence[Message[RoutingPayload | KafkaPayload | InvalidMessage]] = []
         cogs_usage: MutableMapping[UseCaseID, int] = defaultdict(int)
 
+        translated_tags: MutableMapping[
+            tuple[UseCaseID, OrgId, str, tuple[tuple[str, str], ...]], TranslatedTags
+        ] = {}
+        aggregation_options_by_name: MutableMapping[str, Any] = {}
+        use_orjson = in_random_rollout("sentry-metrics.indexer.reconstruct.enable-orjson")
+
         for message in self.outer_message.payload:
-            used_tags: set[str] = set()
-            output_message_meta: dict[str, dict[str, str]] = defaultdict(dict)
             assert isinstance(message.value, BrokerValue)
             broker_meta = BrokerMeta(message.value.partition, message.value.offset)
             if broker_meta in self.filtered_msg_meta:
@@ -336,52 +421,26 @@ class IndexerBatch:
             cogs_usage[use_case_id] += 1
             sentry_sdk.set_tag("sentry_metrics.organization_id", org_id)
             tags = old_payload_value.get("tags", {})
-            used_tags.add(metric_name)
-
-            new_tags: dict[str, str | int] = {}
-            exceeded_global_quotas = 0
-            exceeded_org_quotas = 0
 
             with metrics.timer("metrics_consumer.reconstruct_messages.get_indexed_tags"):
-                try:
-                    for k, v in tags.items():
-                        used_tags.update({k, v})
-                        new_k = mapping[use_case_id][org_id][k]
-                        if new_k is None:
-                            metadata = bulk_record_meta[use_case_id][org_id].get(k)
-                            if (
-                                metadata
-                                and metadata.fetch_type_ext
-                                and metadata.fetch_type_ext.is_global
-                            ):
-                                exceeded_global_quotas += 1
-                            else:
-                                exceeded_org_quotas += 1
-                            continue
-
-                        value_to_write: int | str = v
-                        if self.__should_index_tag_values:
-                            new_v = mapping[use_case_id][org_id][v]
-                            if new_v is None:
-                                metadata = bulk_record_meta[use_case_id][org_id].get(v)
-                                if (
-                                    metadata
-                                    and metadata.fetch_type_ext
-                                    and metadata.fetch_type_ext.is_global
-                                ):
-                                    exceeded_global_quotas += 1
-                                else:
-                                    exceeded_org_quotas += 1
-                                continue
-                            else:
-                                value_to_write = new_v
-
-                        new_tags[str(new_k)] = value_to_write
-                except KeyError:
-                    logger.exception("process_messages.key_error", extra={"tags": tags})
-                    continue
+                # Most messages of a batch share their tags with other messages, so the tags of
+                # each distinct combination of metric name and tags are only translated once.
+                translation_key = (use_case_id, org_id, metric_name, tuple(tags.items()))
+                translated = translated_tags.get(translation_key)
+                if translated is None:
+                    try:
+                        translated = self._translate_tags(
+                            metric_name,
+                            tags,
+                            mapping[use_case_id][org_id],
+                            bulk_record_meta[use_case_id][org_id],
+                        )
+                    except KeyError:
+                        logger.exception("process_messages.key_error", extra={"tags": tags})
+                        continue
+                    translated_tags[translation_key] = translated
 
-            if exceeded_org_quotas or exceeded_global_quotas:
+            if translated.exceeded_org_quotas or translated.exceeded_global_quotas:
                 metrics.incr(
                     "sentry_metrics.indexer.process_messages.dropped_message",
                     tags={
@@ -396,24 +455,17 @@ class IndexerBatch:
                         extra={
                             "reason": "writes_limit",
                             "string_type": "tags",
-                            "num_global_quotas": exceeded_global_quotas,
-                            "num_org_quotas": exceeded_org_quotas,
+                            "num_global_quotas": translated.exceeded_global_quotas,
+                            "num_org_quotas": translated.exceeded_org_quotas,
                             "org_batch_size": len(mapping[use_case_id][org_id]),
                             "use_case_id": use_case_id.value,
                         },
                     )
                 continue
 
-            fetch_types_encountered = set()
-            for tag in used_tags:
-                if tag in bulk_record_meta[use_case_id][org_id]:
-                    metadata = bulk_record_meta[use_case_id][org_id][tag]
-                    fetch_types_encountered.add(metadata.fetch_type)
-                    output_message_meta[metadata.fetch_type.value][str(metadata.id)] = tag
-
-            mapping_header_content = bytes(
-                "".join(sorted(t.value for t in fetch_types_encountered)), "utf-8"
-            )
+            new_tags = translated.tags
+            output_message_meta = translated.mapping_meta
+            mapping_header_content = translated.mapping_sources
 
             numeric_metric_id = mapping[use_case_id][org_id][metric_name]
             if numeric_metric_id is None:
@@ -458,7 +510,7 @@ class IndexerBatch:
                         "tags": cast(dict[str, int], new_tags),
                         # XXX: relay actually sends this value unconditionally
                         "retention_days": old_payload_value.get("retention_days", 90),
-                        "mapping_meta": output_message_meta,
+                        "mapping_meta": cast(dict[str, dict[str, str]], output_message_meta),
                         "use_case_id": old_payload_value["use_case_id"].value,
                         "metric_id": numeric_metric_id,
                         "org_id": old_payload_value["org_id"],
@@ -478,7 +530,7 @@ class IndexerBatch:
                         "tags": cast(dict[str, str], new_tags),
                         "version": 2,
                         "retention_days": old_payload_value.get("retention_days", 90),
-                        "mapping_meta": output_message_meta,
+                        "mapping_meta": cast(dict[str, dict[str, str]], output_message_meta),
                         "use_case_id": old_payload_value["use_case_id"].value,
                         "metric_id": numeric_metric_id,
                         "org_id": old_payload_value["org_id"],
@@ -488,7 +540,11 @@ class IndexerBatch:
                         "value": old_payload_value["value"],
                         "sentry_received_timestamp": sentry_received_timestamp,
                     }
-                    if aggregation_options := get_aggregation_options(old_payload_value["name"]):
+                    if metric_name not in aggregation_options_by_name:
+                        aggregation_options_by_name[metric_name] = get_aggregation_options(
+                            metric_name
+                        )
+                    if aggregation_options := aggregation_options_by_name[metric_name]:
                         # TODO: This should eventually handle multiple aggregation options
                         option = list(aggregation_options.items())[0][0]
                         assert option is not None
@@ -501,7 +557,7 @@ class IndexerBatch:
                 with metrics.timer(
                     "metrics_consumer.reconstruct_messages.build_new_payload.json_step"
                 ):
-                    if in_random_rollout("sentry-metrics.indexer.reconstruct.enable-orjson"):
+                    if use_orjson:
                         serialized_msg = orjson.dumps(new_payload_value)
                     else:
                         serialized_msg = rapidjson.dumps(new_payload_value).encode()
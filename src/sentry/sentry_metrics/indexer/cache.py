@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
+from collections import Counter, OrderedDict
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
+from time import monotonic
 
 from django.conf import settings
 from django.core.cache import caches
@@ -33,6 +36,7 @@ _INDEXER_CACHE_RESOLVE_CACHE_REPLENISHMENT_METRIC = (
 _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-write"
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
 
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
@@ -45,11 +49,79 @@ BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
 
 
+class LocalStringIndexerCache:
+    """
+    Process-local LRU cache of indexed strings, in front of the shared cache.
+
+    Indexer consumers see the same metric names and tag strings over and over again, so most
+    lookups can be answered without a round trip to the shared cache. Entries are keyed by
+    namespace and "use_case_id:org_id:string" key, and expire after a jittered TTL so that
+    entries written at the same time don't all expire at once either.
+
+    Sizing is controlled through the `sentry-metrics.indexer.local-cache.max-size` (number of
+    entries, 0 disables the cache) and `sentry-metrics.indexer.local-cache.ttl` options.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (namespace, key) -> (id, expires at)
+        self._entries: OrderedDict[tuple[str, str], tuple[int, float]] = OrderedDict()
+
+    @property
+    def max_size(self) -> int:
+        return options.get("sentry-metrics.indexer.local-cache.max-size")
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, int]:
+        if self.max_size <= 0:
+            return {}
+
+        found = {}
+        now = monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get((namespace, key))
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[(namespace, key)]
+                    continue
+                self._entries.move_to_end((namespace, key))
+                found[key] = value
+        return found
+
+    def set_many(self, namespace: str, key_values: Mapping[str, int]) -> None:
+        max_size = self.max_size
+        if max_size <= 0:
+            return
+
+        ttl = options.get("sentry-metrics.indexer.local-cache.ttl")
+        now = monotonic()
+        with self._lock:
+            for key, value in key_values.items():
+                # Same jitter as for the shared cache, see `StringIndexerCache.randomized_ttl`
+                expires_at = now + ttl + random.uniform(0, 0.25) * ttl
+                self._entries[(namespace, key)] = (value, expires_at)
+                self._entries.move_to_end((namespace, key))
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop((namespace, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class StringIndexerCache:
     def __init__(self, cache_name: str, partition_key: str):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        self.local_cache = LocalStringIndexerCache()
 
     @property
     def randomized_ttl(self) -> int:
@@ -130,7 +202,33 @@ class StringIndexerCache:
 
         return int(result)
 
+    def _record_local_cache_metrics(self, keys: Iterable[str], hits: Collection[str]) -> None:
+        if self.local_cache.max_size <= 0:
+            return
+
+        lookups: Counter[tuple[str, bool]] = Counter()
+        for key in keys:
+            use_case_id = key.split(":", 1)[0]
+            lookups[(use_case_id, key in hits)] += 1
+        for (use_case_id, hit), amount in lookups.items():
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": "true" if hit else "false", "use_case": use_case_id},
+                amount=amount,
+            )
+
     def get(self, namespace: str, key: str) -> int | None:
+        local_results = self.local_cache.get_many(namespace, [key])
+        self._record_local_cache_metrics([key], local_results)
+        if key in local_results:
+            return local_results[key]
+
+        result = self._get_remote(namespace, key)
+        if result is not None:
+            self.local_cache.set_many(namespace, {key: result})
+        return result
+
+    def _get_remote(self, namespace: str, key: str) -> int | None:
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
             result = self.cache.get(
@@ -140,6 +238,7 @@ class StringIndexerCache:
         return self.cache.get(self._make_cache_key(key), version=self.version)
 
     def set(self, namespace: str, key: str, value: int) -> None:
+        self.local_cache.set_many(namespace, {key: value})
         self.cache.set(
             key=self._make_cache_key(key),
             value=value,
@@ -156,6 +255,26 @@ class StringIndexerCache:
             )
 
     def get_many(self, namespace: str, keys: Iterable[str]) -> MutableMapping[str, int | None]:
+        keys = list(keys)
+        local_results = self.local_cache.get_many(namespace, keys)
+        self._record_local_cache_metrics(keys, local_results)
+        if len(local_results) == len(keys):
+            return {key: local_results[key] for key in keys}
+
+        remote_results = self._get_many_remote(
+            namespace, [key for key in keys if key not in local_results]
+        )
+        self.local_cache.set_many(
+            namespace, {key: value for key, value in remote_results.items() if value is not None}
+        )
+        return {
+            key: local_results[key] if key in local_results else remote_results.get(key)
+            for key in keys
+        }
+
+    def _get_many_remote(
+        self, namespace: str, keys: Sequence[str]
+    ) -> MutableMapping[str, int | None]:
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
             cache_keys = {self._make_namespaced_cache_key(namespace, key): key for key in keys}
@@ -176,6 +295,7 @@ class StringIndexerCache:
             return self._format_results(keys, results)
 
     def set_many(self, namespace: str, key_values: Mapping[str, int]) -> None:
+        self.local_cache.set_many(namespace, key_values)
         cache_key_values = {self._make_cache_key(k): v for k, v in key_values.items()}
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
@@ -190,12 +310,14 @@ class StringIndexerCache:
             )
 
     def delete(self, namespace: str, key: str) -> None:
+        self.local_cache.delete_many(namespace, [key])
         self.cache.delete(self._make_cache_key(key), version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
             self.cache.delete(self._make_namespaced_cache_key(namespace, key), version=self.version)
 
     def delete_many(self, namespace: str, keys: Sequence[str]) -> None:
+        self.local_cache.delete_many(namespace, keys)
         self.cache.delete_many([self._make_cache_key(key) for key in keys], version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
@@ -149,6 +149,9 @@ class MetricsBlockingState:
 def _apply_operation(
     metric_operation: MetricOperation, projects: Sequence[Project]
 ) -> Mapping[int, MetricBlocking]:
+    # The relay config imports this module to build the metrics section
+    from sentry.relay.config.sections import METRICS
+
     patched_metrics = {}
 
     for project in projects:
@@ -165,7 +168,9 @@ def _apply_operation(
             metric_mri=metric_operation.metric_mri
         )
         # We invalidate the project configuration once the updated settings were stored.
-        schedule_invalidate_project_config(project_id=project.id, trigger="metrics_blocking")
+        schedule_invalidate_project_config(
+            project_id=project.id, trigger="metrics_blocking", sections=[METRICS]
+        )
 
     return patched_metrics
 
@@ -9,7 +9,7 @@ from django.conf import settings
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.iterators import chunked
 
 
@@ -42,6 +42,10 @@ def get_unprocessed_segments_key(partition_index: int) -> str:
     return f"performance-issues:unprocessed-segments:partition-2:{partition_index}"
 
 
+def get_ready_segments_key(partition_index: int) -> str:
+    return f"performance-issues:ready-segments:partition:{partition_index}"
+
+
 class RedisSpansBuffer:
     def __init__(self):
         self.client: RedisCluster | StrictRedis = get_redis_client()
@@ -57,12 +61,15 @@ class RedisSpansBuffer:
         2. Check if number of spans pushed == to the number of elements that exist on the key. This
             tells us if it was the first time we see the key. This works fine because RPUSH is atomic.
         3. If it is the first time we see a particular segment, push the segment id and first seen
-            timestamp to a bucket so we know when it is ready to be processed.
+            timestamp to a bucket so we know when it is ready to be processed. With the
+            `standalone-spans.buffer-ready-index.enable` option, the bucket is a sorted set scored
+            by the first seen timestamp instead of a list.
         3. Checks if 1 second has passed since the last time segments were processed for a partition.
         """
         keys = list(spans_map.keys())
         spans_written_per_segment = []
         ttl = options.get("standalone-spans.buffer-ttl.seconds")
+        use_ready_index = options.get("standalone-spans.buffer-ready-index.enable")
 
         # Batch write spans in a segment
         with self.client.pipeline() as p:
@@ -92,11 +99,13 @@ class RedisSpansBuffer:
                 if num_written == num_total:
                     segment_id, project_id, partition = key
                     segment_key = get_segment_key(project_id, segment_id)
-                    bucket = get_unprocessed_segments_key(partition)
 
                     timestamp = segment_first_seen_ts[key]
                     p.expire(segment_key, ttl)
-                    p.rpush(bucket, timestamp, segment_key)
+                    if use_ready_index:
+                        p.zadd(get_ready_segments_key(partition), {segment_key: timestamp}, nx=True)
+                    else:
+                        p.rpush(get_unprocessed_segments_key(partition), timestamp, segment_key)
 
             timestamp_results = p.execute()
 
@@ -130,6 +139,49 @@ class RedisSpansBuffer:
         return values
 
     def get_unprocessed_segments_and_prune_bucket(self, now: int, partition: int) -> list[str]:
+        """
+        Return the keys of all segments of a partition which were first seen at least the buffer
+        window ago, and remove them from the buckets of the partition.
+
+        Segments in the sorted set bucket are looked up by score, so the cost only depends on the
+        number of ready segments. At most `standalone-spans.buffer-ready-index.max-segments` are
+        returned from it per call, any others are returned by the next calls. The list bucket is
+        still drained, so no segments are lost while the option is switched.
+        """
+        segment_keys = self._get_ready_segments_and_prune_index(now, partition)
+        segment_keys.extend(self._get_unprocessed_segments_and_prune_list(now, partition))
+        return segment_keys
+
+    def _get_ready_segments_and_prune_index(self, now: int, partition: int) -> list[str]:
+        key = get_ready_segments_key(partition)
+        buffer_window = options.get("standalone-spans.buffer-window.seconds")
+        max_segments = options.get("standalone-spans.buffer-ready-index.max-segments")
+        results = self.client.zrangebyscore(
+            key, "-inf", now - buffer_window, start=0, num=max_segments
+        )
+
+        with self.client.pipeline() as p:
+            if results:
+                p.zrem(key, *results)
+            p.zcard(key)
+            p.zrange(key, 0, 0, withscores=True)
+            *_, backlog, oldest = p.execute()
+
+        tags = {"partition": str(partition)}
+        metrics.gauge("spans.buffer.ready_segments", len(results), tags=tags)
+        metrics.gauge("spans.buffer.unprocessed_segments", backlog, tags=tags)
+        if oldest:
+            _, oldest_timestamp = oldest[0]
+            metrics.gauge(
+                "spans.buffer.unprocessed_segments.oldest_age",
+                now - oldest_timestamp,
+                tags=tags,
+                unit="second",
+            )
+
+        return [segment_key.decode("utf-8") for segment_key in results]
+
+    def _get_unprocessed_segments_and_prune_list(self, now: int, partition: int) -> list[str]:
         key = get_unprocessed_segments_key(partition)
         results = self.client.lrange(key, 0, -1) or []
 
@@ -151,7 +203,8 @@ class RedisSpansBuffer:
                 sentry_sdk.capture_exception()
                 break
 
-        self.client.ltrim(key, len(segment_keys) * 2, -1)
+        if segment_keys:
+            self.client.ltrim(key, len(segment_keys) * 2, -1)
 
         segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
         sentry_sdk.set_context("processed_segment", segment_context)
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+import functools
 import logging
+import threading
 import uuid
-from collections.abc import MutableMapping, Sequence
+from collections.abc import Callable, Mapping, MutableMapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import datetime, timedelta
-from time import time
+from time import monotonic, time
 from typing import TYPE_CHECKING, Any, TypedDict
 
 import sentry_sdk
 from django.conf import settings
+from django.db import close_old_connections
 from django.db.models.signals import post_save
 from django.utils import timezone
 from google.api_core.exceptions import ServiceUnavailable
 
-from sentry import features, projectoptions
+from sentry import features, options, projectoptions
 from sentry.eventstream.types import EventStreamEventType
 from sentry.exceptions import PluginError
+from sentry.features.rollout import in_random_rollout
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.issue_occurrence import IssueOccurrence
 from sentry.killswitches import killswitch_matches_context
@@ -29,6 +34,7 @@ from sentry.tasks.base import instrumented_task
 from sentry.types.group import GroupSubStatus
 from sentry.utils import json, metrics
 from sentry.utils.cache import cache
+from sentry.utils.concurrent import ThreadedExecutor
 from sentry.utils.event_frames import get_sdk_name
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.backends import LockBackend
@@ -697,41 +703,147 @@ def run_post_process_job(job: PostProcessJob) -> None:
         # specific pipelines for issue types
         pipeline = GROUP_CATEGORY_POST_PROCESS_PIPELINE[issue_category]
 
-    for pipeline_step in pipeline:
-        try:
-            with (
-                metrics.timer(
-                    "tasks.post_process.run_post_process_job.pipeline.duration",
-                    tags={
-                        "pipeline": pipeline_step.__name__,
-                        "issue_category": issue_category_metric,
-                        "is_reprocessed": job["is_reprocessed"],
-                    },
-                ),
-                sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"),
-            ):
-                pipeline_step(job)
-        except Exception:
-            metrics.incr(
-                "sentry.tasks.post_process.post_process_group.exception",
+    run_step = functools.partial(_run_post_process_step, job, issue_category_metric)
+    if in_random_rollout("post_process.parallel-pipeline.rollout"):
+        _run_pipeline_concurrently(pipeline, run_step)
+    else:
+        for pipeline_step in pipeline:
+            run_step(pipeline_step)
+
+
+def _run_post_process_step(
+    job: PostProcessJob,
+    issue_category_metric: str | None,
+    pipeline_step: Callable[[PostProcessJob], None],
+) -> None:
+    group_event = job["event"]
+    try:
+        with (
+            metrics.timer(
+                "tasks.post_process.run_post_process_job.pipeline.duration",
                 tags={
-                    "issue_category": issue_category_metric,
                     "pipeline": pipeline_step.__name__,
-                },
-            )
-            logger.exception(
-                "Failed to process pipeline step %s",
-                pipeline_step.__name__,
-                extra={"event": group_event, "group": group_event.group},
-            )
-        else:
-            metrics.incr(
-                "sentry.tasks.post_process.post_process_group.completed",
-                tags={
                     "issue_category": issue_category_metric,
-                    "pipeline": pipeline_step.__name__,
+                    "is_reprocessed": job["is_reprocessed"],
                 },
+            ),
+            sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"),
+        ):
+            pipeline_step(job)
+    except Exception:
+        metrics.incr(
+            "sentry.tasks.post_process.post_process_group.exception",
+            tags={
+                "issue_category": issue_category_metric,
+                "pipeline": pipeline_step.__name__,
+            },
+        )
+        logger.exception(
+            "Failed to process pipeline step %s",
+            pipeline_step.__name__,
+            extra={"event": group_event, "group": group_event.group},
+        )
+    else:
+        metrics.incr(
+            "sentry.tasks.post_process.post_process_group.completed",
+            tags={
+                "issue_category": issue_category_metric,
+                "pipeline": pipeline_step.__name__,
+            },
+        )
+
+
+_pipeline_executor: ThreadedExecutor[None] | None = None
+_pipeline_executor_lock = threading.Lock()
+
+
+def _get_pipeline_executor() -> ThreadedExecutor[None]:
+    global _pipeline_executor
+
+    with _pipeline_executor_lock:
+        if _pipeline_executor is None:
+            _pipeline_executor = ThreadedExecutor(
+                worker_count=options.get("post_process.parallel-pipeline.workers")
             )
+        return _pipeline_executor
+
+
+def _run_step_in_thread(
+    run_step: Callable[[Callable[[PostProcessJob], None]], None],
+    pipeline_step: Callable[[PostProcessJob], None],
+) -> None:
+    # Worker threads keep their database connections between steps, discard them once they
+    # exceeded their maximum age or became unusable, like requests and tasks do.
+    close_old_connections()
+    run_step(pipeline_step)
+
+
+def _run_pipeline_concurrently(
+    pipeline: Sequence[Callable[[PostProcessJob], None]],
+    run_step: Callable[[Callable[[PostProcessJob], None]], None],
+) -> None:
+    """
+    Run the steps of a pipeline on the shared post process thread pool, each step as soon as all
+    steps it depends on (see `POST_PROCESS_STEP_DEPENDENCIES`) have finished.
+
+    Steps that don't finish within `post_process.parallel-pipeline.step-timeout` seconds of being
+    scheduled are abandoned. They keep running in the background, but the steps depending on
+    them are skipped.
+    """
+    executor = _get_pipeline_executor()
+    timeout = options.get("post_process.parallel-pipeline.step-timeout")
+
+    pending = {pipeline_step.__name__: pipeline_step for pipeline_step in pipeline}
+    dependencies = {
+        name: {dep for dep in POST_PROCESS_STEP_DEPENDENCIES.get(name, ()) if dep in pending}
+        for name in pending
+    }
+    finished: set[str] = set()
+    abandoned: set[str] = set()
+    # future -> (step name, deadline)
+    running: dict[Future[None], tuple[str, float]] = {}
+
+    while True:
+        for name in list(pending):
+            if dependencies[name] & abandoned:
+                del pending[name]
+                abandoned.add(name)
+                metrics.incr(
+                    "tasks.post_process.run_post_process_job.pipeline.skipped",
+                    tags={"pipeline": name},
+                )
+            elif dependencies[name] <= finished:
+                future = executor.submit(
+                    functools.partial(_run_step_in_thread, run_step, pending.pop(name))
+                )
+                running[future] = (name, monotonic() + timeout)
+
+        if not running:
+            break
+
+        done, _ = wait(
+            running,
+            timeout=max(min(deadline for _, deadline in running.values()) - monotonic(), 0),
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            name, _ = running.pop(future)
+            finished.add(name)
+
+        now = monotonic()
+        for future, (name, deadline) in list(running.items()):
+            if deadline <= now:
+                del running[future]
+                abandoned.add(name)
+                metrics.incr(
+                    "tasks.post_process.run_post_process_job.pipeline.timeout",
+                    tags={"pipeline": name},
+                )
+                logger.warning("post_process.pipeline_step_timeout", extra={"pipeline": name})
+
+    # Only left with steps if the dependencies form a cycle
+    for name in pending:
+        logger.error("post_process.pipeline_step_not_run", extra={"pipeline": name})
 
 
 def process_event(data: MutableMapping[str, Any], group_id: int | None) -> Event:
@@ -1274,6 +1386,7 @@ def plugin_post_process_group(plugin_slug, event, **kwargs):
 
 
 def feedback_filter_decorator(func):
+    @functools.wraps(func)
     def wrapper(job):
         if not should_postprocess_feedback(job):
             return
@@ -1498,6 +1611,26 @@ def detect_base_urls_for_uptime(job: PostProcessJob):
     detect_base_url_for_project(job["event"].project, url)
 
 
+# Steps which have to run after other steps of their pipeline when the pipeline is run
+# concurrently, because they read state those steps write to the job or the group. All other
+# steps only rely on the job as it was passed to the pipeline.
+POST_PROCESS_STEP_DEPENDENCIES: Mapping[str, Sequence[str]] = {
+    # `has_reappeared` and the group status are set by `process_snoozes`
+    "process_inbox_adds": ["process_snoozes"],
+    # Both add the group to the inbox, the escalating entry has to replace the new one
+    "detect_new_escalation": ["process_snoozes", "process_inbox_adds"],
+    "handle_auto_assignment": ["handle_owner_assignment"],
+    # Rules see the state, inbox and assignee of the group, and `has_escalated`
+    "process_rules": [
+        "process_snoozes",
+        "process_inbox_adds",
+        "detect_new_escalation",
+        "handle_auto_assignment",
+    ],
+    # `has_alert` is set by `process_rules`
+    "process_service_hooks": ["process_rules"],
+}
+
 GROUP_CATEGORY_POST_PROCESS_PIPELINE = {
     GroupCategory.ERROR: [
         _capture_group_stats,
@@ -1,4 +1,7 @@
 import logging
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
 
 import sentry_sdk
 from django.apps import apps
@@ -10,6 +13,8 @@ from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
+_local_batch = threading.local()
+
 
 def get_process_lock(lock_name: str) -> Lock:
     from sentry.locks import locks
@@ -20,19 +25,36 @@ def get_process_lock(lock_name: str) -> Lock:
 @instrumented_task(
     name="sentry.tasks.process_buffer.process_pending", queue="buffers.process_pending"
 )
-def process_pending() -> None:
+def process_pending(shard: int | None = None) -> None:
     """
     Process pending buffers.
+
+    If the buffer splits its pending keys into several shards, the scheduled run fans out into
+    one task per shard so that shards are drained in parallel, each under its own lock.
     """
     from sentry import buffer
 
-    lock = get_process_lock("process_pending")
+    if shard is None:
+        pending_shards = buffer.backend.get_pending_shards()
+        if pending_shards > 1:
+            for shard in range(pending_shards):
+                process_pending.apply_async(
+                    kwargs={"shard": shard}, headers={"sentry-propagate-traces": False}
+                )
+            return
+
+        lock = get_process_lock("process_pending")
+    else:
+        lock = get_process_lock(f"process_pending:{shard}")
 
     try:
         with lock.acquire():
-            buffer.backend.process_pending()
+            if shard is None:
+                buffer.backend.process_pending()
+            else:
+                buffer.backend.process_pending(shard=shard)
     except UnableToAcquireLock as error:
-        logger.warning("process_pending.fail", extra={"error": error})
+        logger.warning("process_pending.fail", extra={"error": error, "shard": shard})
 
 
 @instrumented_task(
@@ -71,7 +93,15 @@ def buffer_incr(model, *args, **kwargs):
     `settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK`.
 
     See `Buffer.incr` for an explanation of the args and kwargs to pass here.
+
+    Inside a `batch_buffer_incr` block the call is deferred and flushed together with all other
+    increments made in that block.
     """
+    batch = getattr(_local_batch, "increments", None)
+    if batch is not None:
+        batch.append((model._meta.app_label, model._meta.model_name, args, kwargs))
+        return
+
     (buffer_incr_task.delay if settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK else buffer_incr_task)(
         app_label=model._meta.app_label, model_name=model._meta.model_name, args=args, kwargs=kwargs
     )
@@ -92,3 +122,55 @@ def buffer_incr_task(app_label, model_name, args, kwargs):
     sentry_sdk.set_tag("model", model_name)
 
     buffer.backend.incr(apps.get_model(app_label=app_label, model_name=model_name), *args, **kwargs)
+
+
+@contextmanager
+def batch_buffer_incr() -> Generator[None]:
+    """
+    Collect every `buffer_incr` call made within the block and hand them to `Buffer.incr_many`
+    in one go when the block exits, so backends can coalesce increments to the same key and
+    write them with a minimal number of round trips.
+
+    Increments are flushed even if the block raises, matching what would have happened had they
+    been applied immediately. Nested blocks are merged into the outermost one.
+    """
+    if getattr(_local_batch, "increments", None) is not None:
+        yield
+        return
+
+    _local_batch.increments = []
+    try:
+        yield
+    finally:
+        increments = _local_batch.increments
+        _local_batch.increments = None
+        if increments:
+            (
+                buffer_incr_many_task.delay
+                if settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK
+                else buffer_incr_many_task
+            )(increments=increments)
+
+
+@instrumented_task(
+    name="sentry.tasks.process_buffer.buffer_incr_many_task",
+    queue="buffers.incr",
+)
+def buffer_incr_many_task(increments):
+    """
+    Call `buffer.incr_many`, resolving the models first.
+
+    `increments` is a list of `(app_label, model_name, args, kwargs)` tuples, each describing a
+    single `buffer_incr` call.
+    """
+    from sentry import buffer
+    from sentry.buffer.base import BufferIncrement
+
+    buffer.backend.incr_many(
+        [
+            BufferIncrement(
+                apps.get_model(app_label=app_label, model_name=model_name), *args, **kwargs
+            )
+            for app_label, model_name, args, kwargs in increments
+        ]
+    )
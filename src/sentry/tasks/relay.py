@@ -102,11 +102,16 @@ def validate_args(organization_id=None, project_id=None, public_key=None):
         raise TypeError("Must provide exactly one of organzation_id, project_id or public_key")
 
 
-def compute_configs(organization_id=None, project_id=None, public_key=None):
+def compute_configs(
+    organization_id=None, project_id=None, public_key=None, use_section_cache=False
+):
     """Computes all configs for the org, project or single public key.
 
     You must only provide one single argument, not all.
 
+    :param use_section_cache: Reuse cached sections of the configs which were not invalidated,
+        see :mod:`sentry.relay.config.sections`.
+
     :returns: A dict mapping all affected public keys to their config.  The dict will not
        contain keys which should be retained in the cache unchanged.
     """
@@ -132,7 +137,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                     # recalculate it.  If the config was not there at all, we leave it and avoid the
                     # cost of re-computation.
                     if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
+                        configs[key.public_key] = compute_projectkey_config(
+                            key, use_section_cache=use_section_cache
+                        )
                         action = "recompute"
                     else:
                         action = "not-cached"
@@ -148,7 +155,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                 # recalculate it.  If the config was not there at all, we leave it and avoid the
                 # cost of re-computation.
                 if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
+                    configs[key.public_key] = compute_projectkey_config(
+                        key, use_section_cache=use_section_cache
+                    )
                     action = "recompute"
                 else:
                     action = "not-cached"
@@ -170,7 +179,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
             # bug was fixed in https://github.com/getsentry/sentry/pull/35671
             configs[public_key] = {"disabled": True}
         else:
-            configs[public_key] = compute_projectkey_config(key)
+            configs[public_key] = compute_projectkey_config(
+                key, use_section_cache=use_section_cache
+            )
 
     else:
         raise TypeError("One of the arguments must not be None")
@@ -178,7 +189,7 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
-def compute_projectkey_config(key):
+def compute_projectkey_config(key, use_section_cache=False):
     """Computes a single config for the given :class:`ProjectKey`.
 
     :returns: A dict with the project config.
@@ -189,7 +200,9 @@ def compute_projectkey_config(key):
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
     else:
-        return get_project_config(key.project, project_keys=[key]).to_dict()
+        return get_project_config(
+            key.project, project_keys=[key], use_section_cache=use_section_cache
+        ).to_dict()
 
 
 @instrumented_task(
@@ -238,8 +251,13 @@ def invalidate_project_config(
     sentry_sdk.set_tag("trigger", trigger)
     sentry_sdk.set_context("kwargs", kwargs)
 
+    # Sections of the configs which were not invalidated since they were cached can be reused,
+    # see `_schedule_invalidate_project_config`.
     updated_configs = compute_configs(
-        organization_id=organization_id, project_id=project_id, public_key=public_key
+        organization_id=organization_id,
+        project_id=project_id,
+        public_key=public_key,
+        use_section_cache=True,
     )
     projectconfig_cache.backend.set_many(updated_configs)
 
@@ -253,6 +271,7 @@ def schedule_invalidate_project_config(
     public_key=None,
     countdown=5,
     transaction_db=None,
+    sections=None,
 ):
     """Schedules the :func:`invalidate_project_config` task.
 
@@ -288,6 +307,9 @@ def schedule_invalidate_project_config(
         tweak this, like e.g. the :func:`invalidate_all` task does.
     :param transaction_db: The database currently being used by an active transaction.
         This directs the on_commit handler for the task to the correct transaction.
+    :param sections: The sections of the config affected by the change, see
+        :mod:`sentry.relay.config.sections`.  Sections which are not listed are reused from
+        the section cache when recomputing the config.  Defaults to all sections.
     """
 
     from sentry.models.project import Project
@@ -310,6 +332,7 @@ def schedule_invalidate_project_config(
                 project_id=project_id,
                 public_key=public_key,
                 countdown=countdown,
+                sections=sections,
             ),
             using=transaction_db,
         )
@@ -322,10 +345,12 @@ def _schedule_invalidate_project_config(
     project_id=None,
     public_key=None,
     countdown=5,
+    sections=None,
 ):
     """For param docs, see :func:`schedule_invalidate_project_config`."""
     from sentry.models.project import Project
     from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config.sections import QUOTAS, invalidate_sections
 
     validate_args(organization_id, project_id, public_key)
 
@@ -348,6 +373,8 @@ def _schedule_invalidate_project_config(
         else:
             check_debounce_keys["project_id"] = proj_id
             check_debounce_keys["organization_id"] = org_id
+            # Of all sections, only quotas depend on the project keys
+            invalidate_sections(project_id=proj_id, sections=[QUOTAS])
     elif project_id:
         try:
             (org_id,) = Project.objects.values_list("organization__id").get(id=project_id)
@@ -356,6 +383,13 @@ def _schedule_invalidate_project_config(
         else:
             check_debounce_keys["organization_id"] = org_id
 
+    # Cached sections have to be invalidated even if the task is debounced, since a task which
+    # was scheduled earlier may already be computing the config from outdated sections.
+    if not public_key:
+        invalidate_sections(
+            organization_id=organization_id, project_id=project_id, sections=sections
+        )
+
     if projectconfig_debounce_cache.invalidation.is_debounced(**check_debounce_keys):
         # If this task is already in the queue, do not schedule another task.
         metrics.incr(
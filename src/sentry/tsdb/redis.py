@@ -15,6 +15,7 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes
 from redis.client import Script
 
+from sentry import options
 from sentry.tsdb.base import BaseTSDB, IncrMultiOptions, TSDBItem, TSDBKey, TSDBModel
 from sentry.utils.dates import to_datetime
 from sentry.utils.redis import (
@@ -341,6 +342,9 @@ class RedisTSDB(BaseTSDB):
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         _series = [to_datetime(item) for item in series]
 
+        if options.get("tsdb.redis.bulk-range-reads"):
+            return self._get_range_bulk(model, keys, rollup, _series, environment_id)
+
         results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
@@ -362,6 +366,48 @@ class RedisTSDB(BaseTSDB):
             output[key] = sorted(points.items())
         return output
 
+    def _get_range_bulk(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        rollup: int,
+        series: Sequence[datetime],
+        environment_id: int | None,
+    ) -> dict[TSDBKey, list[tuple[int, int]]]:
+        """
+        Bulk variant of `get_range`.
+
+        Counters of keys that share a vnode live in the same hash, so instead of one `HGET` per
+        key and timestamp this issues a single `HMGET` per hash. `rb` routes and pipelines those per
+        host, and the replies are decoded straight into a keys x timestamps matrix.
+        """
+        epochs = [int(timestamp.timestamp()) for timestamp in series]
+        # (row, column) cells of the result matrix that each hash field fills in
+        fields_by_hash: dict[str, list[str | int]] = defaultdict(list)
+        cells_by_hash: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for row, key in enumerate(keys):
+            for column, timestamp in enumerate(series):
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                fields_by_hash[hash_key].append(hash_field)
+                cells_by_hash[hash_key].append((row, column))
+
+        cluster, _ = self.get_cluster(environment_id)
+        with cluster.map() as client:
+            promises = {
+                hash_key: client.hmget(hash_key, fields)
+                for hash_key, fields in fields_by_hash.items()
+            }
+
+        matrix = [[0] * len(epochs) for _ in keys]
+        for hash_key, promise in promises.items():
+            for (row, column), count in zip(cells_by_hash[hash_key], promise.value):
+                if count is not None:
+                    matrix[row][column] = int(count)
+
+        return {key: list(zip(epochs, matrix[row])) for row, key in enumerate(keys)}
+
     def merge(
         self,
         model: TSDBModel,
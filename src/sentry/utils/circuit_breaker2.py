@@ -6,11 +6,17 @@ and get rid of the old one, at which point this can lose the `2`.
 """
 
 import logging
+import math
+import os
+import threading
 import time
+from collections import defaultdict
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Literal, NotRequired, TypedDict, overload
 
 from django.conf import settings
+from django.utils.encoding import force_str
 
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
@@ -29,6 +35,9 @@ DEFAULT_RECOVERY_STRICTNESS = 10
 # How many times the length of the error window to make the recovery window
 DEFAULT_RECOVERY_WINDOW_MULTIPLIER = 2
 
+# Redis channel on which breakers using local state announce that they've been tripped
+STATE_CHANGE_CHANNEL = "circuit_breaker.state_change"
+
 
 class CircuitBreakerState(Enum):
     OK = "circuit_okay"
@@ -55,6 +64,86 @@ class CircuitBreakerConfig(TypedDict):
     # error limit) before returning to normal operation. Will be set to twice `error_limit_window`
     # if not provided.
     recovery_duration: NotRequired[int]
+    # If set, the breaker's state and remaining error quotas are cached in process memory for this
+    # many seconds, and errors are written to redis in batches - when the cached state is refreshed,
+    # or right away if they use up the cached remaining quota. Trips are broadcast so that other
+    # processes refresh their cached state immediately. Disabled (0) by default.
+    state_refresh_interval: NotRequired[int]
+
+
+@dataclass
+class _LocalState:
+    """
+    A circuit breaker's redis state, as cached in process memory.
+    """
+
+    broken_state_expiry: int | None
+    recovery_state_expiry: int | None
+    # Errors still allowed by each quota at the time the state was fetched
+    remaining_errors: dict[Quota, int]
+    refreshed_at: float
+    # Errors recorded by this process but not yet written to redis, by the quotas they count
+    # towards
+    pending_errors: dict[tuple[Quota, ...], int] = field(default_factory=lambda: defaultdict(int))
+
+    def get_state(self, now: int) -> CircuitBreakerState:
+        if self.broken_state_expiry is not None and self.broken_state_expiry > now:
+            return CircuitBreakerState.BROKEN
+        if self.recovery_state_expiry is not None and self.recovery_state_expiry > now:
+            return CircuitBreakerState.RECOVERY
+        return CircuitBreakerState.OK
+
+    def get_remaining_errors(self, quota: Quota) -> int:
+        pending = sum(count for quotas, count in self.pending_errors.items() if quota in quotas)
+        return self.remaining_errors[quota] - pending
+
+
+_local_states: dict[str, _LocalState] = {}
+_local_states_lock = threading.Lock()
+_state_change_listener_pid: int | None = None
+
+
+def _invalidate_local_state(key: str) -> None:
+    with _local_states_lock:
+        local_state = _local_states.get(key)
+        if local_state is not None:
+            local_state.refreshed_at = -math.inf
+
+
+def _ensure_state_change_listener(client: Any) -> None:
+    global _state_change_listener_pid
+
+    # Threads do not survive a fork, so (re)start the listener in every process that actually uses
+    # local state.
+    if _state_change_listener_pid == os.getpid():
+        return
+
+    with _local_states_lock:
+        if _state_change_listener_pid == os.getpid():
+            return
+        _state_change_listener_pid = os.getpid()
+
+    threading.Thread(
+        target=_listen_for_state_changes,
+        args=(client,),
+        name="circuit-breaker-state-listener",
+        daemon=True,
+    ).start()
+
+
+def _listen_for_state_changes(client: Any) -> None:
+    pid = os.getpid()
+    while _state_change_listener_pid == pid:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(STATE_CHANGE_CHANNEL)
+            for message in pubsub.listen():
+                _invalidate_local_state(force_str(message["data"]))
+        except Exception:
+            # Cached states still expire after their refresh interval, so missing a message only
+            # delays convergence
+            logger.exception("Circuit breaker state change listener failed")
+            time.sleep(1)
 
 
 class CircuitBreaker:
@@ -117,7 +206,9 @@ class CircuitBreaker:
     The `breaker.should_allow_request()` check can alternatively be used outside of `get_top_dogs`,
     to prevent calls to it. In that case, the circuit breaker must be reinstantiated with the same
     config. This works because the breaker has no state of its own, instead relying on redis-backed
-    rate limiters and redis itself to track error count and breaker status.
+    rate limiters and redis itself to track error count and breaker status. (With
+    `state_refresh_interval` set, that state is additionally cached per process, keyed by the
+    breaker's key, so it's shared by all instances using the same key.)
 
     Emits a `circuit_breaker.{self.key}.error_limit_hit` DD metic when tripped so activation can be
     easily monitored.
@@ -141,6 +232,7 @@ class CircuitBreaker:
         self.recovery_duration = config.get(
             "recovery_duration", self.window * DEFAULT_RECOVERY_WINDOW_MULTIPLIER
         )
+        self.state_refresh_interval = config.get("state_refresh_interval", 0)
 
         self.limiter = RedisSlidingWindowRateLimiter(
             cluster=settings.SENTRY_RATE_LIMIT_REDIS_CLUSTER
@@ -201,6 +293,10 @@ class CircuitBreaker:
         Record a single error towards the breaker's quota, and handle the case where that error puts
         us over the limit.
         """
+        if self.state_refresh_interval:
+            self._record_error_locally()
+            return
+
         now = int(time.time())
         state, seconds_left_in_state = self._get_state_and_remaining_time()
 
@@ -235,46 +331,63 @@ class CircuitBreaker:
         controlling_quota = self._get_controlling_quota(state)
         remaining_errors_allowed = self._get_remaining_error_quota(controlling_quota)
         if remaining_errors_allowed == 0:
-            logger.warning(
-                "Circuit breaker '%s' error limit hit",
-                self.key,
-                extra={
-                    "current_state": state,
-                    "error_limit": controlling_quota.limit,
-                    "error_limit_window": controlling_quota.window_seconds,
-                },
+            self._trip(state, controlling_quota, now)
+
+    def _trip(self, state: CircuitBreakerState, controlling_quota: Quota, now: int) -> None:
+        """
+        Switch to the BROKEN state after the given quota's error limit has been hit.
+        """
+        logger.warning(
+            "Circuit breaker '%s' error limit hit",
+            self.key,
+            extra={
+                "current_state": state,
+                "error_limit": controlling_quota.limit,
+                "error_limit_window": controlling_quota.window_seconds,
+            },
+        )
+        metrics.incr(
+            f"circuit_breaker.{self.key}.error_limit_hit",
+            sample_rate=1.0,
+            tags={"current_state": state.value},
+        )
+
+        # RECOVERY will only start after the BROKEN state has expired, so push out the RECOVERY
+        # expiry time. We'll store the expiry times as our redis values so we can determine how
+        # long we've been in a given state.
+        broken_state_timeout = self.broken_state_duration
+        recovery_state_timeout = self.broken_state_duration + self.recovery_duration
+        broken_state_expiry = now + broken_state_timeout
+        recovery_state_expiry = now + recovery_state_timeout
+
+        # Set reids keys for switching state. While they're both set (starting now) we'll be in
+        # the BROKEN state. Once `broken_state_key` expires in redis we'll switch to RECOVERY,
+        # and then once `recovery_state_key` expires we'll be back to normal.
+        try:
+            self._set_in_redis(
+                [
+                    (self.broken_state_key, broken_state_expiry, broken_state_timeout),
+                    (self.recovery_state_key, recovery_state_expiry, recovery_state_timeout),
+                ]
             )
-            metrics.incr(
-                f"circuit_breaker.{self.key}.error_limit_hit",
-                sample_rate=1.0,
-                tags={"current_state": state.value},
+
+        # If redis errors, stay in the current state
+        except Exception:
+            logger.exception(
+                "Couldn't set state-change keys in redis for circuit breaker '%s'",
+                self.key,
+                extra={"current_state": state},
             )
+            return
 
-            # RECOVERY will only start after the BROKEN state has expired, so push out the RECOVERY
-            # expiry time. We'll store the expiry times as our redis values so we can determine how
-            # long we've been in a given state.
-            broken_state_timeout = self.broken_state_duration
-            recovery_state_timeout = self.broken_state_duration + self.recovery_duration
-            broken_state_expiry = now + broken_state_timeout
-            recovery_state_expiry = now + recovery_state_timeout
-
-            # Set reids keys for switching state. While they're both set (starting now) we'll be in
-            # the BROKEN state. Once `broken_state_key` expires in redis we'll switch to RECOVERY,
-            # and then once `recovery_state_key` expires we'll be back to normal.
+        if self.state_refresh_interval:
+            _invalidate_local_state(self.key)
             try:
-                self._set_in_redis(
-                    [
-                        (self.broken_state_key, broken_state_expiry, broken_state_timeout),
-                        (self.recovery_state_key, recovery_state_expiry, recovery_state_timeout),
-                    ]
-                )
-
-            # If redis errors, stay in the current state
+                self.limiter.client.publish(STATE_CHANGE_CHANNEL, self.key)
             except Exception:
+                # Other processes will still pick up the new state on their next refresh
                 logger.exception(
-                    "Couldn't set state-change keys in redis for circuit breaker '%s'",
-                    self.key,
-                    extra={"current_state": state},
+                    "Couldn't broadcast state change for circuit breaker '%s'", self.key
                 )
 
     def should_allow_request(self) -> bool:
@@ -282,6 +395,9 @@ class CircuitBreaker:
         Determine, based on the current state of the breaker and the number of allowable errors
         remaining, whether requests should be allowed through.
         """
+        if self.state_refresh_interval:
+            return self._should_allow_request_locally()
+
         state, _ = self._get_state_and_remaining_time()
         controlling_quota = self._get_controlling_quota(state)
 
@@ -298,6 +414,130 @@ class CircuitBreaker:
 
         return True
 
+    def _should_allow_request_locally(self) -> bool:
+        local_state = self._get_local_state()
+        if local_state is None:
+            # Default to letting traffic through so the breaker doesn't become a single point of
+            # failure
+            return True
+
+        state = local_state.get_state(int(time.time()))
+        controlling_quota = self._get_controlling_quota(state)
+
+        if controlling_quota is None or local_state.get_remaining_errors(controlling_quota) <= 0:
+            metrics.incr(f"circuit_breaker.{self.key}.request_blocked")
+            return False
+
+        return True
+
+    def _record_error_locally(self) -> None:
+        """
+        Like `record_error`, but only tally the error in process memory until either the cached
+        state is refreshed or the cached remaining quota runs out, at which point the error count is
+        checked against redis.
+        """
+        local_state = self._get_local_state()
+        if local_state is None:
+            return
+
+        now = int(time.time())
+        state = local_state.get_state(now)
+        controlling_quota = self._get_controlling_quota(state)
+        if controlling_quota is None:
+            # See `record_error` - we shouldn't have made the request
+            return
+
+        quotas = (
+            (self.primary_quota, self.recovery_quota)
+            if state == CircuitBreakerState.RECOVERY
+            else (self.primary_quota,)
+        )
+        with _local_states_lock:
+            # The state may have been refreshed in the meantime
+            local_state = _local_states.get(self.key, local_state)
+            local_state.pending_errors[quotas] += 1
+            if local_state.get_remaining_errors(controlling_quota) > 0:
+                return
+            pending_errors = local_state.pending_errors
+            local_state.pending_errors = defaultdict(int)
+
+        # As far as this process knows, the limit has been hit. Write the errors and check against
+        # redis, which also accounts for errors recorded by other processes in the meantime.
+        self._write_errors(pending_errors, now)
+        if self._get_remaining_error_quota(controlling_quota) == 0:
+            self._trip(state, controlling_quota, now)
+        else:
+            _invalidate_local_state(self.key)
+
+    def _get_local_state(self) -> _LocalState | None:
+        """
+        Return the breaker's state as cached in process memory, refreshing it from redis if it's
+        older than `state_refresh_interval`. Errors recorded locally are written to redis before
+        refreshing, so they're reflected in the fresh state.
+
+        Returns None if the state can't be fetched from redis.
+        """
+        _ensure_state_change_listener(self.limiter.client)
+        refreshed_at = time.monotonic()
+
+        with _local_states_lock:
+            local_state = _local_states.get(self.key)
+            if (
+                local_state is not None
+                and refreshed_at - local_state.refreshed_at < self.state_refresh_interval
+            ):
+                return local_state
+            pending_errors: dict[tuple[Quota, ...], int] = {}
+            if local_state is not None:
+                pending_errors = local_state.pending_errors
+                local_state.pending_errors = defaultdict(int)
+
+        now = int(time.time())
+        try:
+            self._write_errors(pending_errors, now)
+            pending_errors = {}
+            broken_state_expiry, recovery_state_expiry = self._get_from_redis(
+                [self.broken_state_key, self.recovery_state_key]
+            )
+            quotas = [self.primary_quota, self.recovery_quota]
+            _, grants = self.limiter.check_within_quotas(
+                [RequestedQuota(self.key, quota.limit, [quota]) for quota in quotas], now
+            )
+        except Exception:
+            logger.exception("Couldn't get state from redis for circuit breaker '%s'", self.key)
+            # Hold on to errors which couldn't be written, to try again next time
+            if local_state is not None:
+                with _local_states_lock:
+                    for error_quotas, count in pending_errors.items():
+                        local_state.pending_errors[error_quotas] += count
+            return None
+
+        fresh_state = _LocalState(
+            broken_state_expiry=int(broken_state_expiry) if broken_state_expiry else None,
+            recovery_state_expiry=int(recovery_state_expiry) if recovery_state_expiry else None,
+            remaining_errors={quota: grant.granted for quota, grant in zip(quotas, grants)},
+            refreshed_at=refreshed_at,
+        )
+        with _local_states_lock:
+            # Errors recorded while we were talking to redis have to be written next time
+            if local_state is not None:
+                for error_quotas, count in local_state.pending_errors.items():
+                    fresh_state.pending_errors[error_quotas] += count
+            _local_states[self.key] = fresh_state
+
+        return fresh_state
+
+    def _write_errors(self, errors: dict[tuple[Quota, ...], int], now: int) -> None:
+        errors = {quotas: count for quotas, count in errors.items() if count}
+        if not errors:
+            return
+
+        self.limiter.use_quotas(
+            [RequestedQuota(self.key, count, list(quotas)) for quotas, count in errors.items()],
+            [GrantedQuota(self.key, count, []) for count in errors.values()],
+            now,
+        )
+
     def _get_from_redis(self, keys: list[str]) -> Any:
         for key in keys:
             self.redis_pipeline.get(key)
@@ -128,6 +128,15 @@ class PerformanceDetector(ABC):
     def on_complete(self) -> None:
         pass
 
+    def span_op_prefixes(self) -> tuple[str, ...] | None:
+        """
+        Lowercase prefixes of the ops of all spans the detector acts on, or `None` if it has to
+        visit every span, e.g. because other spans interrupt the sequences it looks for. When
+        detectors are run together (see `run_detectors_on_data`), spans with other ops are not
+        passed to `visit_span`.
+        """
+        return None
+
     def is_creation_allowed_for_system(self) -> bool:
         system_option = DETECTOR_TYPE_ISSUE_CREATION_TO_SYSTEM_OPTION.get(self.__class__.type, None)
 
@@ -162,6 +171,20 @@ class PerformanceDetector(ABC):
         return True
 
 
+def get_allowed_span_op_prefixes(settings_list: list[dict[str, Any]]) -> tuple[str, ...] | None:
+    """
+    Op prefixes for `PerformanceDetector.span_op_prefixes` of detectors which only act on spans
+    with their `allowed_span_ops`. Settings without allowed ops allow all spans.
+    """
+    prefixes = []
+    for settings in settings_list:
+        allowed_span_ops = settings.get("allowed_span_ops", [])
+        if not allowed_span_ops:
+            return None
+        prefixes.extend(op.lower() for op in allowed_span_ops)
+    return tuple(prefixes)
+
+
 def does_overlap_previous_span(previous_span: Span, current_span: Span):
     previous_span_ends = timedelta(seconds=previous_span.get("timestamp", 0))
     current_span_begins = timedelta(seconds=current_span.get("start_timestamp", 0))
@@ -107,6 +107,9 @@ class HTTPOverheadDetector(PerformanceDetector):
 
         recent_chain += [ProblemIndicator(span, request_delay)]
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("http.client",)
+
     def _is_span_eligible(self, span: Span) -> bool:
         span_op = span.get("op", None)
         span_data = span.get("data", {})
@@ -57,6 +57,9 @@ class BaseIOMainThreadDetector(PerformanceDetector):
             parent_span_id = span["parent_span_id"]
             self.parent_to_blocked_span[parent_span_id].append(span)
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return (self.SPAN_PREFIX,)
+
     def on_complete(self) -> None:
         for parent_span_id, span_list in self.parent_to_blocked_span.items():
             span_list = [
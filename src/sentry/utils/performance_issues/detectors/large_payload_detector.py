@@ -61,6 +61,9 @@ class LargeHTTPPayloadDetector(PerformanceDetector):
         if encoded_body_size > payload_size_threshold:
             self._store_performance_problem(span)
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("http",)
+
     def _store_performance_problem(self, span: Span) -> None:
         fingerprint = self._fingerprint(span)
         offender_span_ids = []
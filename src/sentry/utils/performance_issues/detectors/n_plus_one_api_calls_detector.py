@@ -21,6 +21,7 @@ from ..base import (
     DetectorType,
     PerformanceDetector,
     fingerprint_http_spans,
+    get_allowed_span_op_prefixes,
     get_notification_attachment_body,
     get_span_evidence_value,
     get_url_from_span,
@@ -78,6 +79,9 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
             self._maybe_store_problem()
             self.spans = [span]
 
+    def span_op_prefixes(self) -> tuple[str, ...] | None:
+        return get_allowed_span_op_prefixes([self.settings])
+
     def is_creation_allowed_for_organization(self, organization: Organization) -> bool:
         return True
 
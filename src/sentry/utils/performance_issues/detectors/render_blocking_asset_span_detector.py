@@ -124,6 +124,9 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
 
         return (end - start) * 1000
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("resource.link", "resource.script")
+
     def _is_blocking_render(self, span: Span) -> bool:
         assert self.fcp is not None
 
@@ -14,6 +14,7 @@ from ..base import (
     DetectorType,
     PerformanceDetector,
     fingerprint_span,
+    get_allowed_span_op_prefixes,
     get_notification_attachment_body,
     get_span_evidence_value,
 )
@@ -49,14 +50,14 @@ class SlowDBQueryDetector(PerformanceDetector):
         op, span_id, op_prefix, span_duration, settings = settings_for_span
         duration_threshold = settings.get("duration_threshold")
 
+        if not SlowDBQueryDetector.is_span_eligible(span):
+            return
+
         fingerprint = fingerprint_span(span)
 
         if not fingerprint:
             return
 
-        if not SlowDBQueryDetector.is_span_eligible(span):
-            return
-
         description = span.get("description", None)
         description = description.strip()
 
@@ -101,6 +102,9 @@ class SlowDBQueryDetector(PerformanceDetector):
                 ],
             )
 
+    def span_op_prefixes(self) -> tuple[str, ...] | None:
+        return get_allowed_span_op_prefixes(self.settings)
+
     def is_creation_allowed_for_organization(self, organization: Organization | None) -> bool:
         return True
 
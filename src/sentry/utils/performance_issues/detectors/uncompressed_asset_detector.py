@@ -12,6 +12,7 @@ from ..base import (
     DetectorType,
     PerformanceDetector,
     fingerprint_resource_span,
+    get_allowed_span_op_prefixes,
     get_notification_attachment_body,
     get_span_duration,
     get_span_evidence_value,
@@ -131,6 +132,9 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
         resource_span = fingerprint_resource_span(span)
         return f"1-{PerformanceUncompressedAssetsGroupType.type_id}-{resource_span}"
 
+    def span_op_prefixes(self) -> tuple[str, ...] | None:
+        return get_allowed_span_op_prefixes([self.settings])
+
     def is_creation_allowed_for_organization(self, organization: Organization) -> bool:
         return True
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import hashlib
 import logging
 import random
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from typing import Any
 
 import sentry_sdk
@@ -35,6 +35,7 @@ from .detectors.render_blocking_asset_span_detector import RenderBlockingAssetSp
 from .detectors.slow_db_query_detector import SlowDBQueryDetector
 from .detectors.uncompressed_asset_detector import UncompressedAssetSpanDetector
 from .performance_problem import PerformanceProblem
+from .types import Span
 
 PERFORMANCE_GROUP_COUNT_LIMIT = 10
 INTEGRATIONS_OF_INTEREST = [
@@ -346,11 +347,16 @@ def _detect_performance_problems(
             if detector_class.is_detector_enabled()
         ]
 
-    for detector in detectors:
-        with sentry_sdk.start_span(
-            op="function", name=f"run_detector_on_data.{detector.type.value}"
-        ):
-            run_detector_on_data(detector, data)
+    fused_rate = options.get("performance.issues.fused-detection")
+    if fused_rate and fused_rate > random.random():
+        with sentry_sdk.start_span(op="function", name="run_detectors_on_data"):
+            run_detectors_on_data(detectors, data)
+    else:
+        for detector in detectors:
+            with sentry_sdk.start_span(
+                op="function", name=f"run_detector_on_data.{detector.type.value}"
+            ):
+                run_detector_on_data(detector, data)
 
     with sentry_sdk.start_span(op="function", name="report_metrics_for_detectors"):
         # Metrics reporting only for detection, not created issues.
@@ -409,6 +415,37 @@ def run_detector_on_data(detector: PerformanceDetector, data: dict[str, Any]) ->
     detector.on_complete()
 
 
+def run_detectors_on_data(detectors: Sequence[PerformanceDetector], data: dict[str, Any]) -> None:
+    """
+    Equivalent to `run_detector_on_data` for every detector, but walks the spans of the event only
+    once. Each span is only passed to the detectors whose `span_op_prefixes` match its op.
+    """
+    detectors = [detector for detector in detectors if detector.is_event_eligible(data)]
+    op_prefixes = [(detector.visit_span, detector.span_op_prefixes()) for detector in detectors]
+
+    # Events have few distinct ops, so the detectors interested in each op are only looked up once
+    visitors_by_op: dict[str | None, list[Callable[[Span], None]]] = {}
+    for span in data.get("spans", []):
+        op = span.get("op")
+        if not isinstance(op, str):
+            op = None
+
+        visitors = visitors_by_op.get(op)
+        if visitors is None:
+            lower_op = op.lower() if op else ""
+            visitors = visitors_by_op[op] = [
+                visit_span
+                for visit_span, prefixes in op_prefixes
+                if prefixes is None or (lower_op and lower_op.startswith(prefixes))
+            ]
+
+        for visit_span in visitors:
+            visit_span(span)
+
+    for detector in detectors:
+        detector.on_complete()
+
+
 # Reports metrics and creates spans for detection
 def report_metrics_for_detectors(
     event: dict[str, Any],
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import dataclasses
 import functools
+import itertools
 import logging
 import os
 import re
+import threading
 import time
 from collections import namedtuple
-from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable, Collection, Generator, Mapping, MutableMapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
@@ -16,15 +18,17 @@ from hashlib import sha1
 from typing import Any
 from urllib.parse import urlparse
 
+import orjson
 import sentry_sdk
 import sentry_sdk.scope
 import urllib3
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
-from django.core.cache import cache
 from snuba_sdk import DeleteQuery, MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
+from sentry.features.rollout import in_random_rollout
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -40,6 +44,7 @@ from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.snuba_query_cache import QueryFlight, query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -531,9 +536,13 @@ _snuba_pool = connection_from_url(
         allowed_methods={"GET", "POST", "DELETE"},
     ),
     timeout=settings.SENTRY_SNUBA_TIMEOUT,
-    maxsize=10,
+    maxsize=settings.SENTRY_SNUBA_QUERY_THREADS,
 )
-_query_thread_pool = ThreadPoolExecutor(max_workers=10)
+_query_thread_pool = ThreadPoolExecutor(max_workers=settings.SENTRY_SNUBA_QUERY_THREADS)
+
+# (referrer, limit) -> semaphore, see `_referrer_concurrency_limit`
+_referrer_semaphores: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+_referrer_semaphores_lock = threading.Lock()
 
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
@@ -1043,14 +1052,63 @@ def bulk_raw_query(
     return _apply_cache_and_build_results(snuba_requests, use_cache=use_cache)
 
 
-def get_cache_key(query: Request) -> str:
+_DATETIME_LITERAL_RE = re.compile(r"toDateTime\('([^']+)'\)")
+
+
+def get_cache_key(query: Request, time_bucket_seconds: int = 0) -> str:
+    """
+    :param time_bucket_seconds: If set, queries over time windows ending at about the current time
+        are shifted back to the start of a bucket of this many seconds (at most an hour), so that
+        queries over sliding time windows share a key for the duration of a bucket. Queries over
+        windows ending in the past keep their exact timestamps.
+    """
     if isinstance(query, Request):
         hashable = str(query)
+        if time_bucket_seconds:
+            hashable = _quantize_datetime_literals(hashable, time_bucket_seconds)
     else:
         hashable = json.dumps(query)
 
-    # sqc - Snuba Query Cache
-    return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+    # sqc - Snuba Query Cache, the version changes along with the format of cached values
+    return f"sqc:2:{sha1(hashable.encode('utf-8')).hexdigest()}"
+
+
+def _parse_datetime_literal(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _quantize_datetime_literals(query: str, duration: int) -> str:
+    values = [
+        value
+        for match in _DATETIME_LITERAL_RE.finditer(query)
+        if (value := _parse_datetime_literal(match.group(1))) is not None
+    ]
+    if not values:
+        return query
+
+    # Only windows ending now slide. Windows ending in the past are absolute and different ones
+    # must never share a key.
+    end = max(values)
+    if abs(datetime.now(timezone.utc) - end) > timedelta(seconds=duration):
+        return query
+
+    # Jitter the buckets by the rest of the query so that not all keys change at once
+    key_hash = int(sha1(_DATETIME_LITERAL_RE.sub("", query).encode("utf-8")).hexdigest()[:8], 16)
+    # All timestamps are shifted by the same amount, which keeps the length of the window and the
+    # offsets between timestamps in the key
+    shift = end - quantize_time(end, key_hash, duration)
+
+    def quantize(match: re.Match[str]) -> str:
+        value = _parse_datetime_literal(match.group(1))
+        if value is None:
+            return match.group(0)
+        return f"toDateTime('{(value - shift).isoformat()}')"
+
+    return _DATETIME_LITERAL_RE.sub(quantize, query)
 
 
 def _apply_cache_and_build_results(
@@ -1071,33 +1129,58 @@ def _apply_cache_and_build_results(
     results = []
 
     to_query: list[tuple[int, SnubaRequest, str | None]] = []
+    # Queries which are already being run by another thread
+    to_wait_for: list[tuple[int, SnubaRequest, str, QueryFlight]] = []
+    # Cache keys of the queries this thread runs on behalf of others
+    led_flights: set[str] = set()
 
     if use_cache:
+        time_bucket_seconds = options.get("snuba.query-cache.time-bucket-seconds")
         cache_keys = [
-            get_cache_key(snuba_request.request) for _, snuba_request in snuba_requests_list
+            get_cache_key(snuba_request.request, time_bucket_seconds)
+            for _, snuba_request in snuba_requests_list
         ]
-        cache_data = cache.get_many(cache_keys)
+        cache_data = query_cache.get_many(cache_keys)
         for (query_pos, snuba_request), cache_key in zip(snuba_requests_list, cache_keys):
             cached_result = cache_data.get(cache_key)
             metric_tags = {"referrer": snuba_request.referrer} if snuba_request.referrer else None
             if cached_result is None:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
-                to_query.append((query_pos, snuba_request, cache_key))
+                flight, is_leader = query_cache.start_or_join_flight(cache_key)
+                if is_leader:
+                    led_flights.add(cache_key)
+                    to_query.append((query_pos, snuba_request, cache_key))
+                else:
+                    to_wait_for.append((query_pos, snuba_request, cache_key, flight))
             else:
                 metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+                results.append((query_pos, cached_result))
     else:
         for query_pos, snuba_request in snuba_requests_list:
             to_query.append((query_pos, snuba_request, None))
 
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query])
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+    try:
+        if to_query:
+            results.extend(_query_and_cache(to_query, led_flights))
+    finally:
+        # Let threads waiting on queries which failed run them on their own
+        for cache_key in led_flights:
+            query_cache.land_flight(cache_key, None)
+
+    if to_wait_for:
+        to_retry: list[tuple[int, SnubaRequest, str | None]] = []
+        for query_pos, snuba_request, cache_key, flight in to_wait_for:
+            result = flight.wait(settings.SENTRY_SNUBA_TIMEOUT)
+            if result is None:
+                to_retry.append((query_pos, snuba_request, cache_key))
+            else:
+                metrics.incr(
+                    "snuba.query_cache.coalesced",
+                    tags={"referrer": snuba_request.referrer} if snuba_request.referrer else None,
                 )
-            results.append((query_pos, result))
+                results.append((query_pos, result))
+        if to_retry:
+            results.extend(_query_and_cache(to_retry, set()))
 
     # Sort so that we get the results back in the original param list order
     results.sort()
@@ -1105,6 +1188,21 @@ def _apply_cache_and_build_results(
     return [result[1] for result in results]
 
 
+def _query_and_cache(
+    to_query: Sequence[tuple[int, SnubaRequest, str | None]], led_flights: set[str]
+) -> list[tuple[int, Any]]:
+    results = []
+    query_results = _bulk_snuba_query([item[1] for item in to_query])
+    for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
+        if opt_cache_key:
+            value = query_cache.set(opt_cache_key, result, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+            if opt_cache_key in led_flights:
+                led_flights.discard(opt_cache_key)
+                query_cache.land_flight(opt_cache_key, value)
+        results.append((query_pos, result))
+    return results
+
+
 def _is_rejected_query(body: Any) -> bool:
     return (
         "quota_allowance" in body
@@ -1120,37 +1218,45 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
     with sentry_sdk.start_span(op="snuba_query") as span:
         span.set_tag("snuba.num_queries", len(snuba_requests_list))
 
+        referrers = [
+            snuba_request.headers.get("referer", "unknown") for snuba_request in snuba_requests_list
+        ]
         if len(snuba_requests_list) > 1:
-            query_results = list(
-                _query_thread_pool.map(
-                    _snuba_query,
-                    [
+            query_results = _run_concurrently(
+                _snuba_query,
+                [
+                    (
+                        sentry_sdk.Scope.get_isolation_scope(),
+                        sentry_sdk.Scope.get_current_scope(),
+                        snuba_request,
+                    )
+                    for snuba_request in snuba_requests_list
+                ],
+                referrers,
+            )
+        else:
+            # No need to submit to the thread pool if we're just performing a single query
+            with _referrer_concurrency_limit(referrers[0]):
+                query_results = [
+                    _snuba_query(
                         (
                             sentry_sdk.Scope.get_isolation_scope(),
                             sentry_sdk.Scope.get_current_scope(),
-                            snuba_request,
+                            snuba_requests_list[0],
                         )
-                        for snuba_request in snuba_requests_list
-                    ],
-                )
-            )
-        else:
-            # No need to submit to the thread pool if we're just performing a single query
-            query_results = [
-                _snuba_query(
-                    (
-                        sentry_sdk.Scope.get_isolation_scope(),
-                        sentry_sdk.Scope.get_current_scope(),
-                        snuba_requests_list[0],
                     )
-                )
-            ]
+                ]
 
         results = []
         for index, item in enumerate(query_results):
             referrer, response, _, reverse = item
+            # Responses are read and decoded whole, the decoder needs the complete body and
+            # the results are returned as a single payload anyway.
             try:
-                body = json.loads(response.data)
+                if in_random_rollout("snuba.response.decode-orjson"):
+                    body = orjson.loads(response.data)
+                else:
+                    body = json.loads(response.data)
                 if SNUBA_INFO:
                     if "sql" in body:
                         log_snuba_info(
@@ -1236,6 +1342,101 @@ def _log_request_query(req: Request) -> None:
 RawResult = tuple[str, urllib3.response.HTTPResponse, Translator, Translator]
 
 
+def _run_concurrently(
+    fn: Callable[[Any], RawResult],
+    params: Sequence[Any],
+    referrers: Sequence[str] | None = None,
+) -> list[RawResult]:
+    """
+    Call `fn` with each of `params` on the query thread pool, and return the results in order.
+
+    At most `snuba.bulk-query.max-concurrency` calls are in flight at a time, so that a single
+    caller can't occupy the whole pool. As soon as one call fails, calls which haven't started yet
+    are cancelled and the error is raised, rather than waiting for queries whose results would be
+    thrown away.
+
+    If `referrers` are given, the concurrency limit of each call's referrer is acquired before it
+    is submitted, see `_acquire_referrer_slot`.
+
+    Calls are only cancelled when an exception is raised in the calling thread, e.g. by a task's
+    soft time limit. An aborted HTTP request can't be observed by the web worker while it waits
+    for its queries, so their results are still collected in that case.
+    """
+    max_concurrency = (
+        options.get("snuba.bulk-query.max-concurrency") or settings.SENTRY_SNUBA_QUERY_THREADS
+    )
+    results: list[RawResult | None] = [None] * len(params)
+    queued = iter(enumerate(params))
+    pending: dict[Future[RawResult], int] = {}
+
+    def submit(count: int) -> None:
+        for index, param in itertools.islice(queued, count):
+            semaphore = _acquire_referrer_slot(referrers[index]) if referrers else None
+            try:
+                future = _query_thread_pool.submit(fn, param)
+            except BaseException:
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+            if semaphore is not None:
+                # Released when the call finishes or is cancelled, whether or not its result
+                # has been collected yet.
+                future.add_done_callback(lambda _, semaphore=semaphore: semaphore.release())
+            pending[future] = index
+
+    try:
+        submit(max_concurrency)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            submit(len(done))
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+
+    return results  # type: ignore[return-value]
+
+
+def _acquire_referrer_slot(referrer: str) -> threading.BoundedSemaphore | None:
+    """
+    Acquire a slot of the concurrency limit configured for the referrer in the
+    `snuba.referrer-concurrency-limits` option, waiting for at most the Snuba timeout. Returns the
+    semaphore to release once the query finished, or None if the referrer isn't limited.
+
+    Slots are acquired by the thread which issues the query, before it is submitted to the query
+    thread pool. Queries waiting for a slot therefore never hold a worker of the shared pool.
+    """
+    limit = options.get("snuba.referrer-concurrency-limits").get(referrer)
+    if not limit:
+        return None
+
+    with _referrer_semaphores_lock:
+        semaphore = _referrer_semaphores.get((referrer, limit))
+        if semaphore is None:
+            semaphore = _referrer_semaphores[(referrer, limit)] = threading.BoundedSemaphore(limit)
+
+    if not semaphore.acquire(timeout=settings.SENTRY_SNUBA_TIMEOUT):
+        metrics.incr("snuba.referrer_concurrency_limit.exceeded", tags={"referrer": referrer})
+        raise QueryTooManySimultaneous(f"Too many concurrent queries for referrer {referrer}")
+    return semaphore
+
+
+@contextmanager
+def _referrer_concurrency_limit(referrer: str) -> Generator[None]:
+    """
+    Bound the number of queries this process runs concurrently for the given referrer, see
+    `_acquire_referrer_slot`.
+    """
+    semaphore = _acquire_referrer_slot(referrer)
+    try:
+        yield
+    finally:
+        if semaphore is not None:
+            semaphore.release()
+
+
 def _snuba_query(
     params: tuple[
         sentry_sdk.Scope,
@@ -1264,26 +1465,13 @@ def _snuba_query(
                 sentry_sdk.set_tag("query.referrer", referrer)
 
                 if isinstance(request.query, MetricsQuery):
-                    return (
-                        referrer,
-                        _raw_mql_query(request, headers),
-                        snuba_request.forward,
-                        snuba_request.reverse,
-                    )
+                    response = _raw_mql_query(request, headers)
                 elif isinstance(request.query, DeleteQuery):
-                    return (
-                        referrer,
-                        _raw_delete_query(request, headers),
-                        snuba_request.forward,
-                        snuba_request.reverse,
-                    )
+                    response = _raw_delete_query(request, headers)
+                else:
+                    response = _raw_snql_query(request, headers)
 
-                return (
-                    referrer,
-                    _raw_snql_query(request, headers),
-                    snuba_request.forward,
-                    snuba_request.reverse,
-                )
+                return (referrer, response, snuba_request.forward, snuba_request.reverse)
             except urllib3.exceptions.HTTPError as err:
                 raise SnubaError(err)
 
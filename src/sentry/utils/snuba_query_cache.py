@@ -0,0 +1,181 @@
+"""
+Result cache for Snuba queries, used by `sentry.utils.snuba` when queries are made with
+`use_cache=True`.
+
+Results are cached in two tiers: a small process-local LRU in front of the shared Django cache.
+Both tiers hold results in a compact serialized form (msgpack, zstd-compressed), so every hit is
+decoded into fresh objects that callers are free to mutate.
+
+Identical queries which are already running in another thread of the same process are not sent
+to Snuba again. Instead the first thread to run a query leads a "flight" for its cache key, and
+other threads join it and wait for its result.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from time import monotonic
+from typing import Any
+
+import msgpack
+import zstandard
+from django.core.cache import cache
+
+from sentry import options
+from sentry.utils import json, metrics
+
+# Serialization formats, stored as the first byte of cached values
+FORMAT_MSGPACK = b"\x01"
+FORMAT_JSON = b"\x02"
+
+
+def serialize_result(result: Any) -> bytes:
+    try:
+        fmt, payload = FORMAT_MSGPACK, msgpack.packb(result)
+    except (TypeError, ValueError, OverflowError):
+        # msgpack can't represent everything JSON can, e.g. integers wider than 64 bits
+        fmt, payload = FORMAT_JSON, json.dumps(result).encode("utf-8")
+    return fmt + zstandard.compress(payload)
+
+
+def deserialize_result(value: bytes) -> Any:
+    fmt, payload = value[:1], zstandard.decompress(value[1:])
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.unpackb(payload, strict_map_key=False)
+    elif fmt == FORMAT_JSON:
+        return json.loads(payload)
+    raise ValueError(f"unknown snuba result format: {fmt!r}")
+
+
+class QueryFlight:
+    """
+    A query which is being run by one thread on behalf of all threads asking for the same result.
+    """
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._value: bytes | None = None
+
+    def wait(self, timeout: float) -> Any | None:
+        """
+        Wait for the leading thread to finish the query, and return its result. Returns `None` if
+        the query failed or didn't finish in time, in which case the caller has to run it itself.
+        """
+        if not self._done.wait(timeout) or self._value is None:
+            return None
+        return deserialize_result(self._value)
+
+    def _land(self, value: bytes | None) -> None:
+        self._value = value
+        self._done.set()
+
+
+class SnubaQueryCache:
+    """
+    The local tier is bounded by the total size of the serialized results it holds, configured
+    through the `snuba.query-cache.local-max-bytes` option (0 disables it). Local entries expire
+    after `snuba.query-cache.local-ttl` seconds at the latest, so a result is never served for much
+    longer than the shared cache would have served it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key -> (serialized result, expires at)
+        self._local: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._local_size = 0
+        self._flights: dict[str, QueryFlight] = {}
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, Any]:
+        found: dict[str, bytes] = {}
+        for key in keys:
+            value = self._get_local(key)
+            if value is not None:
+                found[key] = value
+
+        if len(found) < len(keys):
+            local_ttl = options.get("snuba.query-cache.local-ttl")
+            shared = cache.get_many([key for key in keys if key not in found])
+            for key, value in shared.items():
+                if value is None:
+                    continue
+                found[key] = value
+                self._set_local(key, value, local_ttl)
+
+        return {key: deserialize_result(value) for key, value in found.items()}
+
+    def set(self, key: str, result: Any, ttl: int) -> bytes:
+        """
+        Cache a result in both tiers, and return it serialized.
+        """
+        value = serialize_result(result)
+        metrics.distribution("snuba.query_cache.result_size", len(value), unit="byte")
+        cache.set(key, value, ttl)
+        self._set_local(key, value, min(ttl, options.get("snuba.query-cache.local-ttl")))
+        return value
+
+    def start_or_join_flight(self, key: str) -> tuple[QueryFlight, bool]:
+        """
+        Return the flight for the given key, and whether the calling thread leads it. The leading
+        thread has to run the query, and then call `land_flight`, also if the query failed.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = QueryFlight()
+            return flight, True
+
+    def land_flight(self, key: str, value: bytes | None) -> None:
+        """
+        Hand the serialized result of a query, or `None` if it failed, to all threads which joined
+        its flight.
+        """
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight._land(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._local_size = 0
+
+    def _get_local(self, key: str) -> bytes | None:
+        if options.get("snuba.query-cache.local-max-bytes") <= 0:
+            return None
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= monotonic():
+                self._remove_local(key)
+                return None
+            self._local.move_to_end(key)
+
+        metrics.incr("snuba.query_cache.local_hit")
+        return value
+
+    def _set_local(self, key: str, value: bytes, ttl: float) -> None:
+        max_bytes = options.get("snuba.query-cache.local-max-bytes")
+        if max_bytes <= 0 or ttl <= 0 or len(value) > max_bytes:
+            return
+
+        with self._lock:
+            self._remove_local(key)
+            self._local[key] = (value, monotonic() + ttl)
+            self._local_size += len(value)
+            while self._local_size > max_bytes:
+                _, (evicted, _) = self._local.popitem(last=False)
+                self._local_size -= len(evicted)
+
+    def _remove_local(self, key: str) -> None:
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._local_size -= len(entry[0])
+
+
+query_cache = SnubaQueryCache()
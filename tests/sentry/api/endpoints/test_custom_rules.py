@@ -11,6 +11,7 @@ from sentry.api.endpoints.custom_rules import (
     get_rule_condition,
 )
 from sentry.models.dynamicsampling import CUSTOM_RULE_DATE_FORMAT, CustomDynamicSamplingRule
+from sentry.relay.config.sections import SAMPLING
 from sentry.testutils.cases import APITestCase, TestCase
 
 
@@ -301,10 +302,12 @@ class CustomRulesEndpoint(APITestCase):
 
         assert resp.status_code == 200
 
-        mock_invalidate_project_config.assert_any_call(trigger=mock.ANY, project_id=self.project.id)
+        mock_invalidate_project_config.assert_any_call(
+            trigger=mock.ANY, project_id=self.project.id, sections=[SAMPLING]
+        )
 
         mock_invalidate_project_config.assert_any_call(
-            trigger=mock.ANY, project_id=self.second_project.id
+            trigger=mock.ANY, project_id=self.second_project.id, sections=[SAMPLING]
         )
 
     @mock.patch("sentry.api.endpoints.custom_rules.schedule_invalidate_project_config")
@@ -324,7 +327,7 @@ class CustomRulesEndpoint(APITestCase):
         assert resp.status_code == 200
 
         mock_invalidate_project_config.assert_called_once_with(
-            trigger=mock.ANY, organization_id=self.organization.id
+            trigger=mock.ANY, organization_id=self.organization.id, sections=[SAMPLING]
         )
 
 
@@ -14,12 +14,14 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    _parse_search_tree,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.utils import json
 
 fixture_path = "fixtures/search-syntax"
@@ -739,3 +741,44 @@ def test_search_value_classify_and_format_wildcard(value, expected_kind, expecte
     kind = search_value.classify_wildcard()
     assert kind == expected_kind
     assert search_value.format_wildcard(kind) == expected_value
+
+
+def test_parse_search_query_reuses_tree():
+    _parse_search_tree.cache_clear()
+    query = "user.email:foo@example.com release:1.2.1"
+
+    expected = parse_search_query(query)
+    assert parse_search_query(query) == expected
+    assert _parse_search_tree.cache_info().hits == 1
+
+    # The cached tree is shared by parses using a different config
+    with pytest.raises(InvalidSearchQuery):
+        parse_search_query(query, config_overrides={"blocked_keys": {"release"}})
+    assert _parse_search_tree.cache_info().hits == 2
+
+
+@pytest.mark.parametrize("query", ["", " ", "   "])
+def test_parse_search_query_empty(query):
+    _parse_search_tree.cache_clear()
+    assert parse_search_query(query) == []
+    assert _parse_search_tree.cache_info().misses == 0
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_benchmark_parse_search_query(cached, benchmark):
+    queries = []
+    for file in sorted(os.listdir(abs_fixtures_path)):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            queries.extend(case["query"] for case in json.load(fp))
+
+    def parse_all():
+        if not cached:
+            _parse_search_tree.cache_clear()
+        for query in queries:
+            try:
+                parse_search_query(query)
+            except InvalidSearchQuery:
+                pass
+
+    benchmark(parse_all)
@@ -1,6 +1,9 @@
 import copy
+from unittest import mock
 
-from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+import pytest
+
+from sentry.attachments.base import BaseAttachmentCache, CachedAttachment, MissingAttachmentChunks
 
 
 class InMemoryCache:
@@ -18,6 +21,12 @@ class InMemoryCache:
         assert key not in self.raw_map or raw == self.raw_map[key]
         return copy.deepcopy(self.data.get(key))
 
+    def get_many(self, keys, raw=False):
+        return [self.get(key, raw=raw) for key in keys]
+
+    def exists_many(self, keys):
+        return [key in self.data for key in keys]
+
     def set(self, key, value, timeout=None, raw=False):
         # Attachment chunks MUST be bytestrings. Josh please don't change this
         # to unicode.
@@ -128,3 +137,41 @@ def test_basic_rate_limited():
     assert att2.id == att.id == 0
     assert att2.data == att.data == b"Hello World! Bye."
     assert att2.rate_limited is True
+
+
+def test_stream_chunked():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    for chunk_index in range(20):
+        cache.set_chunk("c:foo", 123, chunk_index, b"%d," % chunk_index)
+
+    att = cache.get_from_chunks(key="c:foo", id=123, chunks=20)
+    with mock.patch.object(data, "get_many", wraps=data.get_many) as get_many:
+        assert list(att.stream_data()) == [b"%d," % i for i in range(20)]
+
+    # Chunks are fetched in batches
+    assert [len(call.args[0]) for call in get_many.call_args_list] == [8, 8, 4]
+    assert att.data == b"".join(b"%d," % i for i in range(20))
+
+
+def test_stream_missing_chunks():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+    cache.set_chunk("c:foo", 123, 2, b"Bye.")
+
+    att = cache.get_from_chunks(key="c:foo", id=123, chunks=3)
+    assert not att.has_data()
+    with pytest.raises(MissingAttachmentChunks):
+        list(att.stream_data())
+
+    cache.set_chunk("c:foo", 123, 1, b"Just visiting. ")
+    assert att.has_data()
+
+
+def test_stream_initial_data():
+    att = CachedAttachment(name="lol.txt", data=b"Hello World! Bye.")
+    assert att.has_data()
+    assert list(att.stream_data()) == [b"Hello World! Bye."]
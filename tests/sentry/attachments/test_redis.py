@@ -17,6 +17,30 @@ class FakeClient:
     def get(self, key):
         return self.data[key]
 
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def get(self, key):
+        self.results.append(self.client.data.get(key))
+
+    def exists(self, key):
+        self.results.append(int(key in self.client.data))
+
+    def execute(self):
+        return self.results
+
 
 @pytest.fixture
 def mock_client():
@@ -70,4 +94,8 @@ def test_chunked(mocked_attachment_cache, mock_client):
         "name": "foo.txt",
         "content_type": "text/plain",
     }
+    assert attachment.has_data()
     assert attachment.data == b"Hello World! This attachment is chunked up."
+
+    del mock_client.data[KEY_FMT % "foo:a:0:1"]
+    assert not attachment.has_data()
@@ -0,0 +1,71 @@
+from unittest import mock
+
+import pytest
+
+from sentry import options
+from sentry.buffer.aggregating import AggregatingRedisBuffer
+from sentry.buffer.base import BufferIncrement
+from sentry.utils.redis import get_cluster_routing_client
+
+
+class TestAggregatingRedisBuffer:
+    @pytest.fixture(params=["cluster", "blaster"])
+    def buffer(self, set_sentry_option, request):
+        value = options.get("redis.clusters")
+        value["default"]["is_redis_cluster"] = request.param == "cluster"
+        set_sentry_option("redis.clusters", value)
+        return AggregatingRedisBuffer(aggregate_max_keys=2, aggregate_background_flush=False)
+
+    @pytest.fixture(autouse=True)
+    def setup_buffer(self, buffer):
+        self.buf = buffer
+        self.model = mock.Mock()
+        self.model.__name__ = "Mock"
+
+    def _pending_keys(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        return client.zrange("b:p", 0, -1)
+
+    def test_incr_aggregates_locally(self):
+        filters = {"pk": 1}
+        self.buf.incr(self.model, {"times_seen": 1}, filters)
+        self.buf.incr(self.model, {"times_seen": 2}, filters)
+
+        assert self._pending_keys() == []
+        assert self.buf.get(self.model, ["times_seen"], filters=filters) == {"times_seen": 3}
+
+        self.buf.flush_local()
+        assert len(self._pending_keys()) == 1
+        assert self.buf.get(self.model, ["times_seen"], filters=filters) == {"times_seen": 3}
+
+    def test_flushes_when_full(self):
+        self.buf.incr_many(
+            [
+                BufferIncrement(self.model, {"times_seen": 1}, {"pk": 1}),
+                BufferIncrement(self.model, {"times_seen": 1}, {"pk": 2}),
+            ]
+        )
+        assert len(self._pending_keys()) == 2
+        assert self.buf._pending == {}
+
+    def test_flushes_when_old(self):
+        self.buf.aggregate_max_age = 10
+        with mock.patch("sentry.buffer.aggregating.monotonic", return_value=100):
+            self.buf.incr(self.model, {"times_seen": 1}, {"pk": 1})
+        assert self._pending_keys() == []
+
+        with mock.patch("sentry.buffer.aggregating.monotonic", return_value=111):
+            self.buf.incr(self.model, {"times_seen": 1}, {"pk": 1})
+        assert len(self._pending_keys()) == 1
+        assert self.buf.get(self.model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 2}
+
+    @mock.patch("sentry.buffer.aggregating.metrics")
+    def test_records_lost_increments(self, mock_metrics):
+        self.buf.incr(self.model, {"times_seen": 1}, {"pk": 1})
+        with mock.patch("sentry.buffer.redis.RedisBuffer.incr_many", side_effect=Exception("boom")):
+            self.buf._flush_at_exit()
+
+        mock_metrics.incr.assert_any_call(
+            "buffer.aggregate.lost", amount=1, tags={"reason": "error"}
+        )
+        assert self.buf._pending == {}
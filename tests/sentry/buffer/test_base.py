@@ -4,7 +4,7 @@ from unittest import mock
 from django.utils import timezone
 from pytest import raises
 
-from sentry.buffer.base import Buffer
+from sentry.buffer.base import Buffer, BufferIncrement
 from sentry.db import models
 from sentry.models.group import Group
 from sentry.models.organization import Organization
@@ -30,6 +30,38 @@ class BufferTest(TestCase):
         kwargs = dict(model=model, columns=columns, filters=filters, extra=None, signal_only=None)
         process_incr.apply_async.assert_called_once_with(kwargs=kwargs, headers=mock.ANY)
 
+    @mock.patch("sentry.buffer.base.process_incr")
+    def test_incr_many_delays_task_per_increment(self, process_incr):
+        model = mock.Mock()
+        self.buf.incr_many(
+            [
+                BufferIncrement(model, {"times_seen": 1}, {"id": 1}),
+                BufferIncrement(model, {"times_seen": 2}, {"id": 2}, signal_only=True),
+            ]
+        )
+        assert process_incr.apply_async.mock_calls == [
+            mock.call(
+                kwargs=dict(
+                    model=model,
+                    columns={"times_seen": 1},
+                    filters={"id": 1},
+                    extra=None,
+                    signal_only=None,
+                ),
+                headers=mock.ANY,
+            ),
+            mock.call(
+                kwargs=dict(
+                    model=model,
+                    columns={"times_seen": 2},
+                    filters={"id": 2},
+                    extra=None,
+                    signal_only=True,
+                ),
+                headers=mock.ANY,
+            ),
+        ]
+
     def test_process_saves_data(self):
         group = Group.objects.create(project=Project(id=1))
         columns = {"times_seen": 1}
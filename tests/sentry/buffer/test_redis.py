@@ -9,6 +9,7 @@ import pytest
 from django.utils import timezone
 
 from sentry import options
+from sentry.buffer.base import BufferIncrement
 from sentry.buffer.redis import (
     BufferHookEvent,
     RedisBuffer,
@@ -66,6 +67,69 @@ class TestRedisBuffer:
         client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
         assert client.zrange("b:p", 0, -1) == []
 
+    @mock.patch("sentry.buffer.redis.process_incr")
+    def test_process_pending_sharded(self, process_incr):
+        self.buf.pending_shards = 4
+        self.buf.incr_batch_size = 10
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        keys_by_shard = defaultdict(list)
+        for pk in range(20):
+            self.buf.incr(model, {"times_seen": 1}, {"pk": pk})
+            key = self.buf._make_key(model, {"pk": pk})
+            keys_by_shard[self.buf._get_pending_shard(key)].append(key)
+        assert len(keys_by_shard) > 1
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        shard, keys = next(iter(keys_by_shard.items()))
+        self.buf.process_pending(shard=shard)
+
+        batch_keys = [
+            key
+            for c in process_incr.apply_async.mock_calls
+            for key in c.kwargs["kwargs"]["batch_keys"]
+        ]
+        assert sorted(batch_keys) == sorted(keys)
+        assert client.zrange(self.buf._make_pending_key(shard), 0, -1) == []
+        for other_shard, other_keys in keys_by_shard.items():
+            if other_shard != shard:
+                assert len(client.zrange(self.buf._make_pending_key(other_shard), 0, -1)) == len(
+                    other_keys
+                )
+
+        process_incr.reset_mock()
+        self.buf.process_pending()
+        assert sum(
+            len(c.kwargs["kwargs"]["batch_keys"]) for c in process_incr.apply_async.mock_calls
+        ) == (20 - len(keys))
+
+    @mock.patch("sentry.buffer.redis.process_incr")
+    def test_process_pending_after_reducing_shards(self, process_incr):
+        self.buf.pending_shards = 4
+        self.buf.incr_batch_size = 10
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.process_pending()
+        keys = []
+        for pk in range(20):
+            self.buf.incr(model, {"times_seen": 1}, {"pk": pk})
+            keys.append(self.buf._make_key(model, {"pk": pk}))
+        assert any(self.buf._get_pending_shard(key) >= 2 for key in keys)
+
+        self.buf.pending_shards = 2
+        self.buf.process_pending(shard=1)
+        self.buf.process_pending(shard=0)
+
+        batch_keys = [
+            key
+            for c in process_incr.apply_async.mock_calls
+            for key in c.kwargs["kwargs"]["batch_keys"]
+        ]
+        assert sorted(batch_keys) == sorted(keys)
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        for shard in range(4):
+            assert client.zrange(self.buf._make_pending_key(shard), 0, -1) == []
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     def test_process_pending_multiple_batches(self, process_incr):
@@ -209,6 +273,49 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    def test_incr_many_coalesces(self):
+        now = datetime.datetime(2017, 5, 3, 6, 6, 6, tzinfo=datetime.UTC)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1}
+        other_filters = {"pk": 2}
+        self.buf.incr_many(
+            [
+                BufferIncrement(model, {"times_seen": 1}, filters, extra={"foo": "bar"}),
+                BufferIncrement(model, {"times_seen": 2}, other_filters),
+                BufferIncrement(model, {"times_seen": 3}, filters, extra={"foo": "baz"}),
+                BufferIncrement(model, {}, filters, extra={"datetime": now}, signal_only=True),
+            ]
+        )
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 4}
+        assert self.buf.get(model, ["times_seen"], filters=other_filters) == {"times_seen": 2}
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        key = self.buf._make_key(model, filters=filters)
+        result = _hgetall_decode_keys(client, key, self.buf.is_redis_cluster)
+        if self.buf.is_redis_cluster:
+
+            def load_value(x):
+                return self.buf._load_value(json.loads(x))
+
+        else:
+            load_value = pickle.loads
+        assert load_value(result["e+foo"]) == "baz"
+        assert load_value(result["e+datetime"]) == now
+        assert result["s"] in ("1", b"1")
+
+        pending = client.zrange("b:p", 0, -1)
+        other_key = self.buf._make_key(model, filters=other_filters)
+        if self.buf.is_redis_cluster:
+            assert sorted(pending) == sorted([key, other_key])
+        else:
+            assert sorted(pending) == sorted([key.encode("utf-8"), other_key.encode("utf-8")])
+
+    def test_incr_many_empty(self):
+        self.buf.incr_many([])
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+
     def group_rule_data_by_project_id(self, buffer, project_ids):
         project_ids_to_rule_data = defaultdict(list)
         for proj_id in project_ids:
@@ -1,21 +1,36 @@
+import os
+
 import pytest
 
+from sentry.grouping.parameterization import Parameterizer, _parametrize_w_regex_cached
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
 from tests.sentry.grouping import GROUPING_INPUTS_DIR, GroupingInput, get_grouping_inputs
 
 GROUPING_INPUTS = get_grouping_inputs(GROUPING_INPUTS_DIR)
 
-
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
+PARAMETERIZATION_MESSAGES_PATH = os.path.join(
+    os.path.dirname(__file__), "parameterization_inputs", "messages.txt"
+)
+PARAMETERIZATION_PATTERN_KEYS = (
+    "email",
+    "url",
+    "hostname",
+    "ip",
+    "uuid",
+    "sha1",
+    "md5",
+    "date",
+    "duration",
+    "hex",
+    "float",
+    "int",
+    "quoted_str",
+    "bool",
+)
 
 
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name",
     sorted(CONFIGURATIONS.keys()),
@@ -37,3 +52,24 @@ def run_configuration(grouping_input: GroupingInput, config_name: str) -> None:
     event.project = None  # type: ignore[assignment]
 
     event.get_hashes()
+
+
+def get_parameterization_messages() -> list[str]:
+    with open(PARAMETERIZATION_MESSAGES_PATH) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_benchmark_parameterization(cached, benchmark):
+    messages = get_parameterization_messages()
+
+    def run():
+        if not cached:
+            _parametrize_w_regex_cached.cache_clear()
+        for message in messages:
+            Parameterizer(regex_pattern_keys=PARAMETERIZATION_PATTERN_KEYS).parametrize_w_regex(
+                message
+            )
+
+    benchmark(run)
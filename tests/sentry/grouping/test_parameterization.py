@@ -6,6 +6,8 @@ from sentry.grouping.parameterization import (
     ParameterizationRegexExperiment,
     Parameterizer,
     UniqueIdExperiment,
+    _compile_parameterization,
+    _parametrize_w_regex_cached,
 )
 
 
@@ -231,6 +233,31 @@ def test_parameterize_experiment(name, input, expected, parameterizer):
         assert experiments[0] == UniqueIdExperiment
 
 
+def test_parameterize_counts_matches_from_cache(parameterizer):
+    _parametrize_w_regex_cached.cache_clear()
+    input = "blah 123 had a problem with 0x40000015"
+
+    assert parameterizer.parametrize_w_regex(input) == "blah <int> had a problem with <hex>"
+    assert parameterizer.parametrize_w_regex(input) == "blah <int> had a problem with <hex>"
+    assert _parametrize_w_regex_cached.cache_info().hits == 1
+    assert parameterizer.matches_counter == {"int": 2, "hex": 2}
+
+
+def test_parameterize_prefilter(parameterizer):
+    regex, prefilter = _compile_parameterization(parameterizer._pattern_keys)
+    assert prefilter is not None
+
+    # Nothing in here can be parameterized, so the full regex never needs to run
+    input = "TypeError: Cannot read properties of undefined"
+    assert prefilter.search(input) is None
+    assert parameterizer.parametrize_w_regex(input) == input
+
+    # Every string the full regex matches must pass the prefilter
+    for input in ("a@b", "x=true", "deadbeef" * 4, "Mon, 02 Jan 06 15:04 MST", "::"):
+        assert regex.search(input)
+        assert prefilter.search(input)
+
+
 def test_parameterize_regex_experiment():
     """
     We don't have any of these yet, but we need to test that they work
@@ -92,6 +92,7 @@ from sentry.integrations.models.organization_integration import OrganizationInte
 from sentry.integrations.pagerduty.utils import add_service
 from sentry.integrations.services.integration.serial import serialize_integration
 from sentry.models.group import GroupStatus
+from sentry.relay.config.sections import TRANSACTION_METRICS
 from sentry.seer.anomaly_detection.store_data import seer_anomaly_detection_connection_pool
 from sentry.seer.anomaly_detection.types import StoreDataResponse
 from sentry.shared_integrations.exceptions import ApiRateLimitedError, ApiTimeoutError
@@ -3783,7 +3784,9 @@ class TestCustomMetricAlertRule(TestCase):
             )
 
             mocked_schedule_invalidate_project_config.assert_called_once_with(
-                trigger="alerts:create-on-demand-metric", project_id=self.project.id
+                trigger="alerts:create-on-demand-metric",
+                project_id=self.project.id,
+                sections=[TRANSACTION_METRICS],
             )
 
     @patch("sentry.incidents.logic.schedule_invalidate_project_config")
@@ -3798,7 +3801,9 @@ class TestCustomMetricAlertRule(TestCase):
             )
 
             mocked_schedule_invalidate_project_config.assert_called_once_with(
-                trigger="alerts:create-on-demand-metric", project_id=self.project.id
+                trigger="alerts:create-on-demand-metric",
+                project_id=self.project.id,
+                sections=[TRANSACTION_METRICS],
             )
 
     @patch("sentry.incidents.logic.schedule_invalidate_project_config")
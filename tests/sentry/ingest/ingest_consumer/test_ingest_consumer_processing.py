@@ -265,7 +265,16 @@ def test_feedbacks_spawn_save_event_feedback(
 
 @django_db_all
 @pytest.mark.parametrize("missing_chunks", (True, False))
-def test_with_attachments(default_project, task_runner, missing_chunks, monkeypatch, django_cache):
+@pytest.mark.parametrize("streaming", (True, False), ids=("streaming", "buffered"))
+def test_with_attachments(
+    default_project,
+    task_runner,
+    missing_chunks,
+    streaming,
+    monkeypatch,
+    django_cache,
+    set_sentry_option,
+):
     monkeypatch.setattr("sentry.features.has", lambda *a, **kw: True)
 
     payload = get_normalized_event({"message": "hello world"}, default_project)
@@ -295,7 +304,10 @@ def test_with_attachments(default_project, task_runner, missing_chunks, monkeypa
             }
         )
 
-    with task_runner():
+    with (
+        task_runner(),
+        set_sentry_option("sentry.save-event-attachments.streaming", streaming),
+    ):
         process_event(
             ConsumerType.Events,
             {
@@ -606,6 +618,45 @@ def test_individual_attachments_missing_chunks(default_project, factories, monke
     assert not attachments
 
 
+@django_db_all
+def test_individual_attachments_missing_chunks_streaming(
+    default_project, monkeypatch, set_sentry_option
+):
+    monkeypatch.setattr("sentry.features.has", lambda *a, **kw: True)
+
+    event_id = "515539018c9b4260a6f999572f1661ee"
+    attachment_id = "ca90fb45-6dd9-40a0-a18f-8693aa621abb"
+    project_id = default_project.id
+
+    with (
+        set_sentry_option("sentry.save-event-attachments.streaming", True),
+        patch("sentry.ratelimits.backend.is_limited_with_value") as is_limited,
+        patch("sentry.event_manager.track_outcome") as track_outcome,
+    ):
+        is_limited.return_value = (True, 1, 0)
+        process_individual_attachment(
+            {
+                "type": "attachment",
+                "attachment": {
+                    "attachment_type": "event.attachment",
+                    "chunks": 123,
+                    "content_type": "application/octet-stream",
+                    "id": attachment_id,
+                    "name": "foo.txt",
+                },
+                "event_id": event_id,
+                "project_id": project_id,
+            },
+            project=default_project,
+        )
+
+    # Missing chunks are detected before the attachment counts against the rate limits.
+    assert not is_limited.called
+    (call,) = track_outcome.call_args_list
+    assert call.kwargs["reason"] == "missing_chunks"
+    assert not EventAttachment.objects.filter(project_id=project_id, event_id=event_id).exists()
+
+
 @django_db_all
 def test_collect_span_metrics(default_project):
     with Feature({"organizations:dynamic-sampling": True, "organization:am3-tier": True}):
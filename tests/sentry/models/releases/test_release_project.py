@@ -6,6 +6,7 @@ from sentry.incidents.models.alert_rule import AlertRule, AlertRuleMonitorTypeIn
 from sentry.incidents.utils.types import AlertRuleActivationConditionType
 from sentry.models.release import Release
 from sentry.models.releases.release_project import ReleaseProject, ReleaseProjectModelManager
+from sentry.relay.config.sections import SAMPLING
 from sentry.signals import receivers_raise_on_send
 from sentry.snuba.models import QuerySubscription
 from sentry.testutils.cases import TransactionTestCase
@@ -71,7 +72,11 @@ class ReleaseProjectManagerTestCase(TransactionTestCase):
             ) as mock_task:
                 release.add_project(project)
                 assert mock_task.mock_calls == [
-                    mock_call(project_id=project.id, trigger="releaseproject.post_save")
+                    mock_call(
+                        project_id=project.id,
+                        trigger="releaseproject.post_save",
+                        sections=[SAMPLING],
+                    )
                 ]
 
     @receivers_raise_on_send()
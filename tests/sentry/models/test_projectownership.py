@@ -145,6 +145,29 @@ class ProjectOwnershipTestCase(TestCase):
             ),
         )
 
+    def test_get_owners_compiled_matcher(self):
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "src/*"), [Owner("user", self.user.email)])
+
+        ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a, rule_b]), fallthrough=True
+        )
+
+        with self.options({"ownership.compiled-matcher": True}):
+            assert ProjectOwnership.get_owners(self.project.id, {}) == ([], None)
+            self.assert_ownership_equals(
+                ProjectOwnership.get_owners(
+                    self.project.id, {"stacktrace": {"frames": [{"filename": "src/foo.py"}]}}
+                ),
+                (
+                    [
+                        Actor(id=self.team.id, actor_type=ActorType.TEAM),
+                        Actor(id=self.user.id, actor_type=ActorType.USER),
+                    ],
+                    [rule_a, rule_b],
+                ),
+            )
+
     def test_get_owners_when_codeowners_exists_and_no_issueowners(self):
         # This case will never exist bc we create a ProjectOwnership record if none exists when creating a ProjectCodeOwner record.
         # We have this testcase for potential corrupt data.
@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 from sentry.discover.models import TeamKeyTransaction, TeamKeyTransactionModelManager
 from sentry.models.projectteam import ProjectTeam
+from sentry.relay.config.sections import SAMPLING
 from sentry.signals import receivers_raise_on_send
 from sentry.testutils.cases import TransactionTestCase
 from sentry.testutils.helpers import Feature
@@ -45,5 +46,9 @@ class TeamKeyTransactionModelManagerTestCase(TransactionTestCase):
                     project_team=ProjectTeam.objects.get(project=self.project, team=team),
                 )
                 assert mock_task.mock_calls == [
-                    mock_call(project_id=self.project.id, trigger="teamkeytransaction.post_save")
+                    mock_call(
+                        project_id=self.project.id,
+                        trigger="teamkeytransaction.post_save",
+                        sections=[SAMPLING],
+                    )
                 ]
@@ -0,0 +1,79 @@
+import os
+from datetime import UTC, datetime
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore.filesystem.backend import BucketedFileSystemNodeStorage
+from sentry.testutils.helpers import override_options
+
+DAY = 60 * 60 * 24
+
+
+@pytest.fixture
+def ns(tmp_path):
+    ns = BucketedFileSystemNodeStorage(path=str(tmp_path))
+    ns.bootstrap()
+    return ns
+
+
+def _set_at(ns, timestamp, id, data):
+    with mock.patch("sentry.nodestore.filesystem.backend.time.time", return_value=timestamp):
+        ns.set(id, data)
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_fans_out_by_id(ns):
+    _set_at(ns, 10 * DAY, "a" * 32, {"foo": "a"})
+    _set_at(ns, 11 * DAY, "b" * 32, {"foo": "b"})
+
+    assert ns._buckets() == [11, 10]
+    path = ns._node_path("a" * 32)
+    assert os.path.exists(path)
+    assert len(os.path.relpath(path, ns.path).split(os.sep)) == 4
+    with mock.patch("builtins.open", wraps=open) as mock_open:
+        assert ns.get_multi(["a" * 32, "b" * 32, "c" * 32]) == {
+            "a" * 32: {"foo": "a"},
+            "b" * 32: {"foo": "b"},
+            "c" * 32: None,
+        }
+    # a single read per node, regardless of the number of buckets
+    assert mock_open.call_count == 3
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_overwrite_and_delete(ns):
+    _set_at(ns, 10 * DAY, "node", {"foo": "old"})
+    _set_at(ns, 11 * DAY, "node", {"foo": "new"})
+    assert ns.get("node") == {"foo": "new"}
+
+    ns.delete("node")
+    assert ns.get("node") is None
+    assert not os.path.exists(ns._node_path("node"))
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_get_multi_reuses_pool(ns):
+    ns.set("a", {"foo": "a"})
+    ns.set("b", {"foo": "b"})
+
+    assert ns.get_multi(["a", "b"]) == {"a": {"foo": "a"}, "b": {"foo": "b"}}
+    pool = ns._pool
+    assert pool is not None
+    assert ns.get_multi(["a", "b"]) == {"a": {"foo": "a"}, "b": {"foo": "b"}}
+    assert ns._pool is pool
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_cleanup_removes_expired_buckets(ns):
+    _set_at(ns, 10 * DAY, "old", {"foo": "a"})
+    _set_at(ns, 10 * DAY, "overwritten", {"foo": "a"})
+    _set_at(ns, 12 * DAY + 5, "overwritten", {"foo": "b"})
+    _set_at(ns, 12 * DAY + 5, "new", {"foo": "b"})
+
+    ns.cleanup(datetime.fromtimestamp(12 * DAY, UTC))
+
+    assert ns._buckets() == [12]
+    assert ns.get("old") is None
+    assert ns.get("overwritten") == {"foo": "b"}
+    assert ns.get("new") == {"foo": "b"}
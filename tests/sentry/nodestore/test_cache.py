@@ -0,0 +1,67 @@
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore.cache import NodeBytesCache
+from sentry.testutils.helpers import override_options
+
+
+@pytest.fixture
+def cache():
+    with override_options(
+        {
+            "nodestore.local-cache.max-bytes": 10,
+            "nodestore.local-cache.ttl": 60.0,
+            "nodestore.local-cache.negative-ttl": 5.0,
+        }
+    ):
+        yield NodeBytesCache()
+
+
+def test_get_set(cache):
+    assert cache.get("a") == (False, None)
+    cache.set("a", b"1234")
+    assert cache.get("a") == (True, b"1234")
+    cache.delete("a")
+    assert cache.get("a") == (False, None)
+
+
+def test_evicts_least_recently_used_by_size(cache):
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.get("a") == (True, b"1234")
+    cache.set("c", b"1234")
+
+    assert cache.get("a") == (True, b"1234")
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, b"1234")
+
+    # values larger than the whole cache are never stored
+    cache.set("d", b"12345678901")
+    assert cache.get("d") == (False, None)
+    assert cache.get("a") == (True, b"1234")
+
+
+def test_entries_expire(cache):
+    with mock.patch("sentry.nodestore.cache.monotonic", return_value=100):
+        cache.set("a", b"1234")
+    with mock.patch("sentry.nodestore.cache.monotonic", return_value=159):
+        assert cache.get("a") == (True, b"1234")
+    with mock.patch("sentry.nodestore.cache.monotonic", return_value=161):
+        assert cache.get("a") == (False, None)
+
+
+def test_negative_entries_expire(cache):
+    with mock.patch("sentry.nodestore.cache.monotonic", return_value=100):
+        cache.set("a", None)
+    with mock.patch("sentry.nodestore.cache.monotonic", return_value=104):
+        assert cache.get("a") == (True, None)
+    with mock.patch("sentry.nodestore.cache.monotonic", return_value=106):
+        assert cache.get("a") == (False, None)
+
+
+def test_disabled():
+    with override_options({"nodestore.local-cache.max-bytes": 0}):
+        cache = NodeBytesCache()
+        cache.set("a", b"1234")
+        assert cache.get("a") == (False, None)
@@ -4,10 +4,13 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 """
 
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
+from sentry.nodestore.cache import node_bytes_cache
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.filesystem.backend import BucketedFileSystemNodeStorage
 from sentry.testutils.helpers import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
@@ -16,14 +19,22 @@ from tests.sentry.nodestore.bigtable.test_backend import (
 
 
 @pytest.fixture(
-    params=["bigtable-mocked", "bigtable-real", pytest.param("django", marks=pytest.mark.django_db)]
+    params=[
+        "bigtable-mocked",
+        "bigtable-real",
+        pytest.param("django", marks=pytest.mark.django_db),
+        "filesystem-bucketed",
+    ]
 )
-def ns(request):
+def ns(request, tmp_path):
     # backends are returned from context managers to support teardown when required
     backends = {
         "bigtable-mocked": lambda: nullcontext(MockedBigtableNodeStorage(project="test")),
         "bigtable-real": lambda: get_temporary_bigtable_nodestorage(),
         "django": lambda: nullcontext(DjangoNodeStorage()),
+        "filesystem-bucketed": lambda: nullcontext(
+            BucketedFileSystemNodeStorage(path=str(tmp_path))
+        ),
     }
 
     ctx = backends[request.param]()
@@ -98,3 +109,47 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.binary-encoding.enabled": True,
+        "nodestore.binary-encoding.compression-threshold": 16,
+    }
+)
+def test_set_subkeys_binary_encoding(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b" * 100}})
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b" * 100}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b" * 100}}
+
+    with override_options({"nodestore.binary-encoding.enabled": False}):
+        # values written in either format stay readable after toggling the option
+        assert ns.get("node_1", subkey="other") == {"foo": "b" * 100}
+        ns.set("node_2", {"foo": "c"})
+
+    assert ns.get("node_2") == {"foo": "c"}
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.local-cache.max-bytes": 1024 * 1024,
+    }
+)
+def test_local_cache(ns):
+    node_bytes_cache.clear()
+
+    assert ns.get("node_1") is None
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    # writes invalidate cached misses
+    assert ns.get("node_1") == {"foo": "a"}
+
+    with mock.patch.object(ns, "_get_bytes", side_effect=AssertionError):
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+        assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+
+    ns.delete("node_1")
+    assert ns.get("node_1") is None
@@ -0,0 +1,44 @@
+import pytest
+
+from sentry.nodestore.encoding import (
+    FLAG_ZSTD,
+    InvalidNodeEncoding,
+    decode_segment,
+    encode_segments,
+    is_binary_encoded,
+)
+
+SEGMENTS = [(None, b'{"foo":"a"}'), ("unprocessed", b'{"foo":"b"}' * 100), ("other", b"{}")]
+
+
+@pytest.mark.parametrize("compression_threshold", [None, 1, 10_000])
+def test_roundtrip(compression_threshold):
+    value = encode_segments(SEGMENTS, compression_threshold=compression_threshold)
+    assert is_binary_encoded(value)
+    for subkey, payload in SEGMENTS:
+        assert decode_segment(value, subkey) == payload
+    assert decode_segment(value, "missing") is None
+
+
+def test_compresses_large_segments_only():
+    compressed = encode_segments(SEGMENTS, compression_threshold=100)
+    uncompressed = encode_segments(SEGMENTS)
+    assert len(compressed) < len(uncompressed)
+    # the default payload is smaller than the threshold and stays readable as-is
+    assert b'{"foo":"a"}' in compressed
+    assert compressed[7] & FLAG_ZSTD == 0
+
+
+def test_legacy_format_is_not_binary():
+    assert not is_binary_encoded(b'{"foo":"a"}\nunprocessed\n{"foo":"b"}')
+    assert not is_binary_encoded(b"")
+
+
+def test_invalid():
+    value = encode_segments(SEGMENTS)
+    with pytest.raises(InvalidNodeEncoding):
+        decode_segment(value[:5], None)
+    with pytest.raises(InvalidNodeEncoding):
+        decode_segment(value[:-10], "other")
+    with pytest.raises(InvalidNodeEncoding):
+        decode_segment(value[:4] + b"\x02" + value[5:], None)
@@ -0,0 +1,176 @@
+from collections.abc import Mapping
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from sentry.ownership.compiled import (
+    CompiledRules,
+    _required_substrings,
+    clear_cache,
+    get_compiled_rules,
+)
+from sentry.ownership.grammar import Matcher, Rule, dump_schema, parse_rules
+from sentry.testutils.skips import requires_pytest_benchmark
+
+fixture_data = r"""
+*.js                                #frontend
+url:http://google.com/*             #backend
+url:*                               #web
+path:src/sentry/*                   david@sentry.io
+path:SRC/Sentry/Models/*            models@sentry.io
+path:src/{sentry,getsentry}/api/*   api@sentry.io
+path:./src/sentry/api/*             dotted@sentry.io
+path:*                              everything@sentry.io
+tags.foo:bar                        tagperson@sentry.io
+tags.user.email:*@sentry.io         tagperson@sentry.io
+module:foo.bar                      #workflow
+module:sentry.*                     #workflow
+codeowners:/usr/src/sentry/src/     githubuser@sentry.io
+codeowners:*.py                     githubmod@sentry.io
+codeowners:sentry/models/           githubmod@sentry.io
+codeowners:\filename                githubmod@sentry.io
+codeowners:/src/ui/*.tsx            githubmod@sentry.io
+codeowners:*.py                     otherteam@sentry.io
+"""
+
+events: list[Mapping[str, Any]] = [
+    {},
+    {"request": {"url": "http://google.com/search"}},
+    {"request": {"url": "https://example.com"}},
+    {"tags": [["foo", "bar"]], "user": {"email": "someone@sentry.io"}},
+    {
+        "platform": "python",
+        "stacktrace": {
+            "frames": [
+                {
+                    "filename": "sentry/api/foo.py",
+                    "abs_path": "/usr/src/sentry/src/sentry/api/foo.py",
+                    "module": "sentry.api",
+                    "in_app": True,
+                },
+                {
+                    "filename": "src/sentry/models/release.py",
+                    "abs_path": "/usr/src/sentry/src/sentry/models/release.py",
+                    "module": "sentry.models.release",
+                    "in_app": False,
+                },
+            ]
+        },
+    },
+    {
+        "platform": "javascript",
+        "exception": {
+            "values": [
+                {
+                    "stacktrace": {
+                        "frames": [
+                            {"filename": "app.js", "abs_path": "webpack:///./src/ui/app.js"},
+                            {"filename": "src/ui/Button.tsx", "module": "foo.bar"},
+                        ]
+                    }
+                }
+            ]
+        },
+    },
+    {"stacktrace": {"frames": [{"filename": "SRC\\SENTRY\\MODELS\\group.py"}]}},
+]
+
+
+@pytest.mark.parametrize("data", events)
+def test_matches_like_rule_test(data: Mapping[str, Any]) -> None:
+    rules = parse_rules(fixture_data)
+    munged_data = Matcher.munge_if_needed(data)
+    expected = [rule for rule in rules if rule.test(data, munged_data)]
+
+    assert CompiledRules(rules).matching_rules(data) == expected
+    assert CompiledRules(rules).matching_rules(data, munged_data) == expected
+
+
+def test_each_pattern_tested_once() -> None:
+    rules = parse_rules(fixture_data)
+    data = {"stacktrace": {"frames": [{"filename": "sentry/api/foo.py", "in_app": True}] * 50}}
+
+    with mock.patch(
+        "sentry.ownership.compiled.codeowners_match", return_value=False
+    ) as codeowners_match:
+        CompiledRules(rules).matching_rules(data)
+
+    # One call per distinct value for every codeowners pattern which could match the paths
+    assert {call.args[1] for call in codeowners_match.call_args_list} == {"*.py", "\\filename"}
+    assert codeowners_match.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("*", ()),
+        ("**/*.py", (".py",)),
+        ("/usr/local/src/foo/*.py", ("local", "src", "usr", "foo", ".py")),
+        ("./src/*", ("src",)),
+        ("Foo/BAR*", ("bar", "foo")),
+        ("src/{a,b}/*", ()),
+        ("src/[ab]/*", ()),
+        ("\\filename", ()),
+    ],
+)
+def test_required_substrings(pattern: str, expected: tuple[str, ...]) -> None:
+    assert sorted(_required_substrings(pattern)) == sorted(expected)
+    assert [len(part) for part in _required_substrings(pattern)] == sorted(
+        (len(part) for part in expected), reverse=True
+    )
+
+
+def test_get_compiled_rules_cached() -> None:
+    clear_cache()
+    schema = dump_schema(parse_rules(fixture_data))
+
+    compiled = get_compiled_rules(schema)
+    assert get_compiled_rules(dump_schema(parse_rules(fixture_data))) is compiled
+
+    changed = dump_schema(parse_rules(fixture_data + "path:other/* foo@sentry.io\n"))
+    assert get_compiled_rules(changed) is not compiled
+
+
+def _large_codeowners(lines: int) -> str:
+    patterns = [
+        "/src/app/module{i}/",
+        "/src/app/module{i}/*.py",
+        "src/lib/pkg{i}/**/handlers/*.py",
+        "*.ext{i}",
+        "static/app/views/view{i}/",
+    ]
+    return "".join(
+        f"codeowners:{patterns[i % len(patterns)].format(i=i)} team{i % 50}@example.com\n"
+        for i in range(lines)
+    )
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("compiled", [True, False], ids=["compiled", "rule_test"])
+def test_benchmark_large_codeowners(compiled: bool, benchmark: Any) -> None:
+    rules = parse_rules(_large_codeowners(5000))
+    data = {
+        "platform": "python",
+        "stacktrace": {
+            "frames": [
+                {
+                    "filename": f"src/app/module{i * 7}/views.py",
+                    "abs_path": f"/srv/src/app/module{i * 7}/views.py",
+                    "in_app": True,
+                }
+                for i in range(50)
+            ]
+        },
+    }
+
+    def test_rules() -> list[Rule]:
+        munged_data = Matcher.munge_if_needed(data)
+        return [rule for rule in rules if rule.test(data, munged_data)]
+
+    if compiled:
+        result = benchmark(CompiledRules(rules).matching_rules, data)
+    else:
+        result = benchmark(test_rules)
+
+    assert result == test_rules()
@@ -1,15 +1,20 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
+    LeasingSlidingWindowRateLimiter,
     Quota,
     RedisSlidingWindowRateLimiter,
     RequestedQuota,
 )
 
 
-@pytest.fixture
-def limiter():
+@pytest.fixture(params=["redis", "leasing"])
+def limiter(request):
+    if request.param == "leasing":
+        return LeasingSlidingWindowRateLimiter(lease_ratio=0.5)
     return RedisSlidingWindowRateLimiter()
 
 
@@ -71,3 +76,86 @@ def test_basic(limiter):
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_leasing_serves_from_lease():
+    limiter = LeasingSlidingWindowRateLimiter(lease_ratio=0.5)
+    quotas = [Quota(window_seconds=10, granularity_seconds=10, limit=10)]
+    request = RequestedQuota(prefix="foo", requested=1, quotas=quotas)
+
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        for _ in range(5):
+            resp = limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET)
+            assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+        assert check_within_quotas.call_count == 1
+
+        resp = limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET)
+        assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+        assert check_within_quotas.call_count == 2
+
+    # both leases have been charged in full
+    _, grants = limiter.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert grants == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+    limiter.reconcile(timestamp=TIMESTAMP_OFFSET)
+
+    # only the six granted requests are left
+    _, grants = limiter.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert grants == [GrantedQuota(prefix="foo", granted=4, reached_quotas=quotas)]
+
+
+def test_leasing_shares_quota():
+    quotas = [Quota(window_seconds=10, granularity_seconds=10, limit=10)]
+    request = RequestedQuota(prefix="foo", requested=1, quotas=quotas)
+    first = LeasingSlidingWindowRateLimiter(lease_ratio=0.8)
+    second = LeasingSlidingWindowRateLimiter(lease_ratio=0.8)
+
+    assert first.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET) == [
+        GrantedQuota(prefix="foo", granted=1, reached_quotas=[])
+    ]
+    # the second process only gets what is left over from the first lease
+    assert second.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=3, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    ) == [GrantedQuota(prefix="foo", granted=2, reached_quotas=quotas)]
+
+    first.reconcile(timestamp=TIMESTAMP_OFFSET)
+    assert second.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=3, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    ) == [GrantedQuota(prefix="foo", granted=3, reached_quotas=[])]
+
+
+def test_leasing_calls_redis_outside_lock():
+    limiter = LeasingSlidingWindowRateLimiter(lease_ratio=0.5, reconcile_interval=0.001)
+    quotas = [Quota(window_seconds=20, granularity_seconds=10, limit=10)]
+    request = RequestedQuota(prefix="foo", requested=1, quotas=quotas)
+    impl = limiter.impl
+
+    def assert_unlocked(method):
+        def inner(*args, **kwargs):
+            assert not limiter._lock.locked()
+            return method(*args, **kwargs)
+
+        return inner
+
+    with (
+        mock.patch.object(
+            impl, "check_within_quotas", side_effect=assert_unlocked(impl.check_within_quotas)
+        ) as check_within_quotas,
+        mock.patch.object(
+            impl, "use_quotas", side_effect=assert_unlocked(impl.use_quotas)
+        ) as use_quotas,
+    ):
+        limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET)
+        # the lease is stale by now, and is returned before acquiring a new one
+        limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET + 10)
+        limiter.reconcile(timestamp=TIMESTAMP_OFFSET + 10)
+
+    assert check_within_quotas.call_count == 2
+    # two leases acquired, the first one released on check and the second one on reconcile
+    assert use_quotas.call_count == 4
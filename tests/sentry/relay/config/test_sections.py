@@ -0,0 +1,120 @@
+from unittest import mock
+
+import pytest
+
+from sentry.models.projectkey import ProjectKey
+from sentry.relay.config import get_dynamic_sampling_config, get_filter_settings, get_project_config
+from sentry.relay.config.sections import (
+    FILTER_SETTINGS,
+    QUOTAS,
+    SAMPLING,
+    ProjectConfigSectionCache,
+    get_sections_for_project_option,
+    invalidate_sections,
+)
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+
+SECTIONS = [SAMPLING, FILTER_SETTINGS]
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        (None, None),
+        ("filters:browser-extensions", [FILTER_SETTINGS]),
+        ("sentry:blacklisted_ips", [FILTER_SETTINGS]),
+        ("sentry:relay_pii_config", None),
+        ("sentry:breakdowns", None),
+    ],
+)
+def test_get_sections_for_project_option(key, expected):
+    assert get_sections_for_project_option(key) == expected
+
+
+def test_section_cache(django_cache):
+    ProjectConfigSectionCache(1, 2, SECTIONS).set_many({SAMPLING: {"sampling": {"version": 2}}})
+
+    assert ProjectConfigSectionCache(1, 2, SECTIONS).get_many() == {
+        SAMPLING: {"sampling": {"version": 2}}
+    }
+    assert ProjectConfigSectionCache(1, 3, SECTIONS).get_many() == {}
+
+
+@pytest.mark.parametrize(
+    "kwargs, invalidated",
+    [
+        ({"project_id": 2, "sections": [SAMPLING]}, {SAMPLING}),
+        ({"organization_id": 1, "sections": [SAMPLING]}, {SAMPLING}),
+        ({"project_id": 2}, {SAMPLING, FILTER_SETTINGS}),
+        ({"organization_id": 1}, {SAMPLING, FILTER_SETTINGS}),
+        ({"project_id": 3}, set()),
+        ({"organization_id": 4}, set()),
+    ],
+)
+def test_invalidate_sections(django_cache, kwargs, invalidated):
+    sections = {SAMPLING: {"sampling": {}}, FILTER_SETTINGS: {"filterSettings": {}}}
+    ProjectConfigSectionCache(1, 2, SECTIONS).set_many(sections)
+
+    invalidate_sections(**kwargs)
+
+    assert ProjectConfigSectionCache(1, 2, SECTIONS).get_many().keys() == (
+        sections.keys() - invalidated
+    )
+
+
+def test_invalidate_unknown_section(django_cache):
+    with pytest.raises(ValueError):
+        invalidate_sections(project_id=2, sections=[SAMPLING, "unknown"])
+
+
+def test_section_cache_variants(django_cache):
+    ProjectConfigSectionCache(1, 2, [QUOTAS], variants={QUOTAS: "10"}).set_many(
+        {QUOTAS: {"quotas": []}}
+    )
+
+    assert ProjectConfigSectionCache(1, 2, [QUOTAS], variants={QUOTAS: "10"}).get_many()
+    assert not ProjectConfigSectionCache(1, 2, [QUOTAS], variants={QUOTAS: "11"}).get_many()
+
+
+@django_db_all
+@override_options({"relay.config.section-cache.enabled": True})
+def test_get_project_config_reuses_sections(default_project, django_cache):
+    keys = ProjectKey.objects.filter(project=default_project)
+    expected = get_project_config(default_project, project_keys=keys).to_dict()["config"]
+
+    with (
+        mock.patch(
+            "sentry.relay.config.get_dynamic_sampling_config", wraps=get_dynamic_sampling_config
+        ) as sampling,
+        mock.patch(
+            "sentry.relay.config.get_filter_settings", wraps=get_filter_settings
+        ) as filter_settings,
+    ):
+        config = get_project_config(default_project, project_keys=keys, use_section_cache=True)
+        assert config.to_dict()["config"] == expected
+        assert sampling.call_count == 0
+        assert filter_settings.call_count == 0
+
+        invalidate_sections(project_id=default_project.id, sections=[FILTER_SETTINGS])
+        config = get_project_config(default_project, project_keys=keys, use_section_cache=True)
+        assert config.to_dict()["config"] == expected
+        assert sampling.call_count == 0
+        assert filter_settings.call_count == 1
+
+        # Without the section cache every section is computed
+        get_project_config(default_project, project_keys=keys)
+        assert sampling.call_count == 1
+        assert filter_settings.call_count == 2
+
+
+@django_db_all
+@override_options({"relay.config.section-cache.enabled": True})
+def test_get_project_config_does_not_cache_failed_sections(default_project, django_cache):
+    with mock.patch(
+        "sentry.relay.config.get_dynamic_sampling_config", side_effect=RuntimeError
+    ) as sampling:
+        get_project_config(default_project, use_section_cache=True)
+        get_project_config(default_project, use_section_cache=True)
+
+    assert sampling.call_count == 2
@@ -11,9 +11,10 @@ from sentry.replays.lib.storage import (
     make_recording_filename,
 )
 from sentry.replays.testutils import mock_replay
-from sentry.replays.usecases.pack import pack
+from sentry.replays.usecases.pack import pack, pack_indexed
 from sentry.testutils.abstract import Abstract
 from sentry.testutils.cases import APITestCase, ReplaysSnubaTestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.response import close_streaming_response
 
 
@@ -130,3 +131,45 @@ class PackedStorageReplayRecordingSegmentDetailsTestCase(EnvironmentBase, Replay
             )
         )
         StorageBlob().set(metadata, zlib.compress(pack(self.segment_data, None)))
+
+
+class IndexedStorageReplayRecordingSegmentDetailsTestCase(EnvironmentBase, ReplaysSnubaTestCase):
+    def init_environment(self):
+        self.segment_data = b'[{"timestamp":1,"data":"a"},{"timestamp":2,"data":"b"}]'
+        self.segment_data_size = len(self.segment_data)
+
+        metadata = RecordingSegmentStorageMeta(
+            project_id=self.project.id,
+            replay_id=self.replay_id,
+            segment_id=self.segment_id,
+            retention_days=30,
+        )
+
+        self.segment_filename = make_recording_filename(metadata)
+
+        self.store_replays(
+            mock_replay(
+                datetime.datetime.now() - datetime.timedelta(seconds=22),
+                metadata.project_id,
+                metadata.replay_id,
+                segment_id=metadata.segment_id,
+                retention_days=metadata.retention_days,
+            )
+        )
+        StorageBlob().set(metadata, pack_indexed(self.segment_data, None, chunk_size=1))
+
+    def test_get_replay_recording_segment_download_time_window(self):
+        self.login_as(user=self.user)
+
+        indexed_since = (datetime.datetime.now() - datetime.timedelta(hours=1)).timestamp()
+        with (
+            self.feature("organizations:session-replay"),
+            override_options({"replay.storage.indexed-segments.since": indexed_since}),
+        ):
+            response = self.client.get(self.url + "?download&start=2&end=5")
+
+            assert response.status_code == 200, response.content
+            assert close_streaming_response(response) == b'[{"timestamp":2,"data":"b"}]'
+
+            response = self.client.get(self.url + "?download&start=foo")
+            assert response.status_code == 400
@@ -1,4 +1,13 @@
-from sentry.replays.usecases.pack import HEADER_OFFSET, Encoding, pack, unpack
+from sentry.replays.usecases.pack import (
+    HEADER_OFFSET,
+    Encoding,
+    index_size,
+    pack,
+    pack_indexed,
+    read_chunks,
+    unpack,
+    unpack_index,
+)
 
 
 def test_pack_rrweb():
@@ -26,3 +35,70 @@ def test_unpack_rrweb_video():
     x = b"\x00" * 1_000_000
     y = b"\xff" * 1_000_000
     assert unpack(pack(x, y)) == (y, x)
+
+
+def test_pack_indexed():
+    rrweb = b'[{"timestamp":3,"data":"a"},{"timestamp":1},{"data":"b"},{"timestamp":7}]'
+    result = pack_indexed(rrweb, b"world", chunk_size=30)
+    assert result is not None
+    assert result[0] == Encoding.INDEXED.value
+
+    index = unpack_index(result[: index_size(result)])
+    assert index.video is not None
+    assert result[index.video[0] : index.video[1]] == b"world"
+    assert [(chunk.min_timestamp, chunk.max_timestamp) for chunk in index.chunks] == [
+        (1, 3),
+        (None, None),
+    ]
+
+    # Chunks can be read from a slice of the payload.
+    chunk = index.chunks[0]
+    data = result[chunk.offset : chunk.offset + chunk.length]
+    assert read_chunks(data, [chunk], base=chunk.offset) == (
+        b'[{"timestamp":3,"data":"a"},{"timestamp":1}]'
+    )
+
+
+def test_pack_indexed_invalid():
+    assert pack_indexed(b"[{hello: world}]", None) is None
+    assert pack_indexed(b'{"hello":"world"}', None) is None
+
+
+def test_pack_indexed_keeps_event_bytes():
+    rrweb = ' [ {"timestamp": 1, "text": "héllo"} ,\n{"timestamp": 2} ] '.encode()
+    result = pack_indexed(rrweb, None, chunk_size=1)
+    assert result is not None
+
+    index = unpack_index(result)
+    assert read_chunks(result, index.chunks) == (
+        '[{"timestamp": 1, "text": "héllo"},{"timestamp": 2}]'.encode()
+    )
+    assert pack_indexed(b"[1,]", None) is None
+    assert pack_indexed(b"[1] 2", None) is None
+
+
+def test_unpack_indexed():
+    rrweb = b'[{"timestamp":1},{"timestamp":2}]'
+    assert unpack(pack_indexed(rrweb, None, chunk_size=1)) == (None, rrweb)
+    assert unpack(pack_indexed(rrweb, b"world")) == (b"world", rrweb)
+    assert unpack(pack_indexed(b"[]", None)) == (None, b"[]")
+
+
+def test_chunks_between():
+    index = unpack_index(
+        pack_indexed(
+            b'[{"timestamp":1},{"timestamp":2},{"timestamp":3},{},{"timestamp":5}]',
+            None,
+            chunk_size=1,
+        )
+    )
+    timestamps = [chunk.min_timestamp for chunk in index.chunks]
+    assert timestamps == [1, 2, 3, None, 5]
+
+    def between(start, end):
+        return [chunk.min_timestamp for chunk in index.chunks_between(start, end)]
+
+    assert between(2, 3) == [2, 3, None]
+    assert between(None, 1) == [1, None]
+    assert between(4, None) == [None, 5]
+    assert between(None, None) == timestamps
@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any
+from unittest import mock
+
+from sentry.replays.lib.storage import RecordingSegmentStorageMeta
+from sentry.replays.usecases.pack import pack, pack_indexed
+from sentry.replays.usecases.reader import (
+    download_segments,
+    download_video,
+    iter_downloaded_segments,
+)
+from sentry.testutils.helpers.options import override_options
+
+
+def _download(segment):
+    # Finish downloads out of order
+    time.sleep(random.random() / 100)
+    if segment is None:
+        return None
+    return (None, segment)
+
+
+@mock.patch("sentry.replays.usecases.reader._download_segment", side_effect=_download)
+def test_iter_downloaded_segments_in_order(download_segment):
+    segments: Any = [str(i).encode() for i in range(50)]
+
+    assert list(iter_downloaded_segments(segments, max_workers=5, prefetch=10)) == [
+        (None, segment) for segment in segments
+    ]
+
+
+def test_iter_downloaded_segments_bounded_prefetch():
+    segments: Any = list(range(100))
+    started = []
+    lock = threading.Lock()
+
+    def download(segment):
+        with lock:
+            started.append(segment)
+        return (None, segment)
+
+    with mock.patch("sentry.replays.usecases.reader._download_segment", side_effect=download):
+        downloads = iter_downloaded_segments(segments, max_workers=2, prefetch=3)
+        assert next(downloads) == (None, 0)
+        # The first segment, two segments ahead of it, and the one replacing it
+        assert len(started) <= 4
+        downloads.close()
+
+    assert len(started) <= 4
+
+
+@mock.patch("sentry.replays.usecases.reader._download_segment", side_effect=_download)
+def test_download_segments(download_segment):
+    segments: Any = [b"[1]", None, b"[2]", None]
+
+    assert b"".join(download_segments(segments)) == b"[[1],[],[2],[]]"
+    assert b"".join(download_segments([])) == b"[]"
+
+
+def _segment(date_added: float) -> RecordingSegmentStorageMeta:
+    return RecordingSegmentStorageMeta(
+        project_id=1,
+        replay_id="515539018c9b4260a6f999572f1661ee",
+        segment_id=0,
+        retention_days=30,
+        date_added=datetime.fromtimestamp(date_added, timezone.utc),
+    )
+
+
+@override_options({"replay.storage.indexed-segments.since": 1000.0})
+def test_download_video_indexed_segment():
+    data = pack_indexed(b'[{"timestamp":1}]', b"video")
+    assert data is not None
+
+    with mock.patch("sentry.replays.usecases.reader.storage") as storage:
+        storage.get_range.side_effect = lambda segment, start, end: data[start:end]
+        assert download_video(_segment(1000)) == b"video"
+
+    assert not storage.get.called
+
+
+@override_options({"replay.storage.indexed-segments.since": 1000.0})
+def test_download_video_segment_added_before_indexing():
+    with mock.patch("sentry.replays.usecases.reader.storage") as storage:
+        storage.get.return_value = zlib.compress(pack(b"[]", b"video"))
+        assert download_video(_segment(999)) == b"video"
+
+    # Downloaded in a single request, without reading its first bytes to look for an index
+    assert storage.get.call_count == 1
+    assert not storage.get_range.called
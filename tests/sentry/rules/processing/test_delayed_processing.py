@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, Mock, patch
 from uuid import uuid4
 
 import pytest
+from celery.exceptions import SoftTimeLimitExceeded
 
 from sentry import buffer
 from sentry.eventstore.models import Event, GroupEvent
@@ -23,9 +24,11 @@ from sentry.rules.processing.delayed_processing import (
     DataAndGroups,
     UniqueConditionQuery,
     apply_delayed,
+    apply_delayed_for_projects,
     bucket_num_groups,
     bulk_fetch_events,
     cleanup_redis_buffer,
+    fire_rules,
     generate_unique_queries,
     get_condition_group_results,
     get_condition_query_groups,
@@ -781,6 +784,26 @@ class ProcessDelayedAlertConditionsTest(CreateEventTestCase, PerformanceIssueTes
         )
         assert project_ids == []
 
+    @override_options({"delayed_processing.cross_project_batch_size": 2})
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed_for_projects.delay")
+    def test_fetches_from_buffer_and_executes_across_projects(self, mock_apply_delayed):
+        self._push_base_events()
+        other_org_project = self.create_project(organization=self.create_organization())
+        buffer.backend.push_to_sorted_set(
+            key=PROJECT_ID_BUFFER_LIST_KEY, value=other_org_project.id
+        )
+
+        process_delayed_alert_conditions()
+
+        assert [call.args for call in mock_apply_delayed.call_args_list] == [
+            ([self.project.id, self.project_two.id],),
+            ([other_org_project.id],),
+        ]
+        project_ids = buffer.backend.get_sorted_set(
+            PROJECT_ID_BUFFER_LIST_KEY, 0, self.buffer_timestamp
+        )
+        assert project_ids == []
+
     def test_get_condition_groups(self):
         self._push_base_events()
         project_three = self.create_project(organization=self.organization)
@@ -854,6 +877,116 @@ class ProcessDelayedAlertConditionsTest(CreateEventTestCase, PerformanceIssueTes
         rule_group_data = buffer.backend.get_hash(Project, {"project_id": self.project_two.id})
         assert rule_group_data == {}
 
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    def test_apply_delayed_for_projects_rules_to_fire(self):
+        self._push_base_events()
+
+        apply_delayed_for_projects([self.project.id, self.project_two.id])
+
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, self.rule2, self.rule3, self.rule4],
+            group__in=[self.group1, self.group2, self.group3, self.group4],
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule1.id, self.group1.id),
+            (self.rule2.id, self.group2.id),
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        self.assert_buffer_cleared(project_id=self.project.id)
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    def test_apply_delayed_for_projects_merges_queries(self):
+        self._push_base_events()
+        project_three = self.create_project(organization=self.organization)
+        rule5 = self.create_project_rule(
+            project=project_three,
+            condition_match=[self.event_frequency_condition],
+            environment_id=self.environment.id,
+        )
+        rule6 = self.create_project_rule(
+            project=project_three,
+            condition_match=[
+                self.create_event_frequency_condition(
+                    interval="5m", id="EventFrequencyPercentCondition", value=1.0
+                )
+            ],
+        )
+        event5 = self.create_event(project_three.id, FROZEN_TIME, "group-5", self.environment.name)
+        self.create_event(project_three.id, FROZEN_TIME, "group-5", self.environment.name)
+        assert event5.group
+        self.push_to_hash(project_three.id, rule5.id, event5.group.id, event5.event_id)
+        self.push_to_hash(project_three.id, rule6.id, event5.group.id, event5.event_id)
+
+        with patch(
+            "sentry.rules.processing.delayed_processing.get_condition_group_results",
+            wraps=get_condition_group_results,
+        ) as mock_get_results:
+            apply_delayed_for_projects([self.project.id, project_three.id])
+
+        # Both projects share the query of the count condition
+        (condition_groups, _), _ = mock_get_results.call_args
+        frequency_query = UniqueConditionQuery(
+            cls_id=self.event_frequency_condition["id"],
+            interval=self.event_frequency_condition["interval"],
+            environment_id=self.environment.id,
+        )
+        assert condition_groups[frequency_query].group_ids == {self.group1.id, event5.group.id}
+        # Percent conditions are queried per project
+        assert mock_get_results.call_count == 2
+
+        assert RuleFireHistory.objects.filter(
+            rule=rule5, group=event5.group, project=project_three
+        ).exists()
+        self.assert_buffer_cleared(project_id=self.project.id)
+        self.assert_buffer_cleared(project_id=project_three.id)
+
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    def test_apply_delayed_for_projects_isolates_failures(self):
+        self._push_base_events()
+
+        def fire_rules_failing(rules_to_fire, parsed_rulegroup_to_event_data, alert_rules, project):
+            if project.id == self.project.id:
+                raise Exception("boom")
+            fire_rules(rules_to_fire, parsed_rulegroup_to_event_data, alert_rules, project)
+
+        with patch(
+            "sentry.rules.processing.delayed_processing.fire_rules",
+            side_effect=fire_rules_failing,
+        ):
+            apply_delayed_for_projects([self.project.id, self.project_two.id])
+
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, self.rule2, self.rule3, self.rule4],
+            group__in=[self.group1, self.group2, self.group3, self.group4],
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        self.assert_buffer_cleared(project_id=self.project.id)
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    def test_apply_delayed_for_projects_requeues_on_time_limit(self):
+        self._push_base_events()
+        buffer.backend.delete_key(PROJECT_ID_BUFFER_LIST_KEY, min=0, max=self.buffer_timestamp)
+
+        with patch(
+            "sentry.rules.processing.delayed_processing.fire_project_rules",
+            side_effect=SoftTimeLimitExceeded(),
+        ):
+            apply_delayed_for_projects([self.project.id, self.project_two.id])
+
+        project_ids = buffer.backend.get_sorted_set(
+            PROJECT_ID_BUFFER_LIST_KEY, 0, self.buffer_timestamp
+        )
+        assert {project_id for project_id, _ in project_ids} == {
+            self.project.id,
+            self.project_two.id,
+        }
+        # the buffered data is kept for the next flush
+        assert buffer.backend.get_hash(Project, {"project_id": self.project.id})
+
     def test_apply_delayed_issue_platform_event(self):
         """
         Test that we fire rules triggered from issue platform events
@@ -20,7 +20,11 @@ from sentry.notifications.types import ActionTargetType
 from sentry.rules import init_registry
 from sentry.rules.conditions import EventCondition
 from sentry.rules.filters.base import EventFilter
-from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY, RuleProcessor
+from sentry.rules.processing.processor import (
+    PROJECT_ID_BUFFER_LIST_KEY,
+    RuleProcessor,
+    bulk_get_rule_statuses,
+)
 from sentry.testutils.cases import PerformanceIssueTestCase, TestCase
 from sentry.testutils.helpers import install_slack
 from sentry.testutils.helpers.redis import mock_redis_buffer
@@ -46,6 +50,15 @@ class MockConditionTrue(EventCondition):
         return True
 
 
+class MockSharedConditionTrue(EventCondition):
+    id = "tests.sentry.rules.processing.test_processor.MockSharedConditionTrue"
+    label = "Mock condition which always passes and whose result is shared by rules."
+    shares_results_across_rules = True
+
+    def passes(self, event, state):
+        return True
+
+
 @mock_redis_buffer()
 class RuleProcessorTest(TestCase, PerformanceIssueTestCase):
     def setUp(self):
@@ -555,6 +568,87 @@ class RuleProcessorTest(TestCase, PerformanceIssueTestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    def _apply_rules_with_condition(self, condition_cls, condition):
+        self.rule.update(data={"conditions": [condition], "actions": [EMAIL_ACTION_DATA]})
+        rule_2 = Rule.objects.create(
+            project=self.group_event.project,
+            data={"conditions": [dict(condition)], "actions": [EMAIL_ACTION_DATA]},
+        )
+        with (
+            patch("sentry.rules.processing.processor.rules", init_registry()),
+            patch.object(condition_cls, "passes", return_value=True) as passes,
+        ):
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            results = list(rp.apply())
+
+        assert {future.rule for _, futures in results for future in futures} == {
+            self.rule,
+            rule_2,
+        }
+        return passes.call_count
+
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "tests.sentry.rules.processing.test_processor.MockSharedConditionTrue",
+        ],
+    )
+    def test_shared_conditions_evaluated_once(self):
+        condition = {
+            "id": "tests.sentry.rules.processing.test_processor.MockSharedConditionTrue",
+            "value": 1.5,
+        }
+        assert self._apply_rules_with_condition(MockSharedConditionTrue, condition) == 1
+
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "tests.sentry.rules.processing.test_processor.MockConditionTrue",
+        ],
+    )
+    def test_rule_dependent_conditions_evaluated_per_rule(self):
+        condition = {"id": "tests.sentry.rules.processing.test_processor.MockConditionTrue"}
+        assert self._apply_rules_with_condition(MockConditionTrue, condition) == 2
+
+
+@mock_redis_buffer()
+class BulkGetRuleStatusesTest(TestCase):
+    def setUp(self):
+        Rule.objects.filter(project=self.project).delete()
+        ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
+        self.rule = Rule.objects.create(
+            project=self.project,
+            data={"conditions": [EVERY_EVENT_COND_DATA], "actions": [EMAIL_ACTION_DATA]},
+        )
+        self.group_events = []
+        for fingerprint in ("group-1", "group-2"):
+            event = self.store_event(
+                data={"fingerprint": [fingerprint]}, project_id=self.project.id
+            )
+            self.group_events.append(event.for_group(cast(Group, event.group)))
+
+    def test_bulk_get_rule_statuses(self):
+        groups = [group_event.group for group_event in self.group_events]
+        statuses = bulk_get_rule_statuses([self.rule], groups, self.project)
+        assert set(statuses) == {group.id for group in groups}
+        for group in groups:
+            assert statuses[group.id][self.rule.id] == GroupRuleStatus.objects.get(
+                rule=self.rule, group=group
+            )
+
+        # Now served from the cache
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            assert bulk_get_rule_statuses([self.rule], groups, self.project) == statuses
+        assert not queries.captured_queries
+
 
 class MockFilterTrue(EventFilter):
     id = "tests.sentry.rules.processing.test_processor.MockFilterTrue"
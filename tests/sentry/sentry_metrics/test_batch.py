@@ -2170,3 +2170,60 @@ def test_aggregation_options():
         assert get_aggregation_options("c:spans/count@none") == {
             AggregationOption.DISABLE_PERCENTILES: TimeWindow.NINETY_DAYS
         }
+
+
+@pytest.mark.django_db
+def test_repeated_tags_translated_per_org():
+    other_org_counter_payload = {**counter_payload, "org_id": 2, "value": 2}
+    outer_message = _construct_outer_message(
+        [
+            (counter_payload, counter_headers),
+            (other_org_counter_payload, counter_headers),
+            (counter_payload, counter_headers),
+        ]
+    )
+
+    batch = IndexerBatch(
+        outer_message,
+        True,
+        False,
+        tags_validator=ReleaseHealthTagsValidator().is_allowed,
+        schema_validator=MetricsSchemaValidator(
+            INGEST_CODEC, RELEASE_HEALTH_SCHEMA_VALIDATION_RULES_OPTION_NAME
+        ).validate,
+    )
+
+    strings = ["c:sessions/session@none", "environment", "init", "production", "session.status"]
+    mapping = {
+        UseCaseID.SESSIONS: {
+            1: {string: i for i, string in enumerate(strings, 1)},
+            2: {string: i for i, string in enumerate(strings, 11)},
+        }
+    }
+    bulk_record_meta = {
+        UseCaseID.SESSIONS: {
+            org_id: {
+                string: Metadata(id=id, fetch_type=FetchType.CACHE_HIT)
+                for string, id in org_mapping.items()
+            }
+            for org_id, org_mapping in mapping[UseCaseID.SESSIONS].items()
+        }
+    }
+
+    with patch(
+        "sentry.sentry_metrics.consumers.indexer.batch.IndexerBatch._translate_tags",
+        autospec=True,
+        side_effect=IndexerBatch._translate_tags,
+    ) as translate_tags:
+        snuba_payloads = batch.reconstruct_messages(mapping, bulk_record_meta).data
+
+    # Messages of the same org with the same name and tags are translated only once
+    assert translate_tags.call_count == 2
+    assert [
+        (payload["org_id"], payload["metric_id"], payload["tags"], payload["value"])
+        for payload, _ in _deconstruct_messages(snuba_payloads)
+    ] == [
+        (1, 1, {"2": 4, "5": 3}, 1.0),
+        (2, 11, {"12": 14, "15": 13}, 2.0),
+        (1, 1, {"2": 4, "5": 3}, 1.0),
+    ]
@@ -1,10 +1,11 @@
 from datetime import timedelta
+from unittest import mock
 
 import pytest
 from django.conf import settings
 from django.utils import timezone
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import LocalStringIndexerCache, StringIndexerCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -240,3 +241,54 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+@override_options({"sentry-metrics.indexer.local-cache.max-size": 2})
+def test_local_cache(use_case_id: str) -> None:
+    cache.clear()
+    local_indexer_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
+    )
+    namespace = "test"
+    local_indexer_cache.set_many(namespace, {f"{use_case_id}:1:a": 1, f"{use_case_id}:1:b": 2})
+
+    with mock.patch.object(local_indexer_cache.cache, "get_many") as get_many:
+        assert local_indexer_cache.get_many(
+            namespace, [f"{use_case_id}:1:a", f"{use_case_id}:1:b"]
+        ) == {f"{use_case_id}:1:a": 1, f"{use_case_id}:1:b": 2}
+        assert local_indexer_cache.get(namespace, f"{use_case_id}:1:a") == 1
+    assert get_many.call_count == 0
+
+    # Evicts the least recently used entry from the local cache, but not the shared one
+    local_indexer_cache.set(namespace, f"{use_case_id}:1:c", 3)
+    assert local_indexer_cache.local_cache.get_many(
+        namespace, [f"{use_case_id}:1:a", f"{use_case_id}:1:b", f"{use_case_id}:1:c"]
+    ) == {f"{use_case_id}:1:a": 1, f"{use_case_id}:1:c": 3}
+    assert local_indexer_cache.get(namespace, f"{use_case_id}:1:b") == 2
+
+    local_indexer_cache.delete(namespace, f"{use_case_id}:1:b")
+    assert local_indexer_cache.get(namespace, f"{use_case_id}:1:b") is None
+
+
+@override_options(
+    {
+        "sentry-metrics.indexer.local-cache.max-size": 10,
+        "sentry-metrics.indexer.local-cache.ttl": 60,
+    }
+)
+def test_local_cache_ttl(use_case_id: str) -> None:
+    local_cache = LocalStringIndexerCache()
+    with mock.patch("sentry.sentry_metrics.indexer.cache.monotonic", return_value=100):
+        local_cache.set_many("test", {f"{use_case_id}:1:a": 1})
+
+    with mock.patch("sentry.sentry_metrics.indexer.cache.monotonic", return_value=159):
+        assert local_cache.get_many("test", [f"{use_case_id}:1:a"]) == {f"{use_case_id}:1:a": 1}
+    # Expires with up to 25% jitter
+    with mock.patch("sentry.sentry_metrics.indexer.cache.monotonic", return_value=176):
+        assert local_cache.get_many("test", [f"{use_case_id}:1:a"]) == {}
+
+
+def test_local_cache_disabled(use_case_id: str) -> None:
+    local_cache = LocalStringIndexerCache()
+    local_cache.set_many("test", {f"{use_case_id}:1:a": 1})
+    assert local_cache.get_many("test", [f"{use_case_id}:1:a"]) == {}
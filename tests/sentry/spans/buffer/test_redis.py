@@ -1,4 +1,5 @@
 from sentry.spans.buffer.redis import ProcessSegmentsContext, RedisSpansBuffer, SegmentKey
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 
 
@@ -148,3 +149,77 @@ class TestRedisSpansBuffer:
             b"1710280892",
             b"segment:segment_3:1:process-segment",
         ]
+
+    @django_db_all
+    def test_get_ready_segments_from_index(self):
+        buffer = RedisSpansBuffer()
+        timestamp_map = {
+            SegmentKey("segment_1", 1, 1): 1710280891,
+            SegmentKey("segment_2", 1, 1): 1710280890,
+            SegmentKey("segment_3", 1, 1): 1710280892,
+            SegmentKey("segment_4", 1, 2): 1710280893,
+        }
+        with override_options({"standalone-spans.buffer-ready-index.enable": True}):
+            buffer.batch_write_and_check_processing(
+                spans_map={key: [b"span data"] for key in timestamp_map},
+                segment_first_seen_ts=timestamp_map,
+                latest_ts_by_partition={1: 1710280893},
+            )
+            # Spans of known segments don't move them in the index
+            buffer.batch_write_and_check_processing(
+                spans_map={SegmentKey("segment_2", 1, 1): [b"span data 2"]},
+                segment_first_seen_ts={SegmentKey("segment_2", 1, 1): 1710280899},
+                latest_ts_by_partition={1: 1710280899},
+            )
+
+        assert buffer.client.zrange(
+            "performance-issues:ready-segments:partition:1", 0, -1, withscores=True
+        ) == [
+            (b"segment:segment_2:1:process-segment", 1710280890),
+            (b"segment:segment_1:1:process-segment", 1710280891),
+            (b"segment:segment_3:1:process-segment", 1710280892),
+        ]
+        assert not buffer.client.exists("performance-issues:unprocessed-segments:partition-2:1")
+
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1) == [
+            "segment:segment_2:1:process-segment",
+            "segment:segment_1:1:process-segment",
+        ]
+        assert buffer.client.zrange("performance-issues:ready-segments:partition:1", 0, -1) == [
+            b"segment:segment_3:1:process-segment",
+        ]
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1) == []
+
+    @django_db_all
+    def test_get_ready_segments_drains_list_and_index(self):
+        buffer = RedisSpansBuffer()
+        buffer.batch_write_and_check_processing(
+            spans_map={SegmentKey("segment_1", 1, 1): [b"span data"]},
+            segment_first_seen_ts={SegmentKey("segment_1", 1, 1): 1710280890},
+            latest_ts_by_partition={1: 1710280890},
+        )
+        with override_options(
+            {
+                "standalone-spans.buffer-ready-index.enable": True,
+                "standalone-spans.buffer-ready-index.max-segments": 1,
+            }
+        ):
+            buffer.batch_write_and_check_processing(
+                spans_map={
+                    SegmentKey("segment_2", 1, 1): [b"span data"],
+                    SegmentKey("segment_3", 1, 1): [b"span data"],
+                },
+                segment_first_seen_ts={
+                    SegmentKey("segment_2", 1, 1): 1710280891,
+                    SegmentKey("segment_3", 1, 1): 1710280892,
+                },
+                latest_ts_by_partition={1: 1710280892},
+            )
+
+            assert buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1) == [
+                "segment:segment_2:1:process-segment",
+                "segment:segment_1:1:process-segment",
+            ]
+            assert buffer.get_unprocessed_segments_and_prune_bucket(1710281012, 1) == [
+                "segment:segment_3:1:process-segment",
+            ]
@@ -3,6 +3,7 @@ from __future__ import annotations
 import abc
 import time
 import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta
 from hashlib import md5
 from typing import Any
@@ -58,15 +59,24 @@ from sentry.silo.safety import unguarded_write
 from sentry.tasks.derive_code_mappings import SUPPORTED_LANGUAGES
 from sentry.tasks.merge import merge_groups
 from sentry.tasks.post_process import (
+    GROUP_CATEGORY_POST_PROCESS_PIPELINE,
     HIGHER_ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT,
     ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT,
+    _run_pipeline_concurrently,
+    _run_post_process_step,
     feedback_filter_decorator,
     locks,
     post_process_group,
     process_event,
     run_post_process_job,
 )
-from sentry.testutils.cases import BaseTestCase, PerformanceIssueTestCase, SnubaTestCase, TestCase
+from sentry.testutils.cases import (
+    BaseTestCase,
+    PerformanceIssueTestCase,
+    SnubaTestCase,
+    TestCase,
+    TransactionTestCase,
+)
 from sentry.testutils.helpers import with_feature
 from sentry.testutils.helpers.datetime import before_now
 from sentry.testutils.helpers.eventprocessing import write_event_to_cache
@@ -3094,3 +3104,144 @@ class PostProcessGroupFeedbackTest(
     @pytest.mark.skip(reason="those tests do not work with the given call_post_process_group impl")
     def test_processing_cache_cleared_with_commits(self):
         pass
+
+
+class PostProcessGroupErrorConcurrentTest(TransactionTestCase):
+    # Steps run on worker threads with their own database connections, which only see committed
+    # data, so this can't run in the transaction of a `TestCase`.
+    @override_options({"post_process.parallel-pipeline.rollout": 1.0})
+    @patch("sentry.tasks.post_process.metrics")
+    @patch("sentry.rules.processing.processor.RuleProcessor")
+    def test_error_pipeline(self, mock_processor, mock_metrics):
+        event = self.store_event(data={"message": "testing"}, project_id=self.project.id)
+        mock_callback = Mock()
+        mock_futures = [Mock()]
+        mock_processor.return_value.apply.return_value = [(mock_callback, mock_futures)]
+
+        with patch(
+            "sentry.tasks.post_process._run_pipeline_concurrently",
+            wraps=_run_pipeline_concurrently,
+        ) as mock_run_concurrently:
+            post_process_group(
+                is_new=True,
+                is_regression=False,
+                is_new_group_environment=True,
+                cache_key=write_event_to_cache(event),
+                group_id=event.group_id,
+                project_id=event.project_id,
+                eventstream_type=EventStreamEventType.Error,
+            )
+
+        assert mock_run_concurrently.call_count == 1
+        steps_by_outcome = defaultdict(set)
+        for call in mock_metrics.incr.call_args_list:
+            if call.args and call.args[0] in (
+                "sentry.tasks.post_process.post_process_group.completed",
+                "sentry.tasks.post_process.post_process_group.exception",
+                "tasks.post_process.run_post_process_job.pipeline.timeout",
+                "tasks.post_process.run_post_process_job.pipeline.skipped",
+            ):
+                steps_by_outcome[call.args[0].rsplit(".", 1)[1]].add(
+                    call.kwargs["tags"]["pipeline"]
+                )
+        # every step of the pipeline ran, none was abandoned
+        assert steps_by_outcome["completed"] | steps_by_outcome["exception"] == {
+            step.__name__ for step in GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR]
+        }
+        assert {
+            "process_snoozes",
+            "process_inbox_adds",
+            "detect_new_escalation",
+            "handle_owner_assignment",
+            "handle_auto_assignment",
+            "process_rules",
+            "process_service_hooks",
+        } <= steps_by_outcome["completed"]
+        assert not steps_by_outcome["timeout"]
+        assert not steps_by_outcome["skipped"]
+
+        assert GroupInbox.objects.filter(
+            group=event.group, reason=GroupInboxReason.NEW.value
+        ).exists()
+        mock_processor.assert_called_once_with(EventMatcher(event), True, False, True, False, False)
+        mock_callback.assert_called_once_with(EventMatcher(event), mock_futures)
+
+
+class TestRunPipelineConcurrently:
+    @pytest.fixture(autouse=True)
+    def dependencies(self):
+        with patch(
+            "sentry.tasks.post_process.POST_PROCESS_STEP_DEPENDENCIES",
+            {"second": ["first"], "third": ["second", "not_in_pipeline"]},
+        ):
+            yield
+
+    @staticmethod
+    def _step(name, func=lambda: None):
+        def step(job):
+            func()
+
+        step.__name__ = name
+        return step
+
+    def _run(self, pipeline):
+        completed = []
+        job = {"event": Mock(group=None), "is_reprocessed": False}
+
+        def run_step(pipeline_step):
+            _run_post_process_step(job, None, pipeline_step)
+            completed.append(pipeline_step.__name__)
+
+        _run_pipeline_concurrently(pipeline, run_step)
+        return completed
+
+    def test_dependencies_run_first(self):
+        pipeline = [
+            self._step("third"),
+            self._step("second"),
+            self._step("first", lambda: time.sleep(0.05)),
+            self._step("independent"),
+        ]
+
+        completed = self._run(pipeline)
+
+        assert sorted(completed) == ["first", "independent", "second", "third"]
+        assert completed.index("first") < completed.index("second") < completed.index("third")
+
+    @patch("sentry.tasks.post_process.metrics")
+    def test_failed_step_does_not_block_dependents(self, mock_metrics):
+        def fail():
+            raise Exception("oh no")
+
+        assert self._run([self._step("first", fail), self._step("second")]) == ["first", "second"]
+        mock_metrics.incr.assert_any_call(
+            "sentry.tasks.post_process.post_process_group.exception",
+            tags={"issue_category": None, "pipeline": "first"},
+        )
+        mock_metrics.incr.assert_any_call(
+            "sentry.tasks.post_process.post_process_group.completed",
+            tags={"issue_category": None, "pipeline": "second"},
+        )
+
+    @override_options({"post_process.parallel-pipeline.step-timeout": 0.05})
+    @patch("sentry.tasks.post_process.metrics")
+    def test_timeout_skips_dependents(self, mock_metrics):
+        completed = self._run(
+            [
+                self._step("first", lambda: time.sleep(0.5)),
+                self._step("second"),
+                self._step("third"),
+                self._step("independent"),
+            ]
+        )
+
+        assert completed == ["independent"]
+        mock_metrics.incr.assert_any_call(
+            "tasks.post_process.run_post_process_job.pipeline.timeout", tags={"pipeline": "first"}
+        )
+        skipped = [
+            call.kwargs["tags"]["pipeline"]
+            for call in mock_metrics.incr.call_args_list
+            if call.args == ("tasks.post_process.run_post_process_job.pipeline.skipped",)
+        ]
+        assert sorted(skipped) == ["second", "third"]
@@ -4,6 +4,7 @@ from django.test import override_settings
 
 from sentry.models.group import Group
 from sentry.tasks.process_buffer import (
+    batch_buffer_incr,
     buffer_incr,
     get_process_lock,
     process_incr,
@@ -32,6 +33,21 @@ class ProcessPendingTest(TestCase):
         mock_process_pending.assert_any_call()
 
 
+class ProcessPendingShardedTest(TestCase):
+    @mock.patch("sentry.buffer.backend.get_pending_shards", mock.Mock(return_value=3))
+    @mock.patch("sentry.tasks.process_buffer.process_pending.apply_async")
+    def test_fans_out_per_shard(self, mock_apply_async):
+        process_pending()
+        assert mock_apply_async.mock_calls == [
+            mock.call(kwargs={"shard": shard}, headers=mock.ANY) for shard in range(3)
+        ]
+
+    @mock.patch("sentry.buffer.backend.process_pending")
+    def test_single_shard(self, mock_process_pending):
+        process_pending(shard=1)
+        assert mock_process_pending.mock_calls == [mock.call(shard=1)]
+
+
 class ProcessPendingBatchTest(TestCase):
     @mock.patch("sentry.buffer.backend.process_batch")
     def test_process_pending_batch(self, mock_process_pending_batch):
@@ -83,3 +99,44 @@ class BufferIncrTest(TestCase):
             "args": (),
             "kwargs": {},
         }
+
+
+class BatchBufferIncrTest(TestCase):
+    @override_settings(SENTRY_BUFFER_INCR_AS_CELERY_TASK=False)
+    @mock.patch("sentry.tasks.process_buffer.buffer_incr_task")
+    @mock.patch("sentry.tasks.process_buffer.buffer_incr_many_task")
+    def test_defers_until_exit(self, mock_buffer_incr_many_task, mock_buffer_incr_task):
+        with batch_buffer_incr():
+            buffer_incr(Group, {"times_seen": 1}, {"id": 1})
+            with batch_buffer_incr():
+                buffer_incr(Group, {"times_seen": 2}, {"id": 1})
+            assert len(mock_buffer_incr_many_task.mock_calls) == 0
+
+        assert len(mock_buffer_incr_task.mock_calls) == 0
+        assert mock_buffer_incr_many_task.mock_calls == [
+            mock.call(
+                increments=[
+                    ("sentry", "group", ({"times_seen": 1}, {"id": 1}), {}),
+                    ("sentry", "group", ({"times_seen": 2}, {"id": 1}), {}),
+                ]
+            )
+        ]
+
+    @override_settings(SENTRY_BUFFER_INCR_AS_CELERY_TASK=True)
+    @mock.patch("sentry.tasks.process_buffer.buffer_incr_many_task")
+    def test_flushes_on_error(self, mock_buffer_incr_many_task):
+        try:
+            with batch_buffer_incr():
+                buffer_incr(Group, {"times_seen": 1}, {"id": 1})
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert len(mock_buffer_incr_many_task.mock_calls) == 1
+        assert mock_buffer_incr_many_task.mock_calls[0][0] == "delay"
+
+    @mock.patch("sentry.tasks.process_buffer.buffer_incr_many_task")
+    def test_empty_batch(self, mock_buffer_incr_many_task):
+        with batch_buffer_incr():
+            pass
+        assert len(mock_buffer_incr_many_task.mock_calls) == 0
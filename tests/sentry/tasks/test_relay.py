@@ -9,6 +9,7 @@ from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
+from sentry.relay.config import get_dynamic_sampling_config, get_filter_settings
 from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
 from sentry.tasks.relay import (
@@ -18,6 +19,7 @@ from sentry.tasks.relay import (
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.task_runner import BurstTaskRunner
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -439,6 +441,39 @@ class TestInvalidationTask:
             assert cfg_from_cache["disabled"] is False
             assert cfg_from_cache["projectId"] == default_project.id
 
+    def test_invalidate_sections(
+        self,
+        default_project,
+        default_projectkey,
+        task_runner,
+        redis_cache,
+        django_cache,
+    ):
+        redis_cache.set_many({default_projectkey.public_key: {"dummy-key": "val"}})
+
+        with (
+            override_options({"relay.config.section-cache.enabled": True}),
+            patch(
+                "sentry.relay.config.get_dynamic_sampling_config",
+                wraps=get_dynamic_sampling_config,
+            ) as sampling,
+            patch(
+                "sentry.relay.config.get_filter_settings", wraps=get_filter_settings
+            ) as filter_settings,
+            task_runner(),
+        ):
+            schedule_invalidate_project_config(project_id=default_project.id, trigger="test")
+            assert (sampling.call_count, filter_settings.call_count) == (1, 1)
+
+            schedule_invalidate_project_config(
+                project_id=default_project.id, trigger="test", sections=["sampling"]
+            )
+            assert (sampling.call_count, filter_settings.call_count) == (2, 1)
+
+        cfg_from_cache = redis_cache.get(default_projectkey.public_key)
+        assert cfg_from_cache["disabled"] is False
+        assert "filterSettings" in cfg_from_cache["config"]
+
     def test_invalidate_org(
         self,
         monkeypatch,
@@ -487,6 +522,7 @@ class TestInvalidationTask:
             project_id=default_project.id,
             public_key=None,
             countdown=2,
+            sections=None,
         )
 
     @mock.patch("sentry.tasks.relay._schedule_invalidate_project_config")
@@ -5,6 +5,7 @@ import pytest
 
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, TSDBModel
 from sentry.tsdb.redis import CountMinScript, RedisTSDB, SuppressionWrapper
 from sentry.utils.dates import to_datetime
@@ -185,6 +186,29 @@ class RedisTSDBTest(TestCase):
         sum_results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert sum_results == {1: 0, 2: 0}
 
+    @override_options({"tsdb.redis.bulk-range-reads": True})
+    def test_simple_bulk_range_reads(self):
+        self.test_simple()
+
+    def test_bulk_range_reads_match(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+        keys = list(range(1, 200))
+
+        for i, key in enumerate(keys):
+            self.db.incr(TSDBModel.group, key, dts[i % 4], count=i)
+            self.db.incr(TSDBModel.group, key, dts[(i + 1) % 4], environment_id=1)
+
+        for environment_ids in (None, [1], [2]):
+            expected = self.db.get_range(
+                TSDBModel.group, keys, dts[0], dts[-1], environment_ids=environment_ids
+            )
+            with override_options({"tsdb.redis.bulk-range-reads": True}):
+                results = self.db.get_range(
+                    TSDBModel.group, keys, dts[0], dts[-1], environment_ids=environment_ids
+                )
+            assert results == expected
+
     def test_count_distinct(self):
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -817,3 +841,28 @@ class RedisTSDBTest(TestCase):
             [b"eta", b"7"],
             [b"bar", b"7"],
         ]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("bulk", [True, False], ids=["bulk", "per_field"])
+def test_benchmark_get_range(bulk, benchmark):
+    with override_options(
+        {"redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}}
+    ):
+        db = RedisTSDB(rollups=((ONE_DAY, 30),), vnodes=64, cluster="tsdb")
+
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=29)
+    keys = list(range(1, 500))
+    for day in range(30):
+        db.incr_multi(
+            [(TSDBModel.group, key) for key in keys], end - timedelta(days=day), count=day
+        )
+
+    try:
+        with override_options({"tsdb.redis.bulk-range-reads": bulk}):
+            results = benchmark(db.get_range, TSDBModel.group, keys, start, end)
+        assert len(results) == len(keys)
+    finally:
+        with db.cluster.all() as client:
+            client.flushdb()
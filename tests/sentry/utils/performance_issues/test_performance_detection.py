@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import unittest
+from typing import Any
 from unittest.mock import Mock, call, patch
 
 import pytest
@@ -14,8 +15,16 @@ from sentry.issues.grouptype import (
 )
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers import override_options
-from sentry.testutils.performance_issues.event_generators import get_event
+from sentry.testutils.performance_issues.event_generators import (
+    EVENTS,
+    create_event,
+    get_event,
+    modify_span_start,
+)
+from sentry.testutils.performance_issues.span_builder import SpanBuilder
+from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.testutils.silo import no_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.utils.performance_issues.base import (
     DETECTOR_TYPE_TO_GROUP_TYPE,
     DetectorType,
@@ -25,10 +34,13 @@ from sentry.utils.performance_issues.detectors.n_plus_one_db_span_detector impor
     NPlusOneDBSpanDetector,
 )
 from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
     EventPerformanceProblem,
     _detect_performance_problems,
     detect_performance_problems,
     get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
 )
 from sentry.utils.performance_issues.performance_problem import PerformanceProblem
 
@@ -720,3 +732,62 @@ class EventPerformanceProblemTest(TestCase):
 )
 def test_total_span_time(spans, duration):
     assert total_span_time(spans) == pytest.approx(duration, 0.01)
+
+
+def _run_detectors(event: dict[str, Any], fused: bool) -> dict[DetectorType, Any]:
+    settings = get_detection_settings()
+    detectors = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+    if fused:
+        run_detectors_on_data(detectors, event)
+    else:
+        for detector in detectors:
+            run_detector_on_data(detector, event)
+    return {detector.type: detector.stored_problems for detector in detectors}
+
+
+@django_db_all
+@pytest.mark.parametrize("event_name", sorted(EVENTS))
+def test_run_detectors_on_data_matches_run_detector_on_data(event_name: str) -> None:
+    assert _run_detectors(get_event(event_name), fused=True) == _run_detectors(
+        get_event(event_name), fused=False
+    )
+
+
+def _large_transaction(num_spans: int) -> dict[str, Any]:
+    ops = [
+        ("db", "SELECT * FROM books WHERE author_id = %s"),
+        ("db", "SELECT * FROM authors WHERE id = %s"),
+        ("http.client", "GET /api/books/?id=1"),
+        ("resource.script", "https://example.com/app.js"),
+        ("ui.render", "Render"),
+        ("function", "handle_request"),
+        ("cache.get", "book:1"),
+        ("file.read", "/etc/config.json"),
+    ]
+    spans = []
+    for i in range(num_spans):
+        op, description = ops[(i // 5) % len(ops)]
+        span = (
+            SpanBuilder()
+            .with_op(op)
+            .with_description(description)
+            .with_span_id(f"{i:016x}")
+            .with_hash(f"{(i // 5) % len(ops):016x}")
+            .with_data({"blocked_main_thread": i % 7 == 0})
+            .build()
+        )
+        span["timestamp"] = 0.02
+        spans.append(modify_span_start(span, i * 10))
+    event = create_event(spans)
+    event["contexts"] = {"trace": {"span_id": "a" * 16, "op": "http.server"}}
+    return event
+
+
+@django_db_all
+@requires_pytest_benchmark
+@pytest.mark.parametrize("fused", [True, False], ids=["fused", "per_detector"])
+@pytest.mark.parametrize("num_spans", [100, 1000, 5000])
+def test_benchmark_large_transaction(num_spans: int, fused: bool, benchmark: Any) -> None:
+    event = _large_transaction(num_spans)
+    result = benchmark(_run_detectors, event, fused)
+    assert result == _run_detectors(event, not fused)
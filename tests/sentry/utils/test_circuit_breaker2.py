@@ -14,7 +14,13 @@ from sentry.ratelimits.sliding_windows import (
     RequestedQuota,
 )
 from sentry.testutils.helpers.datetime import freeze_time
-from sentry.utils.circuit_breaker2 import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerState
+from sentry.utils import circuit_breaker2
+from sentry.utils.circuit_breaker2 import (
+    STATE_CHANGE_CHANNEL,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerState,
+)
 
 # Note: These need to be relatively big. If the limit is too low, the RECOVERY quota isn't big
 # enough to be useful, and if the window is too short, redis (which doesn't seem to listen to the
@@ -241,6 +247,7 @@ class CircuitBreakerTest(TestCase):
             "window_granularity": 180,
             "broken_state_duration": 120,
             "recovery_duration": 7200,
+            "state_refresh_interval": 0,
             # These can't be compared with a simple equality check and therefore are tested
             # individually below
             "limiter": ANY,
@@ -560,3 +567,82 @@ class ShouldAllowRequestTest(TestCase):
             mock_logger.exception.assert_called_with(
                 "Couldn't get state from redis for circuit breaker '%s'", breaker.key
             )
+
+
+@freeze_time()
+class LocalStateTest(TestCase):
+    def setUp(self) -> None:
+        self.config: CircuitBreakerConfig = {**DEFAULT_CONFIG, "state_refresh_interval": 60}
+        self.breaker = MockCircuitBreaker("dogs_are_great", self.config)
+
+        # Clear all existing keys from redis, and any state cached by previous tests
+        self.breaker.redis_pipeline.flushall()
+        self.breaker.redis_pipeline.execute()
+        circuit_breaker2._local_states.clear()
+
+    def test_caches_state(self):
+        breaker = self.breaker
+
+        with patch.object(breaker, "_get_from_redis", wraps=breaker._get_from_redis) as mock_get:
+            assert breaker.should_allow_request() is True
+            assert breaker.should_allow_request() is True
+            assert mock_get.call_count == 1
+
+            # Only refreshing picks up changes made by other processes
+            breaker._add_quota_usage(breaker.primary_quota, breaker.error_limit)
+            assert breaker.should_allow_request() is True
+
+            circuit_breaker2._invalidate_local_state(breaker.key)
+            assert breaker.should_allow_request() is False
+            assert mock_get.call_count == 2
+
+    def test_batches_errors(self):
+        breaker = self.breaker
+
+        for _ in range(3):
+            breaker.record_error()
+
+        # The errors are only tallied in process memory so far
+        assert breaker._get_remaining_error_quota(breaker.primary_quota) == breaker.error_limit
+
+        circuit_breaker2._invalidate_local_state(breaker.key)
+        assert breaker.should_allow_request() is True
+        assert breaker._get_remaining_error_quota(breaker.primary_quota) == breaker.error_limit - 3
+
+    @patch("sentry.utils.circuit_breaker2.metrics.incr")
+    def test_trips_when_limit_is_hit(self, mock_metrics_incr: MagicMock):
+        breaker = self.breaker
+        breaker._add_quota_usage(breaker.primary_quota, breaker.error_limit - 2)
+        assert breaker.should_allow_request() is True
+
+        with patch.object(breaker.limiter.client, "publish") as mock_publish:
+            breaker.record_error()
+            mock_publish.assert_not_called()
+
+            breaker.record_error()
+            mock_publish.assert_called_once_with(STATE_CHANGE_CHANNEL, breaker.key)
+
+        mock_metrics_incr.assert_any_call(
+            "circuit_breaker.dogs_are_great.error_limit_hit",
+            sample_rate=1.0,
+            tags={"current_state": CircuitBreakerState.OK.value},
+        )
+        assert breaker._get_remaining_error_quota(breaker.primary_quota) == 0
+        assert breaker.should_allow_request() is False
+        assert breaker._get_state_and_remaining_time() == (
+            CircuitBreakerState.BROKEN,
+            breaker.broken_state_duration,
+        )
+
+    def test_does_not_trip_if_other_processes_recovered(self):
+        breaker = self.breaker
+        breaker._add_quota_usage(breaker.primary_quota, breaker.error_limit - 1)
+        assert breaker.should_allow_request() is True
+
+        # The cached quota is out of date, so the error isn't actually the last one allowed
+        breaker._add_quota_usage(breaker.primary_quota, -5)
+        breaker.record_error()
+
+        assert breaker._get_state_and_remaining_time() == (CircuitBreakerState.OK, None)
+        assert breaker._get_remaining_error_quota(breaker.primary_quota) == 5
+        assert breaker.should_allow_request() is True
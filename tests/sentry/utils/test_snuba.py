@@ -1,9 +1,12 @@
+import threading
 import unittest
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.test import override_settings
 from django.utils import timezone
+from snuba_sdk import Column, Condition, Entity, Op, Query, Request
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
@@ -12,12 +15,17 @@ from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.snuba import (
     ROUND_UP,
+    QueryTooManySimultaneous,
     RetrySkipTimeout,
     SnubaQueryParams,
     UnqualifiedQueryError,
     _prepare_query_params,
+    _referrer_concurrency_limit,
+    _run_concurrently,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -412,6 +420,50 @@ class QuantizeTimeTest(unittest.TestCase):
         assert i != j
 
 
+class GetCacheKeyTest(unittest.TestCase):
+    def make_request(self, start: datetime, project_id: int = 1) -> Request:
+        return Request(
+            dataset="events",
+            app_id="tests",
+            query=Query(
+                match=Entity("events"),
+                select=[Column("event_id")],
+                where=[
+                    Condition(Column("timestamp"), Op.GTE, start),
+                    Condition(Column("timestamp"), Op.LT, start + timedelta(days=1)),
+                    Condition(Column("project_id"), Op.IN, [project_id]),
+                ],
+            ),
+            tenant_ids={"organization_id": 1},
+        )
+
+    def test_exact_timestamps(self):
+        start = datetime(2023, 12, 27, 4, 4, 24)
+        assert get_cache_key(self.make_request(start)) == get_cache_key(self.make_request(start))
+        assert get_cache_key(self.make_request(start)) != get_cache_key(
+            self.make_request(start + timedelta(seconds=1))
+        )
+
+    def test_time_buckets(self):
+        # A window of a day ending now
+        start = datetime.now(UTC).replace(microsecond=0) - timedelta(days=1)
+        keys = {
+            get_cache_key(self.make_request(start + timedelta(seconds=i)), 300) for i in range(300)
+        }
+        # one bucket boundary at most
+        assert 1 <= len(keys) <= 2
+
+        assert get_cache_key(self.make_request(start), 300) != get_cache_key(
+            self.make_request(start, project_id=2), 300
+        )
+
+    def test_time_buckets_absolute_window(self):
+        start = datetime(2023, 12, 27, 4, 4, 24)
+        assert get_cache_key(self.make_request(start), 300) != get_cache_key(
+            self.make_request(start + timedelta(seconds=1)), 300
+        )
+
+
 class FakeConnectionPool(HTTPConnectionPool):
     def __init__(self, connection, **kwargs):
         self.connection = connection
@@ -443,3 +495,125 @@ def test_retries():
         snuba_pool.urlopen("POST", "/query", body="{}")
 
     assert connection_mock.request.call_count == 1
+
+
+@override_options({"snuba.bulk-query.max-concurrency": 2})
+def test_run_concurrently():
+    lock = threading.Lock()
+    running = []
+    max_running = 0
+
+    def run(param):
+        nonlocal max_running
+        with lock:
+            running.append(param)
+            max_running = max(max_running, len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.remove(param)
+        return param * 2
+
+    assert _run_concurrently(run, list(range(7))) == [0, 2, 4, 6, 8, 10, 12]
+    assert max_running == 2
+
+
+@override_settings(SENTRY_SNUBA_QUERY_THREADS=3)
+@override_options({"snuba.bulk-query.max-concurrency": 0})
+def test_run_concurrently_defaults_to_query_threads():
+    lock = threading.Lock()
+    running = []
+    max_running = 0
+
+    def run(param):
+        nonlocal max_running
+        with lock:
+            running.append(param)
+            max_running = max(max_running, len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.remove(param)
+        return param
+
+    assert _run_concurrently(run, list(range(7))) == list(range(7))
+    assert max_running <= 3
+
+
+@override_options(
+    {
+        "snuba.bulk-query.max-concurrency": 4,
+        "snuba.referrer-concurrency-limits": {"limited": 1},
+    }
+)
+def test_run_concurrently_referrer_limit():
+    lock = threading.Lock()
+    running = []
+    max_running = 0
+
+    def run(param):
+        nonlocal max_running
+        with lock:
+            running.append(param)
+            max_running = max(max_running, len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.remove(param)
+        return param
+
+    assert _run_concurrently(run, list(range(5)), ["limited"] * 5) == list(range(5))
+    assert max_running == 1
+
+
+@override_settings(SENTRY_SNUBA_TIMEOUT=0)
+@override_options(
+    {
+        "snuba.bulk-query.max-concurrency": 2,
+        "snuba.referrer-concurrency-limits": {"limited": 1},
+    }
+)
+def test_run_concurrently_referrer_limit_acquired_before_submit():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def run(param):
+        calls.append(param)
+        started.set()
+        release.wait(1)
+        return param
+
+    # The second query fails to get a slot in the calling thread, instead of waiting for one on
+    # a worker of the query thread pool.
+    with pytest.raises(QueryTooManySimultaneous):
+        _run_concurrently(run, [0, 1], ["limited", "limited"])
+    assert started.wait(1)
+    release.set()
+    assert calls == [0]
+
+
+@override_options({"snuba.bulk-query.max-concurrency": 1})
+def test_run_concurrently_stops_on_error():
+    calls = []
+
+    def run(param):
+        calls.append(param)
+        if param == 1:
+            raise ValueError("boom")
+        return param
+
+    with pytest.raises(ValueError):
+        _run_concurrently(run, list(range(5)))
+    assert calls == [0, 1]
+
+
+@override_settings(SENTRY_SNUBA_TIMEOUT=0)
+@override_options({"snuba.referrer-concurrency-limits": {"limited": 1}})
+def test_referrer_concurrency_limit():
+    with _referrer_concurrency_limit("limited"):
+        with _referrer_concurrency_limit("unlimited"):
+            pass
+        with pytest.raises(QueryTooManySimultaneous):
+            with _referrer_concurrency_limit("limited"):
+                pass
+
+    with _referrer_concurrency_limit("limited"):
+        pass
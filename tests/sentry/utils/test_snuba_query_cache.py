@@ -0,0 +1,92 @@
+import threading
+
+from django.core.cache import cache
+
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.snuba_query_cache import (
+    FORMAT_JSON,
+    FORMAT_MSGPACK,
+    SnubaQueryCache,
+    deserialize_result,
+    serialize_result,
+)
+
+RESULT = {"data": [{"count": 1, "project_id": 2, "title": "hello"}], "meta": []}
+
+
+def test_serialization():
+    value = serialize_result(RESULT)
+    assert value[:1] == FORMAT_MSGPACK
+    assert deserialize_result(value) == RESULT
+
+    # too wide for msgpack
+    result = {"data": [{"count": 2**70}]}
+    value = serialize_result(result)
+    assert value[:1] == FORMAT_JSON
+    assert deserialize_result(value) == result
+
+
+def test_shared_tier():
+    query_cache = SnubaQueryCache()
+    query_cache.set("sqc:test:1", RESULT, 60)
+
+    assert query_cache.get_many(["sqc:test:1", "sqc:test:2"]) == {"sqc:test:1": RESULT}
+
+    # every hit is a fresh copy
+    query_cache.get_many(["sqc:test:1"])["sqc:test:1"]["data"].clear()
+    assert query_cache.get_many(["sqc:test:1"]) == {"sqc:test:1": RESULT}
+
+    cache.delete("sqc:test:1")
+    assert query_cache.get_many(["sqc:test:1"]) == {}
+
+
+@override_options({"snuba.query-cache.local-max-bytes": 1024 * 1024})
+def test_local_tier():
+    query_cache = SnubaQueryCache()
+    query_cache.set("sqc:test:1", RESULT, 60)
+
+    cache.delete("sqc:test:1")
+    assert query_cache.get_many(["sqc:test:1"]) == {"sqc:test:1": RESULT}
+
+    query_cache.clear()
+    assert query_cache.get_many(["sqc:test:1"]) == {}
+
+
+def test_local_tier_evicts():
+    query_cache = SnubaQueryCache()
+    size = len(serialize_result(RESULT))
+
+    with override_options({"snuba.query-cache.local-max-bytes": size * 2}):
+        for i in range(3):
+            query_cache.set(f"sqc:test:{i}", RESULT, 60)
+        cache.delete_many([f"sqc:test:{i}" for i in range(3)])
+
+        assert query_cache.get_many([f"sqc:test:{i}" for i in range(3)]) == {
+            "sqc:test:1": RESULT,
+            "sqc:test:2": RESULT,
+        }
+
+
+def test_flights():
+    query_cache = SnubaQueryCache()
+
+    flight, is_leader = query_cache.start_or_join_flight("sqc:test:1")
+    assert is_leader
+    joined, is_leader = query_cache.start_or_join_flight("sqc:test:1")
+    assert not is_leader
+    assert joined is flight
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(joined.wait(10)))
+    waiter.start()
+    query_cache.land_flight("sqc:test:1", serialize_result(RESULT))
+    waiter.join()
+    assert results == [RESULT]
+
+    # landed flights are not joined anymore
+    flight, is_leader = query_cache.start_or_join_flight("sqc:test:1")
+    assert is_leader
+
+    # a failed query makes followers run it themselves
+    query_cache.land_flight("sqc:test:1", None)
+    assert flight.wait(0) is None